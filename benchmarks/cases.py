@@ -0,0 +1,152 @@
+"""
+Benchmark cases. Each case receives the scale factor and returns the function to be measured, so that any setup work
+(generating the template, parsing it when the case measures a later phase...) is left out of the measurements.
+"""
+
+import random
+from datetime import datetime
+from ipaddress import IPv4Network
+from typing import Callable, Dict
+
+from benchmarks import templates
+from pycfmodel import parse, snapshot
+from pycfmodel.model.cf_model import CFModel
+from pycfmodel.model.generic import Generic
+from pycfmodel.model.resources.properties.statement_condition import StatementCondition
+from pycfmodel.model.resources.wafv2_ip_set import WAFv2IPSetProperties
+from pycfmodel.model.security_group_index import SecurityGroupIndex
+from pycfmodel.network import AddressRanges
+from pycfmodel.testing.synth import synthesize_template
+
+
+def _scaled(value: int, scale: float) -> int:
+    return max(1, int(value * scale))
+
+
+def parse_wide(scale: float) -> Callable:
+    template = templates.wide_template(_scaled(5000, scale))
+    return lambda: parse(template)
+
+
+def parse_deep(scale: float) -> Callable:
+    template = templates.deep_template(_scaled(500, scale))
+    return lambda: parse(template)
+
+
+def parse_iam_heavy(scale: float) -> Callable:
+    template = templates.iam_heavy_template(_scaled(500, scale))
+    return lambda: parse(template)
+
+
+def parse_generic_heavy(scale: float) -> Callable:
+    template = templates.generic_heavy_template(_scaled(2000, scale))
+    return lambda: parse(template)
+
+
+def parse_synth_mixed(scale: float) -> Callable:
+    template = synthesize_template(resources=_scaled(5000, scale), generic_ratio=0.1, intrinsic_ratio=0.3)
+    return lambda: parse(template)
+
+
+def resolve_wide(scale: float) -> Callable:
+    model = parse(templates.wide_template(_scaled(5000, scale)))
+    return lambda: model.resolve()
+
+
+def resolve_deep(scale: float) -> Callable:
+    model = parse(templates.deep_template(_scaled(500, scale)))
+    return lambda: model.resolve()
+
+
+def resolve_synth_mixed(scale: float) -> Callable:
+    model = parse(synthesize_template(resources=_scaled(5000, scale), generic_ratio=0.1, intrinsic_ratio=0.3))
+    return lambda: model.resolve()
+
+
+def to_json_bytes_synth_mixed(scale: float) -> Callable:
+    model = parse(synthesize_template(resources=_scaled(5000, scale), generic_ratio=0.1, intrinsic_ratio=0.3))
+    model = model.resolve()
+    return lambda: model.to_json_bytes()
+
+
+def from_json_bytes_synth_mixed(scale: float) -> Callable:
+    model = parse(synthesize_template(resources=_scaled(5000, scale), generic_ratio=0.1, intrinsic_ratio=0.3))
+    data = model.resolve().to_json_bytes()
+    return lambda: CFModel.from_json_bytes(data)
+
+
+def snapshot_loads_synth_mixed(scale: float) -> Callable:
+    model = parse(synthesize_template(resources=_scaled(5000, scale), generic_ratio=0.1, intrinsic_ratio=0.3))
+    data = snapshot.dumps(model.resolve())
+    return lambda: snapshot.loads(data)
+
+
+def expand_actions_iam_heavy(scale: float) -> Callable:
+    model = parse(templates.iam_heavy_template(_scaled(500, scale))).resolve()
+    return lambda: model.expand_actions()
+
+
+def sensitive_ports_wide(scale: float) -> Callable:
+    model = parse(templates.wide_template(_scaled(5000, scale))).resolve()
+    sensitive_ports = list(range(0, 2000, 10))
+    return lambda: SecurityGroupIndex.from_model(model).exposed_ports(sensitive_ports, include_private=False)
+
+
+def wafv2_ip_set_overlaps(scale: float) -> Callable:
+    generator = random.Random(0)
+
+    def networks(count: int):
+        return [
+            str(IPv4Network((generator.randrange(2**32), generator.randint(16, 32)), strict=False))
+            for _ in range(count)
+        ]
+
+    ip_sets = [
+        WAFv2IPSetProperties(Addresses=networks(_scaled(2000, scale)), IPAddressVersion="IPV4", Scope="REGIONAL")
+        for _ in range(10)
+    ]
+    threat_intel = AddressRanges.from_networks(networks(_scaled(100000, scale)))
+
+    # IP sets are not frozen, so each run measures building their ranges too
+    return lambda: [ip_set.overlaps(threat_intel) for ip_set in ip_sets]
+
+
+def generic_casting(scale: float) -> Callable:
+    properties = [
+        resource["Properties"]
+        for resource in templates.generic_heavy_template(_scaled(2000, scale))["Resources"].values()
+    ]
+    return lambda: [Generic.model_validate(value) for value in properties]
+
+
+def statement_condition_eval(scale: float) -> Callable:
+    contexts = templates.condition_contexts(_scaled(1000, scale))
+    condition = StatementCondition.model_validate(
+        {
+            "StringEquals": {"aws:PrincipalAccount": ["123456789012", "111111111111"]},
+            "Bool": {"aws:SecureTransport": True},
+            "ForAnyValue:StringLike": {"s3:prefix": ["home/user-1*", "shared/*"]},
+            "DateGreaterThan": {"aws:CurrentTime": datetime(2019, 1, 1)},
+        }
+    )
+    return lambda: [condition(context) for context in contexts]
+
+
+CASES: Dict[str, Callable[[float], Callable]] = {
+    "parse_wide": parse_wide,
+    "parse_deep": parse_deep,
+    "parse_iam_heavy": parse_iam_heavy,
+    "parse_generic_heavy": parse_generic_heavy,
+    "parse_synth_mixed": parse_synth_mixed,
+    "resolve_wide": resolve_wide,
+    "resolve_deep": resolve_deep,
+    "resolve_synth_mixed": resolve_synth_mixed,
+    "to_json_bytes_synth_mixed": to_json_bytes_synth_mixed,
+    "from_json_bytes_synth_mixed": from_json_bytes_synth_mixed,
+    "snapshot_loads_synth_mixed": snapshot_loads_synth_mixed,
+    "expand_actions_iam_heavy": expand_actions_iam_heavy,
+    "sensitive_ports_wide": sensitive_ports_wide,
+    "wafv2_ip_set_overlaps": wafv2_ip_set_overlaps,
+    "generic_casting": generic_casting,
+    "statement_condition_eval": statement_condition_eval,
+}
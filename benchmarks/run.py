@@ -0,0 +1,182 @@
+"""
+Runs the benchmark suite.
+
+Every case runs in its own subprocess so that peak RSS and allocations of one case don't leak into the others.
+
+Usage:
+
+    python -m benchmarks.run                                  # run all cases and print the results
+    python -m benchmarks.run --case parse_wide --case parse_deep
+    python -m benchmarks.run --scale 0.1                      # smaller templates, useful as a smoke test
+    python -m benchmarks.run --save benchmarks/baseline.json  # store results as the new baseline
+    python -m benchmarks.run --compare benchmarks/baseline.json --threshold 0.2
+"""
+
+import argparse
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover, not available on Windows
+    resource = None
+
+from benchmarks.cases import CASES
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def _peak_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def measure(name: str, scale: float, min_time: float, min_rounds: int) -> Dict:
+    """Measures a single case in the current process."""
+    logging.disable(logging.WARNING)
+    function = CASES[name](scale)
+    function()  # warm up caches and lazily built schemas
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_rounds or time.perf_counter() - started < min_time:
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    # Keep the result alive so that the blocks it holds are counted, as callers usually keep the parsed model around
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = function()
+    traced_retained, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+
+    timings.sort()
+    return {
+        "rounds": len(timings),
+        "ops_per_sec": len(timings) / sum(timings),
+        "median_sec": timings[len(timings) // 2],
+        "min_sec": timings[0],
+        "peak_rss_kb": _peak_rss_kb(),
+        "traced_peak_bytes": traced_peak,
+        "traced_retained_bytes": traced_retained,
+        "allocated_blocks": allocated_blocks,
+    }
+
+
+def run_case_in_subprocess(name: str, scale: float, min_time: float, min_rounds: int) -> Dict:
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.run",
+            "--in-process",
+            "--case",
+            name,
+            "--scale",
+            str(scale),
+            "--min-time",
+            str(min_time),
+            "--min-rounds",
+            str(min_rounds),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(output.stdout)[name]
+
+
+def _name_width(results: Dict[str, Dict]) -> int:
+    return max([len("case"), *map(len, results)]) + 2
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """
+    Compares results against a baseline, printing the ratio for each case.
+
+    Returns:
+        Names of the cases whose throughput dropped more than `threshold` (e.g. 0.2 for 20%).
+    """
+    regressions = []
+    width = _name_width(results)
+    print(f"{'case':<{width}}{'baseline ops/s':>16}{'current ops/s':>16}{'ratio':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            print(f"{name:<{width}}{'-':>16}{result['ops_per_sec']:>16.3f}{'-':>9}")
+            continue
+        ratio = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+        flag = "  REGRESSION" if ratio < 1 - threshold else ""
+        print(f"{name:<{width}}{baseline[name]['ops_per_sec']:>16.3f}{result['ops_per_sec']:>16.3f}{ratio:>9.2f}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: Dict[str, Dict]):
+    width = _name_width(results)
+    print(
+        f"{'case':<{width}}{'ops/s':>10}{'median ms':>12}{'peak RSS MB':>13}{'traced MB':>11}{'retained MB':>13}"
+        f"{'blocks':>10}"
+    )
+    for name, result in results.items():
+        peak_rss = "-" if result["peak_rss_kb"] is None else f"{result['peak_rss_kb'] / 1024:.1f}"
+        # Older results don't have the memory retained by the result
+        retained = result.get("traced_retained_bytes")
+        retained = "-" if retained is None else f"{retained / 2**20:.1f}"
+        print(
+            f"{name:<{width}}{result['ops_per_sec']:>10.3f}{result['median_sec'] * 1000:>12.2f}{peak_rss:>13}"
+            f"{result['traced_peak_bytes'] / 2**20:>11.1f}{retained:>13}{result['allocated_blocks']:>10}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run pycfmodel benchmarks.")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="Case to run, can be repeated.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale factor applied to the size of the templates.")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum time measuring each case, in seconds.")
+    parser.add_argument("--min-rounds", type=int, default=3, help="Minimum number of rounds of each case.")
+    parser.add_argument("--save", type=Path, help="Store the results in this file.")
+    parser.add_argument("--compare", type=Path, nargs="?", const=DEFAULT_BASELINE, help="Baseline to compare with.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed throughput drop before failing.")
+    parser.add_argument("--in-process", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    names = args.case or list(CASES)
+    if args.in_process:
+        print(json.dumps({name: measure(name, args.scale, args.min_time, args.min_rounds) for name in names}))
+        return 0
+
+    results = {}
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr)
+        results[name] = run_case_in_subprocess(name, args.scale, args.min_time, args.min_rounds)
+
+    if args.save:
+        metadata = {"python": platform.python_version(), "platform": platform.platform(), "scale": args.scale}
+        args.save.write_text(json.dumps({"metadata": metadata, "results": results}, indent=2, sort_keys=True) + "\n")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if baseline["metadata"]["scale"] != args.scale:
+            print(f"Baseline was generated with scale {baseline['metadata']['scale']}", file=sys.stderr)
+        return 1 if compare(results, baseline["results"], args.threshold) else 0
+
+    print_results(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
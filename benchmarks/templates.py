@@ -0,0 +1,51 @@
+"""
+Templates used by the benchmarks, generated with [synthesize_template][pycfmodel.testing.synth.synthesize_template].
+All of them are deterministic so that results can be compared between runs.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List
+
+from pycfmodel.testing.synth import synthesize_template
+
+WIDE_RESOURCE_TYPES = ("AWS::S3::Bucket", "AWS::EC2::SecurityGroup", "AWS::IAM::Role", "AWS::SQS::QueuePolicy")
+
+
+def wide_template(resources: int = 5000) -> Dict[str, Any]:
+    """Template with many resources of the most common types."""
+    return synthesize_template(resources=resources, resource_types=WIDE_RESOURCE_TYPES)
+
+
+def deep_template(resources: int = 500, depth: int = 12) -> Dict[str, Any]:
+    """Template where property values are deeply nested intrinsic functions."""
+    return synthesize_template(
+        resources=resources,
+        resource_types=["AWS::S3::Bucket"],
+        optional_ratio=0.2,
+        intrinsic_ratio=1.0,
+        intrinsic_depth=depth,
+        deep_intrinsics=True,
+    )
+
+
+def iam_heavy_template(roles: int = 500, statements: int = 10) -> Dict[str, Any]:
+    """Template with many roles and big policy documents."""
+    return synthesize_template(resources=roles, resource_types=["AWS::IAM::Role"], statements_per_policy=statements)
+
+
+def generic_heavy_template(resources: int = 2000) -> Dict[str, Any]:
+    """Template where every resource is a GenericResource, so all of its properties go through Generic casting."""
+    return synthesize_template(resources=resources, generic_ratio=1.0)
+
+
+def condition_contexts(contexts: int = 1000) -> List[Dict[str, Any]]:
+    """Request contexts to evaluate statement conditions against."""
+    return [
+        {
+            "aws:PrincipalAccount": "123456789012" if index % 2 else "210987654321",
+            "aws:SecureTransport": bool(index % 3),
+            "s3:prefix": [f"home/user-{index}/", "public/"],
+            "aws:CurrentTime": datetime(2020, 1, 1),
+        }
+        for index in range(contexts)
+    ]
@@ -1,5 +1,11 @@
+from typing import Optional
+
+from pycfmodel.diagnostics import DiagnosticsCollector, collect_diagnostics
 from pycfmodel.model.cf_model import CFModel
 
 
-def parse(template):
-    return CFModel.model_validate(template)
+def parse(template, diagnostics: Optional[DiagnosticsCollector] = None):
+    if diagnostics is None:
+        return CFModel.model_validate(template)
+    with collect_diagnostics(diagnostics):
+        return CFModel.model_validate(template)
@@ -1,17 +1,53 @@
-from typing import List, Union
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Tuple, Union
 
 from pycfmodel.cloudformation_actions import CLOUDFORMATION_ACTIONS
 from pycfmodel.utils import regex_from_cf_string
 
+_ALL_ACTIONS: FrozenSet[str] = frozenset(CLOUDFORMATION_ACTIONS)
+
+
+def _partition_by_service() -> Dict[str, Tuple[str, ...]]:
+    actions_by_service = defaultdict(list)
+    for action in CLOUDFORMATION_ACTIONS:
+        actions_by_service[action.split(":", 1)[0].lower()].append(action)
+    return {service: tuple(actions) for service, actions in actions_by_service.items()}
+
+
+_ACTIONS_BY_SERVICE: Dict[str, Tuple[str, ...]] = _partition_by_service()
+
+
+def get_service_actions(service: str) -> Tuple[str, ...]:
+    """
+    Returns all the known actions of a service, such as `iam` or `s3`. Service prefix is case insensitive.
+    """
+    return _ACTIONS_BY_SERVICE.get(service.lower(), ())
+
+
+def _candidate_actions(action: str) -> Tuple[str, ...]:
+    """
+    Known actions that could match an action pattern. When the service prefix doesn't contain wildcards, only the
+    actions of that service need to be checked.
+    """
+    service, separator, _ = action.partition(":")
+    if separator and service.replace("-", "").isalnum():
+        return get_service_actions(service)
+    return CLOUDFORMATION_ACTIONS
+
+
+@lru_cache(maxsize=4096)
+def _expand_action_cached(action: str, not_action: bool) -> Tuple[str, ...]:
+    pattern = regex_from_cf_string(action)
+    matching_actions = set(candidate for candidate in _candidate_actions(action) if pattern.match(candidate))
+    if not_action:
+        return tuple(sorted(_ALL_ACTIONS - matching_actions))
+    return tuple(sorted(matching_actions))
+
 
 def _expand_action(action: str, not_action=False) -> List[str]:
     if isinstance(action, str):
-        pattern = regex_from_cf_string(action)
-        if not_action:
-            return sorted(
-                set(CLOUDFORMATION_ACTIONS) - set(action for action in CLOUDFORMATION_ACTIONS if pattern.match(action))
-            )
-        return sorted(set(action for action in CLOUDFORMATION_ACTIONS if pattern.match(action)))
+        return list(_expand_action_cached(action, not_action))
 
     raise ValueError(f"Not supported type: {type(action)}")
 
@@ -25,7 +61,7 @@ def _expand_actions(actions: Union[str, List[str]], not_action=False) -> List[st
         for action in actions:
             expanded_actions.update(_expand_action(action))
         if not_action:
-            return sorted(set(CLOUDFORMATION_ACTIONS) - expanded_actions)
+            return sorted(_ALL_ACTIONS - expanded_actions)
         return sorted(expanded_actions)
 
     raise ValueError(f"Not supported type: {type(actions)}")
@@ -0,0 +1,386 @@
+"""
+Caches of parsed and resolved models.
+
+`DiskCache` stores models in a directory, so that unchanged templates are not parsed and resolved again by later
+processes, such as scans run on every commit in CI. `CachedParser` keeps models in memory, for long-running services
+that receive the same templates many times.
+
+Example:
+
+    from pycfmodel.cache import DiskCache
+
+    cache = DiskCache(".pycfmodel-cache", max_bytes=256 * 1024 * 1024)
+    with open("template.json", "rb") as template:
+        model = cache.parse(template.read(), extra_params={"Env": "prod"}, resolve=True)
+
+Models are stored as [snapshots][pycfmodel.snapshot], which can only contain models of pycfmodel, so loading an entry
+never runs code from the directory. When the directory is shared with or restored from untrusted places, give the
+cache a `key` so that entries written without it are discarded.
+
+In a service:
+
+    parser = CachedParser(maxsize=256, max_bytes=1024 * 1024 * 1024)
+    model = parser.resolve(template, extra_params={"Env": "prod"})
+
+Models returned by `CachedParser` are frozen, as they are shared between callers.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import pydantic
+from pydantic import BaseModel
+
+from pycfmodel import snapshot
+from pycfmodel.model.cf_model import CFModel
+
+Template = Union[bytes, str, Dict[str, Any]]
+
+_SUFFIX = ".snapshot"
+
+
+def _pycfmodel_version() -> str:
+    try:
+        return version("pycfmodel")
+    except PackageNotFoundError:
+        # Not installed, such as when running from a checkout, where only the digest of the models tells versions apart
+        return "source"
+
+
+def _models_digest() -> str:
+    """Digest of the names and fields of every model of pycfmodel, which changes whenever the models change."""
+    names = set()
+    classes = [BaseModel]
+    seen = set()
+    while classes:
+        for subclass in classes.pop().__subclasses__():
+            if subclass in seen:
+                continue
+            seen.add(subclass)
+            classes.append(subclass)
+            # Parametrized generic models are created on demand, so they depend on what was used before
+            if subclass.__module__.startswith("pycfmodel.model.") and "[" not in subclass.__qualname__:
+                names.add(f"{subclass.__module__}:{subclass.__qualname__}:{','.join(subclass.__pydantic_fields__)}")
+    return hashlib.sha256("\n".join(sorted(names)).encode("utf-8")).hexdigest()[:16]
+
+
+# Stored models are only loaded by the same versions of the models and their dependencies
+CACHE_VERSION = (
+    f"{_pycfmodel_version()}|models-{_models_digest()}|snapshot-{snapshot.FORMAT_VERSION}"
+    f"|pydantic-{pydantic.VERSION}|py{sys.version_info[0]}.{sys.version_info[1]}"
+)
+
+
+def template_bytes(template: Template) -> bytes:
+    """Bytes the digest of a template is computed from. Dicts are serialized with sorted keys."""
+    if isinstance(template, bytes):
+        return template
+    if isinstance(template, str):
+        return template.encode("utf-8")
+    return json.dumps(template, sort_keys=True, default=str).encode("utf-8")
+
+
+def template_digest(template: Template, extra_params: Optional[Dict] = None, resolve: bool = False) -> str:
+    """
+    Key of a template in the caches.
+
+    Arguments:
+        template: Raw template, or the already loaded dict.
+        extra_params: Parameters the template is resolved with.
+        resolve: Whether the model is resolved.
+    """
+    digest = hashlib.sha256()
+    digest.update(CACHE_VERSION.encode("utf-8"))
+    digest.update(b"\0resolved\0" if resolve else b"\0parsed\0")
+    if resolve:
+        digest.update(json.dumps(extra_params or {}, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(template_bytes(template))
+    return digest.hexdigest()
+
+
+@dataclass
+class DiskCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+class DiskCache:
+    """
+    Stores models in a directory, one file per template, evicting the least recently used ones when the files take
+    more than `max_bytes`. Several processes can share the same directory.
+
+    The size and last access time of every entry are kept in an index, built from the directory the first time an
+    entry is stored, so storing an entry doesn't scan the directory. The index is only built again when it exceeds
+    `max_bytes`, to take into account the entries other processes stored or removed before evicting any.
+
+    The index is not written to disk: the directory already records the size and modification time of every entry,
+    and a shared index file would need locks between the processes that use the directory to stay in sync with it.
+
+    Arguments:
+        directory: Where models are stored. It is created if it doesn't exist.
+        max_bytes: Maximum size of the stored models.
+        loader: Converts raw templates to dicts. Use `yaml.safe_load` or similar for YAML templates.
+        key: Key of the digests of the entries, up to 64 bytes, see [dumps][pycfmodel.snapshot.dumps]. Entries
+            written with another key are discarded.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 512 * 1024 * 1024,
+        loader: Callable[[bytes], Dict[str, Any]] = json.loads,
+        key: Optional[bytes] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self.key = key
+        self.stats = DiskCacheStats()
+        # Last access time and size of each entry by file name, None until it is first needed
+        self._index: Optional[Dict[str, Tuple[float, int]]] = None
+        self._total = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> Optional[CFModel]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self.stats.misses += 1
+            return None
+        try:
+            model = snapshot.loads(data, key=self.key)
+        except snapshot.SnapshotError:
+            # Truncated, written with another key or by an incompatible version
+            path.unlink(missing_ok=True)
+            self._forget(path.name)
+            self.stats.misses += 1
+            return None
+        # The modification time is used as last access time for the eviction, by every process
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        if self._index is not None and path.name in self._index:
+            self._index[path.name] = (time.time(), len(data))
+        self.stats.hits += 1
+        return model
+
+    def put(self, key: str, model: CFModel):
+        data = snapshot.dumps(model, key=self.key)
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as temporary_file:
+                temporary_file.write(data)
+            os.replace(temporary_path, path)
+        except BaseException:
+            Path(temporary_path).unlink(missing_ok=True)
+            raise
+        if self._index is None:
+            self._load_index()
+        else:
+            self._forget(path.name)
+            self._index[path.name] = (time.time(), len(data))
+            self._total += len(data)
+        if self._total > self.max_bytes:
+            self._load_index()
+            self._evict()
+
+    def parse(self, template: Template, extra_params: Optional[Dict] = None, resolve: bool = False) -> CFModel:
+        """
+        Returns the model of a template, parsing it and storing it only if it is not cached.
+
+        Arguments:
+            template: Raw template, loaded with `loader`, or the already loaded dict.
+            extra_params: Parameters the template is resolved with.
+            resolve: Whether to return the resolved model.
+        """
+        key = template_digest(template, extra_params, resolve)
+        model = self.get(key)
+        if model is None:
+            template_dict = template if isinstance(template, dict) else self.loader(template)
+            model = CFModel.model_validate(template_dict)
+            if resolve:
+                # resolve consumes the parameters it uses
+                model = model.resolve(extra_params=dict(extra_params or {}))
+            self.put(key, model)
+        return model
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(_SUFFIX))
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(_SUFFIX):
+                Path(entry.path).unlink(missing_ok=True)
+        self._index = None
+        self._total = 0
+
+    def _load_index(self):
+        index = {}
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            index[entry.name] = (stat.st_mtime, stat.st_size)
+        self._index = index
+        self._total = sum(size for _, size in index.values())
+
+    def _forget(self, name: str):
+        if self._index is not None:
+            entry = self._index.pop(name, None)
+            if entry is not None:
+                self._total -= entry[1]
+
+    def _evict(self):
+        for name, _ in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self._total <= self.max_bytes:
+                break
+            (self.directory / name).unlink(missing_ok=True)
+            self._forget(name)
+            self.stats.evictions += 1
+
+
+def approximate_size(obj: Any) -> int:
+    """Bytes taken by an object and everything reachable from it through models, dicts and collections."""
+    getsizeof = sys.getsizeof
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += getsizeof(current)
+        if isinstance(current, BaseModel):
+            fields = current.__dict__
+            total += getsizeof(fields)
+            stack.extend(fields.values())
+            if current.__pydantic_extra__:
+                stack.extend(current.__pydantic_extra__.values())
+        elif isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+    return total
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class CachedParser:
+    """
+    Parses and resolves templates, keeping the models of the most recently used ones in memory. It is safe to share
+    between threads. Returned models are frozen, see `CustomModel.freeze`.
+
+    Arguments:
+        maxsize: Maximum number of models kept. Parsed and resolved models are counted separately.
+        max_bytes: Maximum approximate size of the models kept, if any.
+        loader: Converts raw templates to dicts.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        max_bytes: Optional[int] = None,
+        loader: Callable[[bytes], Dict[str, Any]] = json.loads,
+    ):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.loader = loader
+        self._lock = Lock()
+        self._entries: "OrderedDict[str, Tuple[CFModel, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self, template: Template) -> CFModel:
+        """Returns the model of a template, parsing it only if it is not cached."""
+        key = template_digest(template)
+        return self._get(key) or self._put(key, self._parse(template))
+
+    def resolve(self, template: Template, extra_params: Optional[Dict] = None) -> CFModel:
+        """Returns the resolved model of a template, resolving it only if it is not cached for the same parameters."""
+        key = template_digest(template, extra_params, resolve=True)
+        model = self._get(key)
+        if model is None:
+            # resolve consumes the parameters it uses
+            model = self._put(key, self.parse(template).resolve(extra_params=dict(extra_params or {})))
+        return model
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _parse(self, template: Template) -> CFModel:
+        return CFModel.model_validate(template if isinstance(template, dict) else self.loader(template))
+
+    def _get(self, key: str) -> Optional[CFModel]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def _put(self, key: str, model: CFModel) -> CFModel:
+        model.freeze()
+        size = approximate_size(model)
+        with self._lock:
+            existing = self._entries.get(key)
+            if existing is not None:
+                # Another thread built the same model meanwhile, the one already shared is kept
+                return existing[0]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return model
+            self._entries[key] = (model, size)
+            self._bytes += size
+            while len(self._entries) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+        return model
@@ -28,3 +28,9 @@ CONTAINS_SSM_PARAMETER = re.compile(r"{{resolve:ssm:([a-zA-Z0-9_./-]+:\d+)}}")
 
 IPV4_ZERO_VALUE = "0.0.0.0/0"
 IPV6_ZERO_VALUE = "::/0"
+# Private address space, as defined by RFC 1918 and RFC 4193
+IPV4_PRIVATE_VALUES = ("10.0.0.0/8", "172.16.0.0/12", "192.168.0.0/16")
+IPV6_PRIVATE_VALUES = ("fc00::/7",)
+
+ALL_PROTOCOLS = "-1"
+ALL_PORTS = (0, 65535)
@@ -0,0 +1,167 @@
+"""
+Structured diagnostics for issues found while parsing, resolving and evaluating templates.
+
+Issues such as unresolved references or resources parsed as `GenericResource` are reported through `report_issue`.
+When a `DiagnosticsCollector` is active, each distinct issue is recorded once with the number of times it happened,
+and its message is only formatted when read. Otherwise, issues are logged as they happen, formatting the message only
+if the logger would emit it.
+
+Example:
+
+    from pycfmodel import parse
+    from pycfmodel.diagnostics import DiagnosticsCollector
+
+    diagnostics = DiagnosticsCollector()
+    model = parse(template, diagnostics=diagnostics).resolve(diagnostics=diagnostics)
+    for diagnostic in diagnostics:
+        print(diagnostic.count, diagnostic.message)
+
+Codes:
+
+- `generic_resource`: a resource was parsed as a `GenericResource`, keyed by its type.
+- `unresolved_ref`: a `Ref` or `Fn::ImportValue` to an unknown parameter, keyed by the parameter name.
+- `unresolved_mapping`: a `Fn::FindInMap` without value, keyed by the mapping and its keys.
+- `unresolved_ssm`: a SSM parameter without value, keyed by the parameter key.
+- `unresolved_get_att`: a `Fn::GetAtt`, which is not resolved.
+- `unresolved_get_azs`: a `Fn::GetAZs`, which is not resolved.
+- `select_out_of_range`: a `Fn::Select` with an index bigger than the resolved list.
+- `unsupported_condition_operator`: a statement condition with an unknown operator, keyed by the operator.
+- `condition_evaluation_error`: an exception raised while evaluating a statement condition, keyed by its type.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+GENERIC_RESOURCE = "generic_resource"
+UNRESOLVED_REF = "unresolved_ref"
+UNRESOLVED_MAPPING = "unresolved_mapping"
+UNRESOLVED_SSM = "unresolved_ssm"
+UNRESOLVED_GET_ATT = "unresolved_get_att"
+UNRESOLVED_GET_AZS = "unresolved_get_azs"
+SELECT_OUT_OF_RANGE = "select_out_of_range"
+UNSUPPORTED_CONDITION_OPERATOR = "unsupported_condition_operator"
+CONDITION_EVALUATION_ERROR = "condition_evaluation_error"
+
+
+@dataclass
+class Diagnostic:
+    """
+    An issue, with the arguments of its first occurrence.
+
+    Arguments:
+        code: Kind of issue.
+        key: Identifies the issue among the ones with the same code.
+        level: Logging level of the issue.
+        template: %-style format of the message.
+        args: Arguments of the message.
+        count: Number of occurrences.
+        exc_info: Exception of the first occurrence, if any.
+    """
+
+    code: str
+    key: Hashable
+    level: int
+    template: str
+    args: Tuple
+    count: int = 1
+    exc_info: Optional[BaseException] = None
+
+    @property
+    def message(self) -> str:
+        return self.template % self.args if self.args else self.template
+
+
+class DiagnosticsCollector:
+    """
+    Records each distinct issue once, with counts. It is safe to share between threads.
+
+    Arguments:
+        log: If True, the first occurrence of each issue is also logged.
+    """
+
+    def __init__(self, log: bool = False):
+        self.log = log
+        self._lock = Lock()
+        self._diagnostics: Dict[Tuple[str, Hashable], Diagnostic] = {}
+
+    def record(
+        self,
+        logger: logging.Logger,
+        level: int,
+        code: str,
+        key: Hashable,
+        template: str,
+        args: Tuple,
+        exc_info: Optional[BaseException],
+    ):
+        with self._lock:
+            diagnostic = self._diagnostics.get((code, key))
+            if diagnostic is not None:
+                diagnostic.count += 1
+                return
+            self._diagnostics[(code, key)] = Diagnostic(code, key, level, template, args, exc_info=exc_info)
+        if self.log:
+            logger.log(level, template, *args, exc_info=exc_info)
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        with self._lock:
+            return iter(list(self._diagnostics.values()))
+
+    def __len__(self) -> int:
+        return len(self._diagnostics)
+
+    def by_code(self, code: str) -> List[Diagnostic]:
+        return [diagnostic for diagnostic in self if diagnostic.code == code]
+
+    def counts(self) -> Dict[str, int]:
+        """Number of occurrences per code."""
+        counts: Dict[str, int] = {}
+        for diagnostic in self:
+            counts[diagnostic.code] = counts.get(diagnostic.code, 0) + diagnostic.count
+        return counts
+
+
+_current_collector: ContextVar[Optional[DiagnosticsCollector]] = ContextVar("pycfmodel_diagnostics", default=None)
+
+
+@contextmanager
+def collect_diagnostics(collector: Optional[DiagnosticsCollector] = None) -> Iterator[DiagnosticsCollector]:
+    """Sends the issues reported by the code run inside the context to a collector, a new one by default."""
+    collector = DiagnosticsCollector() if collector is None else collector
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+
+def report_issue(
+    logger: logging.Logger,
+    level: int,
+    code: str,
+    template: str,
+    *args,
+    key: Hashable = None,
+    exc_info: Optional[BaseException] = None,
+):
+    """
+    Reports an issue to the active collector, or logs it when there is none.
+
+    Arguments:
+        logger: Logger of the module reporting the issue.
+        level: Logging level.
+        code: Kind of issue.
+        template: %-style format of the message, formatted lazily with `args`.
+        key: Identifies the issue among the ones with the same code. Occurrences with the same code and key are
+            counted as the same issue.
+        exc_info: Exception that caused the issue, if any.
+    """
+    collector = _current_collector.get()
+    if collector is not None:
+        collector.record(logger, level, code, key, template, args, exc_info)
+    elif logger.isEnabledFor(level):
+        logger.log(level, template, *args, exc_info=exc_info)
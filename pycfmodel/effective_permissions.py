@@ -0,0 +1,294 @@
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+from pycfmodel.model.resources.properties.statement import Principal, Statement
+from pycfmodel.utils import convert_to_list
+
+WILDCARD = "*"
+ALL_RESOURCES: FrozenSet[str] = frozenset([WILDCARD])
+
+
+def _is_literal(pattern: str) -> bool:
+    return "*" not in pattern and "?" not in pattern
+
+
+@lru_cache(maxsize=4096)
+def resource_regex(pattern: str) -> Pattern:
+    """
+    Case sensitive regex of a resource pattern, where `*` matches any sequence of characters and `?` any single
+    character. Unlike actions, resource ARNs are case sensitive.
+    """
+    return re.compile(
+        "".join(".*" if char == "*" else "." if char == "?" else re.escape(char) for char in pattern), re.DOTALL
+    )
+
+
+def resource_pattern_covers(pattern: str, other: str) -> bool:
+    """
+    Returns True when every resource matched by `other` is also matched by `pattern`. It errs on the side of False
+    when that can't be cheaply decided.
+
+    Arguments:
+        pattern: Resource pattern, such as `arn:aws:s3:::bucket/*`.
+        other: Resource pattern to check.
+    """
+    if pattern == WILDCARD or pattern == other:
+        return True
+    if _is_literal(other):
+        return bool(resource_regex(pattern).fullmatch(other))
+    if pattern.endswith("*") and _is_literal(pattern[:-1]):
+        return other.startswith(pattern[:-1])
+    return False
+
+
+def _literal_prefix(pattern: str) -> str:
+    wildcards = [position for position in (pattern.find("*"), pattern.find("?")) if position != -1]
+    return pattern[: min(wildcards)] if wildcards else pattern
+
+
+def resource_patterns_overlap(pattern: str, other: str) -> bool:
+    """
+    Returns True when some resource may be matched by both patterns. It errs on the side of True when that can't be
+    cheaply decided.
+
+    Arguments:
+        pattern: Resource pattern, such as `arn:aws:s3:::bucket/*`.
+        other: Resource pattern to check.
+    """
+    if _is_literal(other):
+        return bool(resource_regex(pattern).fullmatch(other))
+    if _is_literal(pattern):
+        return bool(resource_regex(other).fullmatch(pattern))
+    prefix, other_prefix = _literal_prefix(pattern), _literal_prefix(other)
+    return prefix.startswith(other_prefix) or other_prefix.startswith(prefix)
+
+
+def _statement_resources(statement: Statement, unresolved: FrozenSet[str]) -> FrozenSet[str]:
+    """
+    Resource patterns of a statement. `NotResource` or a missing `Resource` are considered as all resources.
+
+    Arguments:
+        statement: The statement.
+        unresolved: Resources to use when none of the resources of the statement are resolved, such as `Fn::Sub`
+            values. All resources for allows and none for denies, so that unknown values never hide a permission.
+    """
+    if statement.NotResource is not None or statement.Resource is None:
+        return ALL_RESOURCES
+    resources = frozenset(resource for resource in convert_to_list(statement.Resource) if isinstance(resource, str))
+    return resources or unresolved
+
+
+def _applies_to_every_principal(statement: Statement) -> bool:
+    if statement.NotPrincipal is not None:
+        return False
+    principal = statement.Principal
+    if principal is None or convert_to_list(principal) == [WILDCARD]:
+        return True
+    return (
+        isinstance(principal, Principal)
+        and convert_to_list(principal.AWS) == [WILDCARD]
+        and principal.CanonicalUser is None
+        and principal.Federated is None
+        and principal.Service is None
+    )
+
+
+class EffectivePermissions:
+    """
+    Actions, and the resources they apply to, that are allowed by a group of statements once explicit denies are taken
+    into account (Allow − Deny). Actions are partitioned by service.
+
+    - Actions are expanded against the known AWS actions, so wildcards and `NotAction` are supported.
+    - Allow statements with `NotResource` are considered to apply to all resources.
+    - Deny statements with a `Condition`, with `NotResource`, with `NotPrincipal` or with a `Principal` other than
+      everyone are not subtracted, as they only deny in some contexts or to some principals.
+    - Resources that are not resolved, such as `Fn::Sub` values, are considered as all resources in allows and as no
+      resource in denies, so that permissions are never under-reported.
+    - A deny only removes the resources of an allow when it covers them entirely, e.g. `arn:aws:s3:::bucket/*`
+      removes `arn:aws:s3:::bucket/key` but not the other way around. Narrower denies, such as `arn:aws:s3:::bucket/*`
+      against `*`, are kept as the denied resources of the action, and `is_allowed` takes them into account.
+
+    Sets of resources are shared between actions whenever possible to keep the result compact.
+    """
+
+    __slots__ = ("_by_service", "_denied")
+
+    def __init__(
+        self,
+        by_service: Dict[str, Dict[str, FrozenSet[str]]],
+        denied: Optional[Dict[str, FrozenSet[str]]] = None,
+    ):
+        self._by_service = by_service
+        self._denied = denied or {}
+
+    @classmethod
+    def from_statements(cls, statements: Iterable[Statement]) -> "EffectivePermissions":
+        """
+        Arguments:
+            statements: Resolved [statements][pycfmodel.model.resources.properties.statement.Statement].
+
+        Returns:
+            The effective permissions.
+        """
+        interned: Dict[FrozenSet[str], FrozenSet[str]] = {}
+        allowed: Dict[str, FrozenSet[str]] = {}
+        denied: Dict[str, FrozenSet[str]] = {}
+        denies: List[Tuple[Tuple[str, ...], FrozenSet[str]]] = []
+
+        for statement in statements:
+            # Effect is only normalized by validation, not by model_construct or snapshot loading
+            effect = statement.Effect.lower() if isinstance(statement.Effect, str) else None
+            if effect == "allow":
+                resources = _statement_resources(statement, ALL_RESOURCES)
+                resources = interned.setdefault(resources, resources)
+                for action in statement._expanded_actions:
+                    current = allowed.get(action)
+                    if current is None or current is resources:
+                        allowed[action] = resources
+                    else:
+                        union = current | resources
+                        allowed[action] = interned.setdefault(union, union)
+            elif (
+                effect == "deny"
+                and not statement.Condition
+                and statement.NotResource is None
+                and _applies_to_every_principal(statement)
+            ):
+                denied_resources = _statement_resources(statement, frozenset())
+                if denied_resources:
+                    denies.append((statement._expanded_actions, denied_resources))
+
+        for actions, denied_resources in denies:
+            for action in actions:
+                current = allowed.get(action)
+                if current is None:
+                    continue
+                remaining = frozenset(
+                    resource
+                    for resource in current
+                    if not any(resource_pattern_covers(denied, resource) for denied in denied_resources)
+                )
+                if not remaining:
+                    del allowed[action]
+                    continue
+                if remaining != current:
+                    allowed[action] = interned.setdefault(remaining, remaining)
+                # Allowed resources left are not covered by any deny, but they can still be denied in part
+                partial = frozenset(
+                    denied_resource
+                    for denied_resource in denied_resources
+                    if any(resource_patterns_overlap(denied_resource, resource) for resource in remaining)
+                )
+                if partial:
+                    union = denied.get(action, frozenset()) | partial
+                    denied[action] = interned.setdefault(union, union)
+
+        by_service: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        for action in sorted(allowed):
+            by_service.setdefault(action.split(":", 1)[0].lower(), {})[action] = allowed[action]
+        return cls(by_service, {action: resources for action, resources in denied.items() if action in allowed})
+
+    def services(self) -> List[str]:
+        """
+        Returns:
+            Sorted list of services with at least one allowed action.
+        """
+        return sorted(self._by_service)
+
+    def actions(self, service: Optional[str] = None) -> List[str]:
+        """
+        Arguments:
+            service: Only return actions of this service, such as `s3`.
+
+        Returns:
+            Sorted list of allowed actions.
+        """
+        if service is not None:
+            return list(self._by_service.get(service.lower(), {}))
+        return sorted(action for actions in self._by_service.values() for action in actions)
+
+    def _find_action(self, action: str) -> Optional[str]:
+        service_actions = self._by_service.get(action.split(":", 1)[0].lower(), {})
+        if action in service_actions:
+            return action
+        lowered_action = action.lower()
+        for service_action in service_actions:
+            if service_action.lower() == lowered_action:
+                return service_action
+        return None
+
+    def resources(self, action: str) -> FrozenSet[str]:
+        """
+        Arguments:
+            action: Action name, case insensitive.
+
+        Returns:
+            Resource patterns the action is allowed on, empty if it's not allowed at all. Parts of them may be denied,
+            see `denied_resources`.
+        """
+        found = self._find_action(action)
+        if found is None:
+            return frozenset()
+        return self._by_service[found.split(":", 1)[0].lower()][found]
+
+    def denied_resources(self, action: str) -> FrozenSet[str]:
+        """
+        Arguments:
+            action: Action name, case insensitive.
+
+        Returns:
+            Resource patterns the action is denied on within the resources it is allowed on, empty if there are none.
+        """
+        found = self._find_action(action)
+        if found is None:
+            return frozenset()
+        return self._denied.get(found, frozenset())
+
+    def is_allowed(self, action: str, resource: Optional[str] = None) -> bool:
+        """
+        Arguments:
+            action: Action name, case insensitive.
+            resource: Resource ARN. When not given, checks if the action is allowed on any resource.
+
+        Returns:
+            True if the action is allowed.
+        """
+        resources = self.resources(action)
+        if resource is None:
+            return bool(resources)
+        return any(resource_regex(pattern).fullmatch(resource) for pattern in resources) and not any(
+            resource_regex(pattern).fullmatch(resource) for pattern in self.denied_resources(action)
+        )
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            Dictionary of allowed actions and their sorted resource patterns.
+        """
+        return {
+            action: sorted(resources)
+            for service in self.services()
+            for action, resources in self._by_service[service].items()
+        }
+
+    def denied_to_dict(self) -> Dict[str, List[str]]:
+        """
+        Returns:
+            Dictionary of allowed actions with denied resources, and their sorted denied resource patterns.
+        """
+        return {action: sorted(self._denied[action]) for action in self.actions() if action in self._denied}
+
+    def __len__(self) -> int:
+        return sum(len(actions) for actions in self._by_service.values())
+
+    def __contains__(self, action: str) -> bool:
+        return bool(self.resources(action))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EffectivePermissions):
+            return self._by_service == other._by_service and self._denied == other._denied
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EffectivePermissions(services={len(self._by_service)}, actions={len(self)})"
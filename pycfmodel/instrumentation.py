@@ -0,0 +1,391 @@
+"""
+Instrumentation hooks for the parse → resolve → expand_actions pipeline.
+
+Observers receive the start and end of every phase, plus punctual events. Nothing is measured unless an observer is
+active, so the cost when disabled is a context variable lookup per instrumented call site.
+
+Example:
+
+    from pycfmodel import parse
+    from pycfmodel.instrumentation import TimingObserver, observe
+
+    with observe(TimingObserver()) as timings:
+        model = parse(template).resolve()
+    print(timings.report())
+
+Phases, with the label they are reported with:
+
+- `validate`: validation of a whole template.
+- `validate_resource`: validation of a single resource, labelled with its type.
+- `dump`: conversion of a template to a dict, done before resolving and expanding actions.
+- `resolve`: resolution of a whole template.
+- `resolve_resource`: resolution of a single resource, labelled with its logical id. Not labelled in Prometheus.
+- `resolve_function`: resolution of an intrinsic function, labelled with its name (`Fn::Sub`, `Ref`...). Durations of
+  nested functions are included in the duration of the function that contains them.
+- `expand_actions`: expansion of the actions of a whole template, and of each resource labelled with its type.
+
+Events:
+
+- `unresolved_ref`: a `Ref` to an unknown parameter, labelled with the parameter name. Not labelled in Prometheus.
+- `unresolved_mapping`: a `Fn::FindInMap` without value, labelled with the mapping name. Not labelled in Prometheus.
+- `unresolved_ssm`: a SSM parameter without value, labelled with the parameter key. Not labelled in Prometheus.
+"""
+
+import heapq
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from operator import itemgetter
+from threading import Lock
+from time import perf_counter
+from typing import Any, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+VALIDATE = "validate"
+VALIDATE_RESOURCE = "validate_resource"
+DUMP = "dump"
+RESOLVE = "resolve"
+RESOLVE_RESOURCE = "resolve_resource"
+RESOLVE_FUNCTION = "resolve_function"
+EXPAND_ACTIONS = "expand_actions"
+
+UNRESOLVED_REF = "unresolved_ref"
+UNRESOLVED_MAPPING = "unresolved_mapping"
+UNRESOLVED_SSM = "unresolved_ssm"
+
+
+class Observer:
+    """
+    Base class for observers. All hooks do nothing, subclasses override the ones they need.
+
+    Hooks are called synchronously from the thread doing the work, so they should be fast.
+    """
+
+    def phase_started(self, phase: str, label: Optional[str]):
+        pass
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        """
+        Arguments:
+            phase: Name of the phase.
+            label: Detail of the phase, such as the resource type or the intrinsic function name.
+            duration: Seconds spent in the phase.
+            error: Exception raised in the phase, if any.
+        """
+
+    def event(self, name: str, label: Optional[str]):
+        pass
+
+
+class CompositeObserver(Observer):
+    """Forwards every hook to several observers, in order."""
+
+    def __init__(self, *observers: Observer):
+        self.observers = observers
+
+    def phase_started(self, phase: str, label: Optional[str]):
+        for observer in self.observers:
+            observer.phase_started(phase, label)
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        for observer in reversed(self.observers):
+            observer.phase_finished(phase, label, duration, error)
+
+    def event(self, name: str, label: Optional[str]):
+        for observer in self.observers:
+            observer.event(name, label)
+
+
+_current_observer: ContextVar[Optional[Observer]] = ContextVar("pycfmodel_observer", default=None)
+_NO_PHASE = nullcontext()
+
+
+def current_observer() -> Optional[Observer]:
+    return _current_observer.get()
+
+
+@contextmanager
+def observe(observer: Observer) -> Iterator[Observer]:
+    """
+    Activates an observer for the code run inside the context, including code run in tasks created inside it.
+    Observers activated inside the context of another one are notified together with it.
+    """
+    previous = _current_observer.get()
+    token = _current_observer.set(observer if previous is None else CompositeObserver(previous, observer))
+    try:
+        yield observer
+    finally:
+        _current_observer.reset(token)
+
+
+class _Phase:
+    __slots__ = ("observer", "phase", "label", "start")
+
+    def __init__(self, observer: Observer, phase: str, label: Optional[str]):
+        self.observer = observer
+        self.phase = phase
+        self.label = label
+
+    def __enter__(self):
+        self.observer.phase_started(self.phase, self.label)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.observer.phase_finished(self.phase, self.label, perf_counter() - self.start, exc_value)
+        return False
+
+
+def phase(name: str, label: Optional[str] = None) -> ContextManager:
+    """
+    Context manager that reports a phase to the current observer. Returns a shared no-op context manager when there
+    is no observer.
+    """
+    observer = _current_observer.get()
+    if observer is None:
+        return _NO_PHASE
+    return _Phase(observer, name, label)
+
+
+def event(name: str, label: Optional[str] = None):
+    """Reports an event to the current observer, if any."""
+    observer = _current_observer.get()
+    if observer is not None:
+        observer.event(name, label)
+
+
+@dataclass
+class PhaseTiming:
+    """Aggregated measures of a phase."""
+
+    count: int = 0
+    errors: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class TimingObserver(Observer):
+    """Aggregates counts and durations per phase and label, and counts events. It is safe to share between threads."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.timings: Dict[Tuple[str, Optional[str]], PhaseTiming] = defaultdict(PhaseTiming)
+        self.events: Dict[Tuple[str, Optional[str]], int] = defaultdict(int)
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        with self._lock:
+            timing = self.timings[(phase, label)]
+            timing.count += 1
+            timing.total += duration
+            timing.max = max(timing.max, duration)
+            if error is not None:
+                timing.errors += 1
+
+    def event(self, name: str, label: Optional[str]):
+        with self._lock:
+            self.events[(name, label)] += 1
+
+    def report(self) -> str:
+        """Table with the phases sorted by total time."""
+        lines = [f"{'phase':<20}{'label':<48}{'count':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+        with self._lock:
+            timings = sorted(self.timings.items(), key=lambda item: item[1].total, reverse=True)
+        for (phase_name, label), timing in timings:
+            lines.append(
+                f"{phase_name:<20}{label or '':<48}{timing.count:>8}{timing.total * 1000:>12.3f}"
+                f"{timing.mean * 1000:>10.3f}{timing.max * 1000:>10.3f}"
+            )
+        return "\n".join(lines)
+
+
+@dataclass
+class FunctionStats:
+    """
+    Measures of an intrinsic function. `total` includes the time spent in the functions nested in it, `own` does not.
+    """
+
+    count: int = 0
+    total: float = 0.0
+    own: float = 0.0
+
+
+class ResolutionStats(Observer):
+    """
+    Statistics of the resolution of a template, filled by `CFModel.resolve(stats=...)`.
+
+    Example:
+
+        stats = ResolutionStats()
+        model = parse(template).resolve(stats=stats)
+        print(stats.report())
+    """
+
+    def __init__(self):
+        self.functions: Dict[str, FunctionStats] = defaultdict(FunctionStats)
+        self.resources: Dict[str, float] = {}
+        self.unresolved_refs: Counter = Counter()
+        self.unresolved_mappings: Counter = Counter()
+        self.unresolved_ssm_parameters: Counter = Counter()
+        self.duration: float = 0.0
+        # Time spent in nested functions, for each function being resolved
+        self._nested: List[float] = []
+
+    def phase_started(self, phase: str, label: Optional[str]):
+        if phase == RESOLVE_FUNCTION:
+            self._nested.append(0.0)
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        if phase == RESOLVE_FUNCTION:
+            function = self.functions[label]
+            function.count += 1
+            function.total += duration
+            function.own += duration - self._nested.pop()
+            if self._nested:
+                self._nested[-1] += duration
+        elif phase == RESOLVE_RESOURCE:
+            self.resources[label] = duration
+        elif phase == RESOLVE:
+            self.duration += duration
+
+    def event(self, name: str, label: Optional[str]):
+        if name == UNRESOLVED_REF:
+            self.unresolved_refs[label] += 1
+        elif name == UNRESOLVED_MAPPING:
+            self.unresolved_mappings[label] += 1
+        elif name == UNRESOLVED_SSM:
+            self.unresolved_ssm_parameters[label] += 1
+
+    @property
+    def unresolved_count(self) -> int:
+        return (
+            sum(self.unresolved_refs.values())
+            + sum(self.unresolved_mappings.values())
+            + sum(self.unresolved_ssm_parameters.values())
+        )
+
+    def slowest_resources(self, n: int = 10) -> List[Tuple[str, float]]:
+        """Logical ids and resolution seconds of the `n` slowest resources, slowest first."""
+        return heapq.nlargest(n, self.resources.items(), key=itemgetter(1))
+
+    def report(self, n: int = 10) -> str:
+        lines = [f"Resolved {len(self.resources)} resources in {self.duration * 1000:.3f} ms"]
+        lines.append(f"{'function':<20}{'count':>8}{'total ms':>12}{'own ms':>12}")
+        for name, function in sorted(self.functions.items(), key=lambda item: item[1].own, reverse=True):
+            lines.append(f"{name:<20}{function.count:>8}{function.total * 1000:>12.3f}{function.own * 1000:>12.3f}")
+        lines.append(
+            f"Unresolved: {sum(self.unresolved_refs.values())} refs, "
+            f"{sum(self.unresolved_mappings.values())} mappings, "
+            f"{sum(self.unresolved_ssm_parameters.values())} SSM parameters"
+        )
+        lines.append("Slowest resources:")
+        lines.extend(
+            f"  {logical_id:<48}{seconds * 1000:>12.3f} ms" for logical_id, seconds in self.slowest_resources(n)
+        )
+        return "\n".join(lines)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class PrometheusObserver(TimingObserver):
+    """
+    Exports the aggregated measures as Prometheus counters, in the text exposition format, without depending on a
+    Prometheus client. The output of `exposition` can be served on a metrics endpoint or written to a textfile
+    collector.
+
+    Phases and events labelled with names taken from the templates, such as the logical ids of `resolve_resource` or
+    the parameter names of `unresolved_ref`, are exported without label, so that the number of series doesn't grow with
+    every template seen.
+    """
+
+    unlabelled_phases = frozenset([RESOLVE_RESOURCE])
+    unlabelled_events = frozenset([UNRESOLVED_REF, UNRESOLVED_MAPPING, UNRESOLVED_SSM])
+
+    def __init__(self, namespace: str = "pycfmodel", const_labels: Optional[Dict[str, str]] = None):
+        super().__init__()
+        self.namespace = namespace
+        self.const_labels = const_labels or {}
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        if phase in self.unlabelled_phases:
+            label = None
+        super().phase_finished(phase, label, duration, error)
+
+    def event(self, name: str, label: Optional[str]):
+        if name in self.unlabelled_events:
+            label = None
+        super().event(name, label)
+
+    def _labels(self, **labels: Optional[str]) -> str:
+        values = {**self.const_labels, **{key: value for key, value in labels.items() if value is not None}}
+        return ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in values.items())
+
+    def exposition(self) -> str:
+        metrics = [
+            ("phase_total", "counter", "Number of times a phase ran."),
+            ("phase_errors_total", "counter", "Number of times a phase raised an exception."),
+            ("phase_seconds_total", "counter", "Seconds spent in a phase."),
+            ("events_total", "counter", "Number of events."),
+        ]
+        with self._lock:
+            timings = list(self.timings.items())
+            events = list(self.events.items())
+        samples: Dict[str, List[str]] = defaultdict(list)
+        for (phase_name, label), timing in timings:
+            labels = self._labels(phase=phase_name, label=label)
+            samples["phase_total"].append(f"{{{labels}}} {timing.count}")
+            samples["phase_errors_total"].append(f"{{{labels}}} {timing.errors}")
+            samples["phase_seconds_total"].append(f"{{{labels}}} {timing.total!r}")
+        for (name, label), count in events:
+            samples["events_total"].append(f"{{{self._labels(event=name, label=label)}}} {count}")
+
+        lines = []
+        for metric, metric_type, help_text in metrics:
+            full_name = f"{self.namespace}_{metric}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            lines.extend(f"{full_name}{sample}" for sample in samples[metric])
+        return "\n".join(lines) + "\n"
+
+
+class OpenTelemetryObserver(Observer):
+    """
+    Reports each phase as an OpenTelemetry span and each event as a span event, nested under the span that is current
+    when the phase starts. Open spans are tracked per context, like observers, so that concurrent tasks on the same
+    thread don't nest their spans into each other.
+
+    Arguments:
+        tracer: An `opentelemetry.trace.Tracer`, or any object with a compatible `start_as_current_span` method.
+    """
+
+    def __init__(self, tracer: Any):
+        self.tracer = tracer
+        # Tuples, as tasks get a copy of the context they are created in and must not modify the spans of their parent
+        self._spans: ContextVar[Tuple[Tuple[Any, Any], ...]] = ContextVar("pycfmodel_open_telemetry_spans", default=())
+
+    def phase_started(self, phase: str, label: Optional[str]):
+        attributes = {"pycfmodel.phase": phase}
+        if label is not None:
+            attributes["pycfmodel.label"] = label
+        span_context = self.tracer.start_as_current_span(f"pycfmodel.{phase}", attributes=attributes)
+        self._spans.set(self._spans.get() + ((span_context, span_context.__enter__()),))
+
+    def phase_finished(self, phase: str, label: Optional[str], duration: float, error: Optional[BaseException]):
+        spans = self._spans.get()
+        span_context, _ = spans[-1]
+        self._spans.set(spans[:-1])
+        if error is None:
+            span_context.__exit__(None, None, None)
+        else:
+            span_context.__exit__(type(error), error, error.__traceback__)
+
+    def event(self, name: str, label: Optional[str]):
+        spans = self._spans.get()
+        if spans:
+            _, span = spans[-1]
+            span.add_event(f"pycfmodel.{name}", attributes={} if label is None else {"pycfmodel.label": label})
@@ -1,10 +1,188 @@
+from functools import cached_property, lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+
 from pydantic import BaseModel, ConfigDict, model_validator
+from pydantic_core import ValidationError
+from typing_extensions import Self
 
 from pycfmodel.utils import is_resolvable_dict
 
 
+@lru_cache(maxsize=None)
+def _cached_property_names(model_class: Type[BaseModel]) -> Tuple[str, ...]:
+    return tuple(
+        name
+        for klass in model_class.__mro__
+        for name, value in vars(klass).items()
+        if isinstance(value, cached_property)
+    )
+
+
+# Key of the __dict__ of frozen models, holding their structural hash once computed. Storing it there instead of in a
+# private attribute avoids initialising private attributes for every model.
+_FROZEN = "__pycfmodel_frozen__"
+
+
+class frozen_cached_property(cached_property):
+    """
+    `cached_property` that only stores its value on frozen models. Values derived from lists or nested models can't be
+    invalidated when those are modified in place, so they are computed on every access while the model is mutable.
+    """
+
+    def __get__(self, instance: Any, owner: Optional[type] = None) -> Any:
+        if instance is None or _FROZEN in instance.__dict__:
+            return super().__get__(instance, owner)
+        return self.func(instance)
+
+
+def unhashable_error(model: BaseModel) -> TypeError:
+    return TypeError(f"unhashable type: '{type(model).__name__}' is not frozen")
+
+
+def structural_hash(value: Any) -> int:
+    """
+    Hash of a value consistent with equality of models, dicts and lists, that are not hashable by themselves.
+    """
+    if isinstance(value, CustomModel) and value.is_frozen:
+        return hash(value)
+    if isinstance(value, BaseModel):
+        fields = value.__dict__
+        hashes = [type(value).__name__]
+        hashes.extend((name, structural_hash(fields.get(name))) for name in type(value).model_fields)
+        if value.__pydantic_extra__:
+            hashes.append(structural_hash(value.__pydantic_extra__))
+        return hash(tuple(hashes))
+    if isinstance(value, dict):
+        return hash(frozenset((key, structural_hash(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return hash(tuple(structural_hash(item) for item in value))
+    if isinstance(value, set):
+        return hash(frozenset(structural_hash(item) for item in value))
+    return hash(value)
+
+
+def _freeze(value: Any):
+    if isinstance(value, CustomModel):
+        value.freeze()
+    elif isinstance(value, BaseModel):
+        for item in value.__dict__.values():
+            _freeze(item)
+        if value.__pydantic_extra__:
+            for item in value.__pydantic_extra__.values():
+                _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            _freeze(item)
+
+
 class CustomModel(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", ignored_types=(frozen_cached_property,))
+
+    def freeze(self) -> Self:
+        """
+        Makes this model and all the models nested in it immutable and hashable, so they can be shared between threads
+        and used as dict keys. Lists and dicts in the fields are not copied, and they must not be modified either.
+        Copies of a frozen model are not frozen.
+
+        Returns:
+            The same model.
+        """
+        if _FROZEN in self.__dict__:
+            return self
+        for name in type(self).model_fields:
+            _freeze(self.__dict__.get(name))
+        self.__dict__[_FROZEN] = None
+        return self
+
+    @property
+    def is_frozen(self) -> bool:
+        return _FROZEN in self.__dict__
+
+    def __hash__(self) -> int:
+        fields = self.__dict__
+        if _FROZEN not in fields:
+            raise unhashable_error(self)
+        cached_hash: Optional[int] = fields[_FROZEN]
+        if cached_hash is None:
+            cached_hash = fields[_FROZEN] = structural_hash(
+                tuple((name, fields.get(name)) for name in type(self).model_fields)
+            )
+        return cached_hash
+
+    def __setattr__(self, name: str, value: Any):
+        # Private attributes are caches, such as the evaluators of a condition, so they can be set on frozen models
+        if _FROZEN in self.__dict__ and name not in self.__private_attributes__:
+            raise ValidationError.from_exception_data(
+                type(self).__name__, [{"type": "frozen_instance", "loc": (name,), "input": value}]
+            )
+        super().__setattr__(name, value)
+        # Values computed with cached_property depend on the fields, so they are computed again after an assignment.
+        cached_names = _cached_property_names(type(self))
+        if cached_names and not self.__dict__.keys().isdisjoint(cached_names):
+            for cached_name in cached_names:
+                self.__dict__.pop(cached_name, None)
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        state = super().__getstate__()
+        # Cached values are computed again after unpickling, so they don't need to be stored.
+        cached_names = _cached_property_names(type(self))
+        if cached_names:
+            state["__dict__"] = {key: value for key, value in state["__dict__"].items() if key not in cached_names}
+        # Hashes of strings change between processes
+        if state["__dict__"].get(_FROZEN) is not None:
+            state["__dict__"] = {**state["__dict__"], _FROZEN: None}
+        return state
+
+    def __delattr__(self, name: str):
+        if _FROZEN in self.__dict__:
+            raise ValidationError.from_exception_data(
+                type(self).__name__, [{"type": "frozen_instance", "loc": (name,), "input": None}]
+            )
+        super().__delattr__(name)
+
+    def __copy__(self) -> Self:
+        copied = super().__copy__()
+        copied.__dict__.pop(_FROZEN, None)
+        # model_copy sets updated fields without __setattr__, so cached values can't be trusted in copies
+        for cached_name in _cached_property_names(type(self)):
+            copied.__dict__.pop(cached_name, None)
+        return copied
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> Self:
+        copied = super().__deepcopy__(memo)
+        copied.__dict__.pop(_FROZEN, None)
+        # Copies are not frozen, values of frozen_cached_property must not be kept
+        for cached_name in _cached_property_names(type(self)):
+            copied.__dict__.pop(cached_name, None)
+        return copied
+
+
+class SparseModel:
+    """
+    Mixin of models that only store their fields that are not None, to reduce the memory used by models with many
+    optional fields. Fields that are not stored read as None. Sparse models compare and hash their content themselves,
+    as the default comparison goes through `__dict__`.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called when the attribute is not found, fields missing from __dict__ are None
+        if name in type(self).__pydantic_fields__:
+            return None
+        return super().__getattr__(name)
+
+    def __repr_args__(self):
+        # Same as the models that store every field, fields that are not stored are listed as None
+        fields = self.__dict__
+        for name, field in type(self).__pydantic_fields__.items():
+            if field.repr:
+                yield name, fields.get(name)
+        if self.__pydantic_extra__:
+            yield from self.__pydantic_extra__.items()
 
 
 class FunctionDict(BaseModel):
@@ -1,16 +1,32 @@
+from contextlib import ExitStack
 from datetime import date
 from typing import Any, ClassVar, Collection, Dict, List, Optional, Type, Union
 
-from pydantic import Field
+from pydantic import Field, ValidationError, field_validator, model_validator
 from typing_extensions import Annotated
 
 from pycfmodel.action_expander import expand_actions
 from pycfmodel.constants import AWS_NOVALUE
-from pycfmodel.model.base import CustomModel
+from pycfmodel.diagnostics import DiagnosticsCollector, collect_diagnostics
+from pycfmodel.instrumentation import (
+    DUMP,
+    EXPAND_ACTIONS,
+    RESOLVE,
+    RESOLVE_RESOURCE,
+    VALIDATE,
+    VALIDATE_RESOURCE,
+    ResolutionStats,
+    current_observer,
+    observe,
+    phase,
+)
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.parameter import Parameter
 from pycfmodel.model.resources.generic_resource import GenericResource
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.resources.types import ResourceModels
+from pycfmodel.model.security_group_index import SecurityGroupIndex
+from pycfmodel.model.statement_index import StatementIndex
 from pycfmodel.model.types import Resolvable
 from pycfmodel.resolver import _extended_bool, resolve
 
@@ -60,16 +76,84 @@ class CFModel(CustomModel):
         "AWS::URLSuffix": "amazonaws.com",
     }
 
-    def resolve(self, extra_params=None) -> "CFModel":
+    @model_validator(mode="wrap")
+    @classmethod
+    def _observe_validation(cls, values, handler):
+        with phase(VALIDATE):
+            return handler(values)
+
+    @field_validator("Resources", mode="wrap")
+    @classmethod
+    def _observe_resources_validation(cls, resources, handler):
+        if current_observer() is None or not isinstance(resources, dict):
+            return handler(resources)
+        # Resources are validated one by one so that each one is reported with its type
+        validated = {}
+        try:
+            for logical_id, resource in resources.items():
+                resource_type = resource.get("Type") if isinstance(resource, dict) else getattr(resource, "Type", None)
+                with phase(VALIDATE_RESOURCE, resource_type):
+                    validated.update(handler({logical_id: resource}))
+        except ValidationError:
+            # Validated again all together, so that the error reports every invalid resource as it does unobserved
+            return handler(resources)
+        return validated
+
+    def resolve(
+        self,
+        extra_params=None,
+        stats: Optional[ResolutionStats] = None,
+        diagnostics: Optional[DiagnosticsCollector] = None,
+    ) -> "CFModel":
         """
         Resolve all intrinsic functions on the template.
 
         Arguments:
             extra_params: Values of parameters passed to the Cloudformation.
+            stats: If given, it is filled with counts and durations per intrinsic function, unresolved references and
+                durations per resource.
+            diagnostics: If given, issues found while resolving are recorded in it instead of being logged.
 
         Returns:
             A new CFModel.
         """
+        with ExitStack() as stack:
+            if stats is not None:
+                stack.enter_context(observe(stats))
+            if diagnostics is not None:
+                stack.enter_context(collect_diagnostics(diagnostics))
+            with phase(RESOLVE):
+                return self._resolve(extra_params)
+
+    def to_json_bytes(self, exclude_none: bool = False) -> bytes:
+        """
+        Serializes the model to JSON, entirely by pydantic-core. It is much faster than `json.dumps(self.model_dump())`.
+        Boolean properties are dumped as JSON booleans even when the template gave them as strings (`"True"`), and binary
+        values in standard base64, as in templates. `from_json_bytes` also accepts the URL-safe base64 alphabet.
+
+        Arguments:
+            exclude_none: Whether to leave out fields that are not set.
+
+        Returns:
+            UTF-8 encoded JSON, that can be loaded back with `from_json_bytes`.
+        """
+        with phase(DUMP):
+            return self.__pydantic_serializer__.to_json(self, exclude_none=exclude_none)
+
+    @classmethod
+    def from_json_bytes(cls, data: Union[bytes, str]) -> "CFModel":
+        """
+        Loads a model serialized with `to_json_bytes`, or a template in JSON.
+
+        Arguments:
+            data: JSON document.
+
+        Returns:
+            A new CFModel.
+        """
+        return cls.model_validate_json(data)
+
+    def _resolve(self, extra_params) -> "CFModel":
         extra_params = {} if extra_params is None else extra_params
         # default parameters
         params = {}
@@ -80,7 +164,8 @@ class CFModel(CustomModel):
                 params[key] = ref_value
 
         extended_parameters = {**self.PSEUDO_PARAMETERS, **params, **extra_params}
-        dict_value = self.model_dump()
+        with phase(DUMP):
+            dict_value = self.model_dump()
 
         conditions = dict_value.pop("Conditions", {})
         resolved_conditions = {}
@@ -90,12 +175,12 @@ class CFModel(CustomModel):
             )
 
         resources = dict_value.pop("Resources")
-        resolved_resources = {
-            key: resolve(value, extended_parameters, self.Mappings, resolved_conditions)
-            for key, value in resources.items()
-            if value.get("Condition") is None
-            or (value.get("Condition") is not None and resolved_conditions.get(value["Condition"], True))
-        }
+        resolved_resources = {}
+        for key, value in resources.items():
+            if value.get("Condition") is not None and not resolved_conditions.get(value["Condition"], True):
+                continue
+            with phase(RESOLVE_RESOURCE, key):
+                resolved_resources[key] = resolve(value, extended_parameters, self.Mappings, resolved_conditions)
         return CFModel(**dict_value, Conditions=resolved_conditions, Resources=resolved_resources)
 
     def expand_actions(self) -> "CFModel":
@@ -114,12 +199,17 @@ class CFModel(CustomModel):
         python3 scripts/generate_cloudformation_actions_file.py
         ```
         """
-        dict_value = self.model_dump()
+        with phase(EXPAND_ACTIONS):
+            with phase(DUMP):
+                dict_value = self.model_dump()
 
-        resources = dict_value.pop("Resources")
-        expanded_resources = {key: expand_actions(value) for key, value in resources.items()}
+            resources = dict_value.pop("Resources")
+            expanded_resources = {}
+            for key, value in resources.items():
+                with phase(EXPAND_ACTIONS, value.get("Type")):
+                    expanded_resources[key] = expand_actions(value)
 
-        return CFModel(**dict_value, Resources=expanded_resources)
+            return CFModel(**dict_value, Resources=expanded_resources)
 
     def resources_filtered_by_type(
         self, allowed_types: Collection[Union[str, Type[Resource]]]
@@ -139,3 +229,33 @@ class CFModel(CustomModel):
             if isinstance(resource, allowed_resource_classes) or resource.Type in allowed_types:
                 result[resource_name] = resource
         return result
+
+    def statement_index(self) -> StatementIndex:
+        """
+        Index with all the statements of all the policy documents in the template, flattened into columns with lookups
+        by action prefix, principal and effect. It is built on every call while the model is mutable, and cached once it is
+        [frozen][pycfmodel.model.base.CustomModel.freeze].
+
+        Returns:
+            A [statement index][pycfmodel.model.statement_index.StatementIndex].
+        """
+        return self._statement_index
+
+    @frozen_cached_property
+    def _statement_index(self) -> StatementIndex:
+        return StatementIndex.from_model(self)
+
+    def security_group_index(self) -> SecurityGroupIndex:
+        """
+        Index with all the ingress and egress rules of the security groups in the template, with normalized protocols,
+        port ranges and CIDR ranges, and lookups by port. It is built on every call while the model is mutable, and cached
+        once it is [frozen][pycfmodel.model.base.CustomModel.freeze].
+
+        Returns:
+            A [security group index][pycfmodel.model.security_group_index.SecurityGroupIndex].
+        """
+        return self._security_group_index
+
+    @frozen_cached_property
+    def _security_group_index(self) -> SecurityGroupIndex:
+        return SecurityGroupIndex.from_model(self)
@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument as resource_policy_document
 from pycfmodel.model.resources.properties.tag import Tag
 from pycfmodel.model.resources.resource import Resource
@@ -69,7 +69,7 @@ class EC2VpcEndpointPolicy(Resource):
     Type: Literal["AWS::EC2::VPCEndpoint"]
     Properties: Resolvable[EC2VpcEndpointPolicyProperties]
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         if not self.Properties.PolicyDocument:
             return []
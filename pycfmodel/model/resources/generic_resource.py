@@ -3,6 +3,8 @@ from typing import ClassVar, Optional
 
 from pydantic import ConfigDict, field_validator
 
+from pycfmodel import diagnostics
+from pycfmodel.diagnostics import report_issue
 from pycfmodel.model.generic import Generic
 from pycfmodel.model.resources.resource import Resource
 
@@ -35,5 +37,13 @@ class GenericResource(Resource):
         if value in existing_resource_types and cls._strict:
             raise ValueError(f"Instantiation of GenericResource from {value} in {values} not allowed")
         else:
-            logger.warning(f"Instantiation of GenericResource from {value} in {values}")
+            report_issue(
+                logger,
+                logging.WARNING,
+                diagnostics.GENERIC_RESOURCE,
+                "Instantiation of GenericResource from %s in %s",
+                value,
+                values,
+                key=value,
+            )
         return value
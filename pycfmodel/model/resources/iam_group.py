@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy import Policy
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.types import Resolvable, ResolvableStr
@@ -37,7 +37,7 @@ class IAMGroup(Resource):
     Type: Literal["AWS::IAM::Group"]
     Properties: Resolvable[IAMGroupProperties] = IAMGroupProperties()
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         result = []
         policies = self.Properties.Policies if self.Properties and self.Properties.Policies else []
@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.types import Resolvable, ResolvableStr
@@ -43,7 +43,7 @@ class IAMManagedPolicy(Resource):
     Type: Literal["AWS::IAM::ManagedPolicy"]
     Properties: Resolvable[IAMManagedPolicyProperties]
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         return [
             OptionallyNamedPolicyDocument(
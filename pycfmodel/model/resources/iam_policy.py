@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.types import Resolvable, ResolvableStr, ResolvableStrOrList
@@ -39,7 +39,7 @@ class IAMPolicy(Resource):
     Type: Literal["AWS::IAM::Policy"]
     Properties: Resolvable[IAMPolicyProperties]
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         return [
             OptionallyNamedPolicyDocument(
@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy import Policy
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
 from pycfmodel.model.resources.properties.statement_condition import StatementCondition
@@ -47,7 +47,7 @@ class IAMRole(Resource):
     Type: Literal["AWS::IAM::Role"]
     Properties: Resolvable[IAMRoleProperties]
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         result = []
         policies = self.Properties.Policies if self.Properties and self.Properties.Policies else []
@@ -1,6 +1,6 @@
 from typing import List, Literal, Optional
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.parameter import Parameter
 from pycfmodel.model.resources.properties.policy import Policy
 from pycfmodel.model.resources.properties.tag import Tag
@@ -72,7 +72,7 @@ class IAMUser(Resource):
 
         return super().has_hardcoded_credentials()
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         result = []
         policies = self.Properties.Policies if self.Properties and self.Properties.Policies else []
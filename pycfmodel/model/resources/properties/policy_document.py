@@ -1,11 +1,14 @@
-from typing import List, Optional, Pattern, Union
+from typing import Dict, List, Optional, Pattern, Union
 
 from pydantic import ConfigDict
 
-from pycfmodel.cloudformation_actions import CLOUDFORMATION_ACTIONS
+from pycfmodel.action_expander import get_service_actions
+from pycfmodel.effective_permissions import EffectivePermissions
+from pycfmodel.model.base import frozen_cached_property
 from pycfmodel.model.resources.properties.property import Property
 from pycfmodel.model.resources.properties.statement import Statement
 from pycfmodel.model.types import Resolvable, ResolvableDate, ResolvableStr
+from pycfmodel.utils import canonical_json, content_digest, convert_to_list
 
 
 class PolicyDocument(Property):
@@ -26,6 +29,40 @@ class PolicyDocument(Property):
     Id: Optional[ResolvableStr] = None
     Version: Optional[ResolvableDate] = None
 
+    @frozen_cached_property
+    def fingerprint(self) -> str:
+        """
+        Digest of the normalized content of the policy document. The order of the statements and duplicated ones
+        don't matter, see [Statement.fingerprint][pycfmodel.model.resources.properties.statement.Statement.fingerprint].
+        It is only computed once on frozen policy documents.
+        """
+        statements = {
+            statement.fingerprint if isinstance(statement, Statement) else canonical_json(statement)
+            for statement in convert_to_list(self.Statement)
+        }
+        content = {
+            "Id": self.Id,
+            "Version": self.Version,
+            "Statement": sorted(statements),
+            "Extra": self.model_extra,
+        }
+        return content_digest(content)
+
+    def canonical(self) -> "PolicyDocument":
+        """
+        Copy of the policy document with a list of canonical statements, without duplicates and sorted by fingerprint.
+        See [Statement.canonical][pycfmodel.model.resources.properties.statement.Statement.canonical].
+        """
+        if not isinstance(self.Statement, (Statement, list)):
+            return self.model_copy()
+        statements = {}
+        for statement in convert_to_list(self.Statement):
+            if isinstance(statement, Statement):
+                statements.setdefault(statement.fingerprint, statement.canonical())
+            else:
+                statements.setdefault(canonical_json(statement), statement)
+        return self.model_copy(update={"Statement": [statements[key] for key in sorted(statements)]})
+
     def statement_as_list(self) -> List[Statement]:
         return self._statement_as_list()
 
@@ -50,6 +87,25 @@ class PolicyDocument(Property):
         """
         return [statement for statement in self._statement_as_list() if statement.resources_with(pattern)]
 
+    def match_many(self, patterns: Dict[str, Pattern], field: str = "actions") -> Dict[str, List[Statement]]:
+        """
+        Finds, for many patterns at once, the statements which have at least one value matching each pattern.
+        See [Statement.match_many][pycfmodel.model.resources.properties.statement.Statement.match_many].
+
+        Arguments:
+            patterns: Dictionary of names and patterns to match.
+            field: One of `actions`, `principals` or `resources`.
+
+        Returns:
+            Dictionary with every name and the list of matching statements.
+        """
+        result = {name: [] for name in patterns}
+        for statement in self._statement_as_list():
+            for name, matches in statement.match_many(patterns, field=field).items():
+                if matches:
+                    result[name].append(statement)
+        return result
+
     def allowed_actions_with(self, pattern: Pattern) -> List[Statement]:
         """
         Finds all statements which have at least one action with the pattern.
@@ -116,11 +172,7 @@ class PolicyDocument(Property):
                     actions.add(action)
 
         if difference:
-            return sorted(
-                set([action for action in CLOUDFORMATION_ACTIONS if action.lower().startswith("iam:")]).difference(
-                    actions
-                )
-            )
+            return sorted(set(get_service_actions("iam")).difference(actions))
 
         return sorted(actions)
 
@@ -136,3 +188,19 @@ class PolicyDocument(Property):
             if self._is_statement_effect_allow(statement.Effect):
                 actions.update(statement.get_expanded_action_list())
         return sorted(actions)
+
+    def get_effective_permissions(self) -> EffectivePermissions:
+        """
+        Computes the actions and resources allowed by the policy document once explicit denies are subtracted.
+        The result is only cached on frozen policy documents, and the expanded actions of every statement are memoized.
+
+        Returns:
+            An [EffectivePermissions][pycfmodel.effective_permissions.EffectivePermissions] object.
+        """
+        return self._effective_permissions
+
+    @frozen_cached_property
+    def _effective_permissions(self) -> EffectivePermissions:
+        return EffectivePermissions.from_statements(
+            statement for statement in convert_to_list(self._statement_as_list()) if isinstance(statement, Statement)
+        )
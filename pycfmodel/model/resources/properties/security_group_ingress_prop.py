@@ -1,7 +1,7 @@
 from ipaddress import IPv4Network, IPv6Network
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from pycfmodel.constants import IPV4_ZERO_VALUE, IPV6_ZERO_VALUE
+from pycfmodel.model.base import frozen_cached_property
 from pycfmodel.model.resources.properties.property import Property
 from pycfmodel.model.types import (
     ResolvableInt,
@@ -10,6 +10,15 @@ from pycfmodel.model.types import (
     ResolvableIPv6Network,
     ResolvableStr,
 )
+from pycfmodel.network import (
+    IPV4_ZERO_NETWORK,
+    IPV6_ZERO_NETWORK,
+    Network,
+    classify_network,
+    is_global_network,
+    is_public_network,
+)
+from pycfmodel.utils import normalize_port_range, normalize_protocol
 
 
 class SecurityGroupIngressProp(Property):
@@ -45,17 +54,43 @@ class SecurityGroupIngressProp(Property):
 
     def ipv4_slash_zero(self) -> bool:
         """Returns True if `CidrIp` matches `0.0.0.0/0`, otherwise False."""
-        # Remove after this is fixed https://bugs.python.org/issue38655
         if not self.CidrIp:
             return False
-        return self.CidrIp == IPv4Network(IPV4_ZERO_VALUE)
+        return self.CidrIp == IPV4_ZERO_NETWORK
 
     def ipv6_slash_zero(self) -> bool:
         """Returns True if `CidrIpv6` matches `::/0`, otherwise False."""
-        # Remove after this is fixed https://bugs.python.org/issue38655
         if not self.CidrIpv6:
             return False
-        return self.CidrIpv6 == IPv6Network(IPV6_ZERO_VALUE)
+        return self.CidrIpv6 == IPV6_ZERO_NETWORK
+
+    def networks(self) -> List[Network]:
+        """Returns `CidrIp` and `CidrIpv6`, the ones that are set and resolved."""
+        return [network for network in (self.CidrIp, self.CidrIpv6) if isinstance(network, (IPv4Network, IPv6Network))]
+
+    def network_classes(self) -> List[str]:
+        """
+        Returns:
+            [Class][pycfmodel.network.classify_network] of each network of the rule: `private`, `public` or `reserved`.
+        """
+        return [classify_network(network) for network in self.networks()]
+
+    def is_public(self) -> bool:
+        """Returns True if `CidrIp` or `CidrIpv6` contain public addresses, otherwise False."""
+        return any(is_public_network(network) for network in self.networks())
+
+    @frozen_cached_property
+    def protocol(self) -> Optional[str]:
+        """`IpProtocol` as a lowercase name, `-1` for all protocols. None if it is not resolved."""
+        return normalize_protocol(self.IpProtocol)
+
+    @frozen_cached_property
+    def port_range(self) -> Optional[Tuple[int, int]]:
+        """
+        First and last port allowed by the rule, all of them for protocols other than TCP and UDP. None for ICMP rules
+        and rules whose ports are not resolved.
+        """
+        return normalize_port_range(self.protocol, self.FromPort, self.ToPort)
 
 
 class DBSecurityGroupIngressProp(Property):
@@ -70,8 +105,10 @@ class DBSecurityGroupIngressProp(Property):
             return False
         elif not self.CIDRIP:
             return True
-        # Remove after this is fixed https://bugs.python.org/issue38655
-        return self.CIDRIP == IPv4Network(IPV4_ZERO_VALUE) or self.CIDRIP.is_global
+        if not isinstance(self.CIDRIP, IPv4Network):
+            # Not resolved
+            return False
+        return is_global_network(self.CIDRIP)
 
 
 class DBSecurityGroupIngressResourceProp(DBSecurityGroupIngressProp):
@@ -1,14 +1,14 @@
 import logging
-from typing import List, Optional, Pattern, Union
+from typing import Any, Dict, List, Optional, Pattern, Tuple, Union
 
 from pydantic import field_validator
 
 from pycfmodel.action_expander import _expand_action
-from pycfmodel.model.base import FunctionDict
+from pycfmodel.model.base import FunctionDict, frozen_cached_property, unhashable_error
 from pycfmodel.model.resources.properties.property import Property
 from pycfmodel.model.resources.properties.statement_condition import StatementCondition
 from pycfmodel.model.types import ResolvableStr, ResolvableStrOrList
-from pycfmodel.utils import is_resolvable_dict
+from pycfmodel.utils import canonical_list, canonical_values, compile_pattern_set, content_digest, is_resolvable_dict
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,36 @@ class Principal(Property):
 PrincipalTypes = Union[ResolvableStrOrList, Principal]
 
 
+def _canonical_principal(principal: Optional[PrincipalTypes]) -> Any:
+    if principal is None:
+        return None
+    if isinstance(principal, Principal):
+        return {
+            name: canonical_values(value)
+            for name, value in principal.__dict__.items()
+            if name in Principal.model_fields and value is not None
+        }
+    return canonical_values(principal)
+
+
+def _canonical_principal_copy(principal: Optional[PrincipalTypes]) -> Optional[PrincipalTypes]:
+    if isinstance(principal, Principal):
+        return principal.model_copy(
+            update={
+                name: canonical_list(value)
+                for name, value in principal.__dict__.items()
+                if name in Principal.model_fields and isinstance(value, list)
+            }
+        )
+    if isinstance(principal, list):
+        return canonical_list(principal)
+    return principal
+
+
+def _canonical_list_or_none(values: Any, lowercase: bool = False) -> Optional[List[Any]]:
+    return None if values is None else canonical_list(values, lowercase=lowercase)
+
+
 class Statement(Property):
     """
     Contains information about an statement of a policy document.
@@ -39,6 +69,11 @@ class Statement(Property):
     - NotResource: Specifies the object or objects that the statement does not cover.
     - Condition: Element to match the condition key and value in the policy against values in the request context.
 
+    `actions_with`, `principals_with`, `resources_with`, `non_whitelisted_principals` and `match_many` go through the
+    actions, principals and resources that are strings, which are only cached on frozen statements. On statements of
+    models returned by `parse` they are extracted on every call, freeze the model to cache them, see
+    [freeze][pycfmodel.model.base.CustomModel.freeze].
+
     More info at [AWS Docs](https://docs.aws.amazon.com/IAM/latest/UserGuide/reference_policies_elements.html)
     """
 
@@ -82,6 +117,10 @@ class Statement(Property):
         return action_list
 
     def get_expanded_action_list(self) -> List[str]:
+        return list(self._expanded_actions)
+
+    @frozen_cached_property
+    def _expanded_actions(self) -> Tuple[str, ...]:
         action_list = set()
         for action in self.get_action_list(include_action=True, include_not_action=False):
             action_list.update(_expand_action(action))
@@ -89,9 +128,9 @@ class Statement(Property):
         for not_action in self.get_action_list(include_not_action=True, include_action=False):
             action_list.update(_expand_action(not_action, not_action=True))
 
-        return sorted(action_list)
+        return tuple(sorted(action_list))
 
-    def get_resource_list(self) -> List[ResolvableStr]:
+    def get_resource_list(self, include_resource=True, include_not_resource=True) -> List[ResolvableStr]:
         """
         Gets all resources specified in `Resource` and `NotResource`.
 
@@ -99,14 +138,19 @@ class Statement(Property):
             List of resources.
         """
         resource_list = []
-        for resources in [self.Resource, self.NotResource]:
+        included_resources = []
+        if include_resource:
+            included_resources.append(self.Resource)
+        if include_not_resource:
+            included_resources.append(self.NotResource)
+        for resources in included_resources:
             if isinstance(resources, List):
                 resource_list.extend(resources)
             elif isinstance(resources, (str, dict)):
                 resource_list.append(resources)
         return resource_list
 
-    def get_principal_list(self) -> List[ResolvableStr]:
+    def get_principal_list(self, include_principal=True, include_not_principal=True) -> List[ResolvableStr]:
         """
         Gets all actions specified in `Principal` and `NotPrincipal`.
 
@@ -114,7 +158,12 @@ class Statement(Property):
             List of principals.
         """
         principal_list = []
-        for principals in [self.Principal, self.NotPrincipal]:
+        included_principals = []
+        if include_principal:
+            included_principals.append(self.Principal)
+        if include_not_principal:
+            included_principals.append(self.NotPrincipal)
+        for principals in included_principals:
             if isinstance(principals, list):
                 principal_list.extend(principals)
             elif isinstance(principals, str):
@@ -131,6 +180,90 @@ class Statement(Property):
                 raise ValueError(f"Not supported type: {type(principals)}")
         return principal_list
 
+    @frozen_cached_property
+    def fingerprint(self) -> str:
+        """
+        Digest of the normalized content of the statement. Single values and lists are equivalent and their order
+        doesn't matter, actions are case-insensitive and so is the effect. Statements with the same fingerprint are
+        equal. It is only computed once on frozen statements.
+        """
+        effect = self.Effect.capitalize() if isinstance(self.Effect, str) else self.Effect
+        content = {
+            "Sid": self.Sid,
+            "Effect": effect,
+            "Principal": _canonical_principal(self.Principal),
+            "NotPrincipal": _canonical_principal(self.NotPrincipal),
+            "Action": None if self.Action is None else canonical_values(self.Action, lowercase=True),
+            "NotAction": None if self.NotAction is None else canonical_values(self.NotAction, lowercase=True),
+            "Resource": None if self.Resource is None else canonical_values(self.Resource),
+            "NotResource": None if self.NotResource is None else canonical_values(self.NotResource),
+            "Condition": None if self.Condition is None else self.Condition.fingerprint,
+        }
+        return content_digest(content)
+
+    def canonical(self) -> "Statement":
+        """
+        Copy of the statement where actions and resources are sorted and deduplicated lists, principals and condition
+        values are sorted, and the effect is capitalized. It has the same fingerprint as the original statement.
+        """
+        return self.model_copy(
+            update={
+                "Effect": self.Effect.capitalize() if isinstance(self.Effect, str) else self.Effect,
+                "Principal": _canonical_principal_copy(self.Principal),
+                "NotPrincipal": _canonical_principal_copy(self.NotPrincipal),
+                "Action": _canonical_list_or_none(self.Action, lowercase=True),
+                "NotAction": _canonical_list_or_none(self.NotAction, lowercase=True),
+                "Resource": _canonical_list_or_none(self.Resource),
+                "NotResource": _canonical_list_or_none(self.NotResource),
+                "Condition": None if self.Condition is None else self.Condition.canonical(),
+            }
+        )
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Statement):
+            return self.fingerprint == other.fingerprint
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if not self.is_frozen:
+            raise unhashable_error(self)
+        return hash(self.fingerprint)
+
+    @frozen_cached_property
+    def _action_strings(self) -> Tuple[str, ...]:
+        return tuple(action for action in self.get_action_list() if isinstance(action, str))
+
+    @frozen_cached_property
+    def _principal_strings(self) -> Tuple[str, ...]:
+        return tuple(principal for principal in self.get_principal_list() if isinstance(principal, str))
+
+    @frozen_cached_property
+    def _resource_strings(self) -> Tuple[str, ...]:
+        return tuple(resource for resource in self.get_resource_list() if isinstance(resource, str))
+
+    def match_many(self, patterns: Dict[str, Pattern], field: str = "actions") -> Dict[str, List[str]]:
+        """
+        Matches many patterns against the actions, principals or resources of the statement in a single pass.
+        Values of the field are extracted once and cached on frozen statements, and equal groups of patterns are only
+        compiled once.
+
+        Arguments:
+            patterns: Dictionary of names and patterns to match.
+            field: One of `actions`, `principals` or `resources`.
+
+        Returns:
+            Dictionary with every name and the values matching its pattern.
+        """
+        if field == "actions":
+            values = self._action_strings
+        elif field == "principals":
+            values = self._principal_strings
+        elif field == "resources":
+            values = self._resource_strings
+        else:
+            raise ValueError(f"Not supported field: {field}")
+        return compile_pattern_set(tuple(patterns.items())).match(values)
+
     def actions_with(self, pattern: Pattern) -> List[str]:
         """
         Finds all actions which match the pattern.
@@ -141,7 +274,7 @@ class Statement(Property):
         Returns:
             List of actions.
         """
-        return [action for action in self.get_action_list() if isinstance(action, str) and pattern.match(action)]
+        return [action for action in self._action_strings if pattern.match(action)]
 
     def principals_with(self, pattern: Pattern) -> List[str]:
         """
@@ -153,11 +286,7 @@ class Statement(Property):
         Returns:
             List of principals.
         """
-        return [
-            principal
-            for principal in self.get_principal_list()
-            if isinstance(principal, str) and pattern.match(principal)
-        ]
+        return [principal for principal in self._principal_strings if pattern.match(principal)]
 
     def resources_with(self, pattern: Pattern) -> List[str]:
         """
@@ -169,9 +298,7 @@ class Statement(Property):
         Returns:
             List of resources.
         """
-        return [
-            resource for resource in self.get_resource_list() if isinstance(resource, str) and pattern.match(resource)
-        ]
+        return [resource for resource in self._resource_strings if pattern.match(resource)]
 
     def non_whitelisted_principals(self, whitelist: List[str]) -> List[str]:
         """
@@ -183,8 +310,4 @@ class Statement(Property):
         Returns:
             List of principals.
         """
-        return [
-            principal
-            for principal in self.get_principal_list()
-            if isinstance(principal, str) and principal not in whitelist
-        ]
+        return [principal for principal in self._principal_strings if principal not in whitelist]
@@ -1,10 +1,18 @@
 import logging
-from typing import Any, Callable, Dict, Optional, Tuple, Union
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from threading import Lock
+from time import perf_counter
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
 from unicodedata import normalize
 
-from pydantic import model_validator
+from pydantic import SerializationInfo, SerializerFunctionWrapHandler, model_serializer, model_validator
+from typing_extensions import Self
 
-from pycfmodel.model.base import CustomModel, FunctionDict
+from pycfmodel import diagnostics
+from pycfmodel.diagnostics import report_issue
+from pycfmodel.model.base import CustomModel, FunctionDict, SparseModel, frozen_cached_property, unhashable_error
 from pycfmodel.model.types import (
     ResolvableArnOrList,
     ResolvableBool,
@@ -15,7 +23,15 @@ from pycfmodel.model.types import (
     ResolvableIPOrList,
     ResolvableStrOrList,
 )
-from pycfmodel.utils import convert_to_list, is_resolvable_dict, not_ip, regex_from_cf_string
+from pycfmodel.utils import (
+    canonical_list,
+    canonical_values,
+    content_digest,
+    convert_to_list,
+    is_resolvable_dict,
+    not_ip,
+    regex_from_cf_string,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +40,163 @@ class StatementConditionBuildEvaluatorError(Exception):
     pass
 
 
+@dataclass
+class OperatorTrace:
+    """
+    Outcome of evaluating a single operator and key of a condition.
+
+    Properties:
+
+    - operator: Name of the operator, without colons (e.g. `ForAnyValueStringLike`).
+    - key: Condition key the operator was applied to.
+    - result: Result of the evaluation, or None if it raised an exception.
+    - duration: Time spent building and evaluating the operator, in seconds.
+    - error: Representation of the exception raised, if any.
+    """
+
+    operator: str
+    key: str
+    result: Optional[bool]
+    duration: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ConditionTrace:
+    """
+    Detailed outcome of evaluating a [StatementCondition][pycfmodel.model.resources.properties.statement_condition.StatementCondition].
+
+    Properties:
+
+    - result: Same value that calling the condition would return.
+    - duration: Total time spent, in seconds.
+    - operators: A list of [operator traces][pycfmodel.model.resources.properties.statement_condition.OperatorTrace].
+    """
+
+    result: Optional[bool]
+    duration: float
+    operators: List[OperatorTrace] = field(default_factory=list)
+
+    @property
+    def failing_operators(self) -> List[OperatorTrace]:
+        """Operators that didn't evaluate to True, either because they were False or because they raised."""
+        return [operator for operator in self.operators if operator.result is not True]
+
+
+SET_OPERATORS = ("ForAllValues", "ForAnyValue")
+IF_EXISTS = "IfExists"
+
+
+@lru_cache(maxsize=None)
+def split_operator(operator: str) -> Tuple[Optional[str], str, bool]:
+    """
+    Splits the name of an operator, without colons, in its parts.
+
+    Returns:
+        Tuple with the set operator (`ForAllValues`, `ForAnyValue` or None), the base operator and whether it is an
+        `IfExists` operator. E.g. `("ForAnyValue", "StringLike", True)` for `ForAnyValueStringLikeIfExists`.
+    """
+    set_operator = next((prefix for prefix in SET_OPERATORS if operator.startswith(prefix)), None)
+    base_operator = operator[len(set_operator) :] if set_operator else operator
+    if_exists = base_operator.endswith(IF_EXISTS)
+    if if_exists:
+        base_operator = base_operator[: -len(IF_EXISTS)]
+    return set_operator, base_operator, if_exists
+
+
+class ConditionClause(NamedTuple):
+    """
+    A single condition key of an operator of a condition.
+
+    Properties:
+
+    - set_operator: `ForAllValues`, `ForAnyValue` or None.
+    - operator: Base operator, such as `StringLike`.
+    - if_exists: True for `IfExists` operators.
+    - key: Condition key.
+    - values: Value or list of values of the condition key.
+    """
+
+    set_operator: Optional[str]
+    operator: str
+    if_exists: bool
+    key: str
+    values: Any
+
+    @property
+    def name(self) -> str:
+        """Full name of the operator, without colons (e.g. `ForAnyValueStringLikeIfExists`)."""
+        return f"{self.set_operator or ''}{self.operator}{IF_EXISTS if self.if_exists else ''}"
+
+
+class StatementConditionStats:
+    """
+    Aggregated counters of condition evaluations. Disabled by default, when enabled it keeps track of:
+
+    - evaluations: Number of times a condition has been evaluated.
+    - cache_hits: Evaluations that reused an already built evaluator.
+    - cache_misses: Evaluations that had to build the evaluator.
+    - operator_evaluations: Number of evaluations per operator.
+    - operator_time: Cumulative time spent per operator, in seconds.
+    - exceptions: Number of exceptions raised per operator.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.evaluations = 0
+            self.cache_hits = 0
+            self.cache_misses = 0
+            self.operator_evaluations = Counter()
+            self.operator_time = Counter()
+            self.exceptions = Counter()
+
+    def record_evaluation(self, cache_hit: bool):
+        with self._lock:
+            self.evaluations += 1
+            if cache_hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def record_operator(self, operator: str, duration: float):
+        with self._lock:
+            self.operator_evaluations[operator] += 1
+            self.operator_time[operator] += duration
+
+    def record_exception(self, operator: str):
+        with self._lock:
+            self.exceptions[operator] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            A copy of all the counters.
+        """
+        with self._lock:
+            return {
+                "evaluations": self.evaluations,
+                "cache_hits": self.cache_hits,
+                "cache_misses": self.cache_misses,
+                "operator_evaluations": dict(self.operator_evaluations),
+                "operator_time": dict(self.operator_time),
+                "exceptions": dict(self.exceptions),
+            }
+
+
+condition_stats = StatementConditionStats()
+
+
 def build_evaluator(function: str, arg_a: Any, arg_b: Any) -> Callable:
     if is_resolvable_dict(arg_b) or isinstance(arg_b, FunctionDict):
         raise StatementConditionBuildEvaluatorError
@@ -70,7 +243,14 @@ def build_evaluator(function: str, arg_a: Any, arg_b: Any) -> Callable:
         arg_b = regex_from_cf_string(arg_b)
         return lambda kwargs: not bool(arg_b.match(kwargs[arg_a]))
     else:
-        logger.error(f"{function} is not supported.")
+        report_issue(
+            logger,
+            logging.ERROR,
+            diagnostics.UNSUPPORTED_CONDITION_OPERATOR,
+            "%s is not supported.",
+            function,
+            key=function,
+        )
         raise NotImplementedError
 
 
@@ -112,7 +292,38 @@ def build_root_evaluator(function: str, arguments: Union[Dict, Tuple]) -> Callab
     return lambda kwargs: all(group(kwargs) for group in group_of_nodes)
 
 
-class StatementCondition(CustomModel):
+def build_clause_evaluator(clause: ConditionClause) -> Callable:
+    """
+    Builds the evaluator of a single clause of a condition, from its already split operator. It evaluates the same as
+    `build_root_evaluator(clause.name, (clause.key, clause.values))`.
+    """
+    key = clause.key
+    if clause.set_operator is None and not isinstance(clause.values, list):
+        evaluator = build_evaluator(clause.operator, key, clause.values)
+    else:
+        nodes = [build_evaluator(clause.operator, key, item) for item in convert_to_list(clause.values)]
+        # Evaluators only read their own condition key
+        matches = lambda item: any(node({key: item}) for node in nodes)  # noqa: E731
+        if clause.set_operator == "ForAllValues":
+            evaluator = lambda kwargs: all(matches(item) for item in convert_to_list(kwargs[key]))  # noqa: E731
+        else:
+            evaluator = lambda kwargs: any(matches(item) for item in convert_to_list(kwargs[key]))  # noqa: E731
+    if clause.if_exists:
+        evaluate = evaluator
+        return lambda kwargs: evaluate(kwargs) if kwargs.get(key) is not None else True
+    return evaluator
+
+
+def _dumps_field(name: str, include: Any, exclude: Any) -> bool:
+    if include is not None and name not in include:
+        return False
+    if exclude is None or name not in exclude:
+        return True
+    # Nested exclusions only leave out part of the value
+    return isinstance(exclude, dict) and exclude[name] is not True and exclude[name] is not ...
+
+
+class StatementCondition(SparseModel, CustomModel):
     """
     Contains the condition to be matched to apply the statement that belongs to.
 
@@ -320,36 +531,246 @@ class StatementCondition(CustomModel):
     ForAnyValueStringLikeIfExists: Optional[Dict[str, ResolvableStrOrList]] = None
     ForAnyValueStringNotLikeIfExists: Optional[Dict[str, ResolvableStrOrList]] = None
 
+    _clauses: Optional[Tuple[ConditionClause, ...]] = None
     _eval: Optional[Callable] = None
+    _evaluators: Optional[List[Tuple[str, str, Callable]]] = None
 
     @model_validator(mode="before")
     @classmethod
     def remove_colon(cls, values):
-        if isinstance(values, dict):
+        if isinstance(values, dict) and any(":" in key for key in values):
             return {key.replace(":", ""): value for key, value in values.items()}
         return values
 
+    @model_validator(mode="after")
+    def drop_unused_operators(self) -> Self:
+        # Unused operators are not stored, dumps still list them as None
+        object.__setattr__(
+            self, "__dict__", {name: value for name, value in self.__dict__.items() if value is not None}
+        )
+        self._clauses = self._build_clauses(self.__dict__)
+        return self
+
+    @model_serializer(mode="wrap")
+    def dump_unused_operators(self, handler: SerializerFunctionWrapHandler, info: SerializationInfo):
+        # No return annotation, so that the serialization schema still lists the operators
+        data = handler(self)
+        if info.exclude_none or info.exclude_defaults:
+            return data
+        model_fields = type(self).__pydantic_fields__
+        include, exclude = info.include, info.exclude
+        if include is None and exclude is None and not info.exclude_unset:
+            dumped = dict.fromkeys(model_fields)
+            dumped.update(data)
+            return dumped
+        fields = self.__dict__
+        fields_set = self.__pydantic_fields_set__
+        return {
+            name: data.get(name)
+            for name in model_fields
+            if name in data
+            or (
+                name not in fields
+                and (not info.exclude_unset or name in fields_set)
+                and _dumps_field(name, include, exclude)
+            )
+        }
+
+    @property
+    def clauses(self) -> Tuple[ConditionClause, ...]:
+        """
+        Condition keys of every operator used in the condition, in the order they were declared. Evaluation goes
+        through them instead of all the operators a condition can have. They are built when the condition is validated,
+        and again after an operator is assigned. Changes made in place to the values of an operator are not followed.
+        """
+        clauses = self._clauses
+        if clauses is None:
+            # Conditions built without validation, such as the ones loaded from snapshots
+            clauses = self._clauses = self._build_clauses(self.__dict__)
+        return clauses
+
+    @classmethod
+    def _build_clauses(cls, fields: Dict[str, Any]) -> Tuple[ConditionClause, ...]:
+        model_fields = cls.__pydantic_fields__
+        return tuple(
+            ConditionClause(*split_operator(operator), key, values)
+            for operator, arguments in fields.items()
+            if arguments is not None and operator in model_fields
+            for key, values in arguments.items()
+        )
+
     def eval(self, values):
-        if self._eval is None:
-            self._eval = self.build_eval(self.model_dump())
-        return self._eval(values)
+        """
+        Evaluates the condition against the values of the condition keys. Evaluators are built from the clauses on the
+        first evaluation and kept until an operator is assigned, on frozen and mutable conditions alike.
+        """
+        if not condition_stats.enabled:
+            if self._eval is None:
+                self._evaluators = self._build_clause_evaluators()
+                self._eval = self._combine_evaluators(self._evaluators)
+            return self._eval(values)
+
+        condition_stats.record_evaluation(cache_hit=self._evaluators is not None)
+        if self._evaluators is None:
+            self._evaluators = self._build_evaluators_with_stats()
+            self._eval = self._combine_evaluators(self._evaluators)
+        for operator, _, evaluator in self._evaluators:
+            start = perf_counter()
+            try:
+                result = evaluator(values)
+            except Exception:
+                condition_stats.record_exception(operator)
+                raise
+            finally:
+                condition_stats.record_operator(operator, perf_counter() - start)
+            if not result:
+                return False
+        return True
+
+    def _build_clause_evaluators(self) -> List[Tuple[str, str, Callable]]:
+        return [(clause.name, clause.key, build_clause_evaluator(clause)) for clause in self.clauses]
+
+    def _build_evaluators_with_stats(self) -> List[Tuple[str, str, Callable]]:
+        evaluators = []
+        for clause in self.clauses:
+            try:
+                evaluators.append((clause.name, clause.key, build_clause_evaluator(clause)))
+            except Exception:
+                condition_stats.record_exception(clause.name)
+                raise
+        return evaluators
+
+    def explain(self, values) -> ConditionTrace:
+        """
+        Evaluates every operator and key of the condition independently, recording its result and timing.
+        Unlike calling the condition, evaluation doesn't stop at the first failing operator, so all of them are reported.
+
+        Arguments:
+            values: Values of the condition keys in the request context.
+
+        Returns:
+            A [condition trace][pycfmodel.model.resources.properties.statement_condition.ConditionTrace].
+        """
+        operators = []
+        result = True
+        start = perf_counter()
+        for clause in self.clauses:
+            operator = clause.name
+            operator_start = perf_counter()
+            try:
+                operator_result = build_clause_evaluator(clause)(values)
+                error = None
+            except Exception as e:
+                operator_result = None
+                error = repr(e)
+            operators.append(
+                OperatorTrace(
+                    operator=operator,
+                    key=clause.key,
+                    result=operator_result,
+                    duration=perf_counter() - operator_start,
+                    error=error,
+                )
+            )
+            if result is True and not operator_result:
+                result = None if error is not None else False
+        return ConditionTrace(result=result, duration=perf_counter() - start, operators=operators)
 
     @classmethod
-    def build_eval(cls, values: Dict) -> Dict:
-        conditions_lambdas = [
-            build_root_evaluator(function=key, arguments=value) for key, value in values.items() if value is not None
+    def build_evaluators(cls, values: Dict) -> List[Tuple[str, str, Callable]]:
+        """
+        Builds one evaluator per operator and condition key.
+
+        Returns:
+            List of tuples with operator, condition key and evaluator.
+        """
+        return [
+            (operator, key, build_root_evaluator(function=operator, arguments=(key, argument)))
+            for operator, arguments in values.items()
+            if arguments is not None
+            for key, argument in arguments.items()
         ]
+
+    @staticmethod
+    def _combine_evaluators(evaluators: List[Tuple[str, str, Callable]]) -> Callable:
+        conditions_lambdas = [evaluator for _, _, evaluator in evaluators]
         return lambda kwargs: all(condition(kwargs) for condition in conditions_lambdas)
 
+    @classmethod
+    def build_eval(cls, values: Dict) -> Callable:
+        return cls._combine_evaluators(cls.build_evaluators(values))
+
+    def _reset_clauses(self):
+        self._clauses = self._eval = self._evaluators = None
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).__pydantic_fields__:
+            self._reset_clauses()
+
+    def model_copy(self, *, update: Optional[Dict[str, Any]] = None, deep: bool = False) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        # Updated operators are set without __setattr__
+        if update:
+            copied._reset_clauses()
+        return copied
+
+    def __getstate__(self) -> Dict[Any, Any]:
+        state = super().__getstate__()
+        # Evaluators are closures that can't be pickled, they are built again on the first evaluation.
+        state["__pydantic_private__"] = {**state["__pydantic_private__"], "_eval": None, "_evaluators": None}
+        return state
+
     def __call__(self, kwargs) -> Optional[bool]:
         try:
             return self.eval(kwargs)
-        except Exception:
-            logger.exception("Error raised while evaluating condition")
+        except Exception as error:
+            report_issue(
+                logger,
+                logging.ERROR,
+                diagnostics.CONDITION_EVALUATION_ERROR,
+                "Error raised while evaluating condition",
+                key=type(error).__name__,
+                exc_info=error,
+            )
             return None
 
+    @frozen_cached_property
+    def fingerprint(self) -> str:
+        """
+        Digest of the normalized content of the condition, where the order of the values of each condition key
+        doesn't matter. Conditions with the same fingerprint are equal. It is only computed once on frozen conditions.
+        """
+        fields = self.__dict__
+        content = {
+            operator: {key: canonical_values(value) for key, value in fields[operator].items()}
+            # Operators not set are None, iterating only the set ones avoids going through all of them
+            for operator in self.__pydantic_fields_set__
+            if fields.get(operator) is not None
+        }
+        return content_digest(content)
+
+    def canonical(self) -> "StatementCondition":
+        """Copy of the condition with the lists of values sorted and deduplicated."""
+        fields = self.__dict__
+        return self.model_copy(
+            update={
+                operator: {
+                    key: canonical_list(value) if isinstance(value, list) else value
+                    for key, value in fields[operator].items()
+                }
+                for operator in self.__pydantic_fields_set__
+                if fields.get(operator) is not None
+            }
+        )
+
     def __eq__(self, other: Any) -> bool:
-        if isinstance(other, self.__class__):
-            return self.model_dump(exclude={"eval"}) == other.model_dump(exclude={"eval"})
+        if isinstance(other, StatementCondition):
+            return self.fingerprint == other.fingerprint
         else:
             return self.model_dump() == other
+
+    def __hash__(self) -> int:
+        if not self.is_frozen:
+            raise unhashable_error(self)
+        return hash(self.fingerprint)
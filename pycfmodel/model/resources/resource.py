@@ -1,6 +1,10 @@
-from typing import Any, ClassVar, Dict, List, Optional
+from functools import lru_cache
+from types import UnionType
+from typing import Annotated, Any, ClassVar, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
 
-from pycfmodel.model.base import CustomModel
+from pydantic import BaseModel
+
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.generic import Generic
 from pycfmodel.model.parameter import Parameter
 from pycfmodel.model.resources.properties.policy import Policy
@@ -9,6 +13,39 @@ from pycfmodel.model.resources.properties.statement_condition import StatementCo
 from pycfmodel.model.types import ResolvableCondition, ResolvableStr, ResolvableStrOrList
 from pycfmodel.model.utils import OptionallyNamedPolicyDocument
 
+_POLICY_DOCUMENT_CONTAINERS = (PolicyDocument, Policy, OptionallyNamedPolicyDocument, Generic)
+
+
+def _may_contain_policy_documents(annotation: Any) -> bool:
+    """
+    Returns True if a value with the given type annotation can hold a policy document that
+    `Resource.obtain_policy_documents` would find.
+    """
+    if annotation is Any:
+        return True
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        return _may_contain_policy_documents(get_args(annotation)[0])
+    if origin in (Union, UnionType, list):
+        return any(_may_contain_policy_documents(arg) for arg in get_args(annotation))
+    return isinstance(annotation, type) and issubclass(annotation, _POLICY_DOCUMENT_CONTAINERS)
+
+
+@lru_cache(maxsize=None)
+def _policy_document_fields(properties_class: Type[BaseModel]) -> Tuple[Tuple[str, ...], bool]:
+    """
+    Computes, for a properties class, which fields can contain policy documents and whether extra fields need to be
+    inspected too.
+    """
+    if issubclass(properties_class, Generic):
+        return (), True
+    fields = tuple(
+        name
+        for name, field_info in properties_class.model_fields.items()
+        if _may_contain_policy_documents(field_info.annotation)
+    )
+    return fields, properties_class.model_config.get("extra") == "allow"
+
 
 class Resource(CustomModel):
     TYPE_VALUE: ClassVar[str]
@@ -37,20 +74,26 @@ class Resource(CustomModel):
 
         return False
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         """
         Returns a list with all the optionally named policy documents in this resource within its properties.
         Every resource has a Properties field, if not, it's a malformed CloudFormation template.
+
+        Only the fields whose type can hold a policy document are inspected. The result is only cached on frozen
+        models: models returned by `parse` are mutable and walk their properties on every access, call `freeze()` on
+        the model to cache it, see [freeze][pycfmodel.model.base.CustomModel.freeze].
         """
         policy_documents = []
 
-        if self.Properties is None:
+        if self.Properties is None or not isinstance(self.Properties, BaseModel):
             return policy_documents
 
-        properties_list = []
-        for field in self.Properties.model_fields_set:
-            properties_list.append(getattr(self.Properties, field))
+        fields, include_extra = _policy_document_fields(type(self.Properties))
+        fields_set = self.Properties.model_fields_set
+        properties_list = [getattr(self.Properties, field) for field in fields if field in fields_set]
+        if include_extra and self.Properties.model_extra:
+            properties_list.extend(self.Properties.model_extra.values())
 
         self.obtain_policy_documents(policy_documents=policy_documents, properties=properties_list)
         return policy_documents
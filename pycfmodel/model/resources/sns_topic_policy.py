@@ -1,6 +1,6 @@
 from typing import List, Literal
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.types import Resolvable, ResolvableStr
@@ -33,6 +33,6 @@ class SNSTopicPolicy(Resource):
     Type: Literal["AWS::SNS::TopicPolicy"]
     Properties: Resolvable[SNSTopicPolicyProperties]
 
-    @property
+    @frozen_cached_property
     def policy_documents(self) -> List[OptionallyNamedPolicyDocument]:
         return [OptionallyNamedPolicyDocument(name=None, policy_document=self.Properties.PolicyDocument)]
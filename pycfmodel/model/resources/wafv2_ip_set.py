@@ -1,9 +1,13 @@
-from typing import List, Literal, Optional
+from collections import defaultdict
+from ipaddress import IPv4Network, IPv6Network
+from typing import Dict, Iterable, List, Literal, Optional, Union
 
-from pycfmodel.model.base import CustomModel
+from pycfmodel.model.base import CustomModel, frozen_cached_property
 from pycfmodel.model.resources.properties.tag import Tag
 from pycfmodel.model.resources.resource import Resource
 from pycfmodel.model.types import Resolvable, ResolvableIPOrList, ResolvableStr
+from pycfmodel.network import PUBLIC, Address, AddressRanges, Network, classify_network
+from pycfmodel.utils import convert_to_list
 
 
 class WAFv2IPSetProperties(CustomModel):
@@ -29,6 +33,58 @@ class WAFv2IPSetProperties(CustomModel):
     Scope: ResolvableStr
     Tags: Optional[List[Tag]] = None
 
+    def networks(self) -> List[Network]:
+        """Returns the addresses of the IP set that are resolved."""
+        return [
+            address for address in convert_to_list(self.Addresses) if isinstance(address, (IPv4Network, IPv6Network))
+        ]
+
+    def networks_by_class(self) -> Dict[str, List[Network]]:
+        """
+        Returns:
+            Addresses of the IP set grouped by their [class][pycfmodel.network.classify_network]: `private`, `public`
+            or `reserved`.
+        """
+        result = defaultdict(list)
+        for network in self.networks():
+            result[classify_network(network)].append(network)
+        return dict(result)
+
+    def is_public(self) -> bool:
+        """Returns True if any of the addresses contains public addresses, otherwise False."""
+        return any(classify_network(network) == PUBLIC for network in self.networks())
+
+    @frozen_cached_property
+    def address_ranges(self) -> AddressRanges:
+        """
+        Resolved addresses of the IP set, collapsed into sorted ranges of integers. Only computed once on frozen IP
+        sets, build them once and reuse them to compare a mutable IP set many times.
+        """
+        return AddressRanges.from_networks(self.networks())
+
+    def contains(self, address: Union[Network, Address, str]) -> bool:
+        """Returns True if all the addresses of the address or network are in the IP set, otherwise False."""
+        return self.address_ranges.contains(address)
+
+    def overlaps(
+        self, other: Union["WAFv2IPSetProperties", AddressRanges, Iterable[Union[Network, Address, str]]]
+    ) -> bool:
+        """
+        Arguments:
+            other: Another IP set, the [address ranges][pycfmodel.network.AddressRanges] of a list, such as a threat
+                intelligence feed, or its networks. Build the ranges of lists that are compared with many IP sets once.
+
+        Returns:
+            True if any address is in both, otherwise False.
+        """
+        if isinstance(other, WAFv2IPSetProperties):
+            other = other.address_ranges
+        return self.address_ranges.overlaps(other)
+
+    def num_addresses(self) -> int:
+        """Returns the number of distinct resolved addresses in the IP set."""
+        return self.address_ranges.num_addresses
+
 
 class WAFv2IPSet(Resource):
     """
@@ -0,0 +1,354 @@
+from bisect import bisect_left, bisect_right
+from ipaddress import IPv4Network, IPv6Network
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from pycfmodel.constants import ALL_PORTS, ALL_PROTOCOLS
+from pycfmodel.model.resources.properties.security_group_egress_prop import SecurityGroupEgressProp
+from pycfmodel.model.resources.properties.security_group_ingress_prop import (
+    DBSecurityGroupIngressProp,
+    SecurityGroupIngressProp,
+)
+from pycfmodel.model.resources.security_group import (
+    RDSDBSecurityGroup,
+    RDSDBSecurityGroupProperties,
+    SecurityGroup,
+    SecurityGroupProperties,
+)
+from pycfmodel.model.resources.security_group_egress import SecurityGroupEgress
+from pycfmodel.model.resources.security_group_ingress import RDSDBSecurityGroupIngress, SecurityGroupIngress
+from pycfmodel.network import PRIVATE, Network, address_range, classify_range
+from pycfmodel.utils import convert_to_list, normalize_protocol, port_ranges
+
+if TYPE_CHECKING:
+    from pycfmodel.model.cf_model import CFModel
+
+INGRESS = "ingress"
+EGRESS = "egress"
+
+RuleProp = Union[SecurityGroupIngressProp, SecurityGroupEgressProp, DBSecurityGroupIngressProp]
+
+
+class SecurityGroupRule(NamedTuple):
+    """
+    A single ingress or egress rule of the template, for one of its CIDR ranges.
+
+    Properties:
+
+    - logical_id: Logical id of the resource that contains the rule.
+    - resource_type: Type of the resource that contains the rule.
+    - direction: `ingress` or `egress`.
+    - group: Security group the rule belongs to. The logical id of the resource for security groups, and `GroupId`,
+      `GroupName` or `DBSecurityGroupName` for rules declared as resources.
+    - protocol: Lowercase protocol name, `-1` for all protocols, or the protocol number for the ones without a name.
+    - from_port: First port allowed by the rule.
+    - to_port: Last port allowed by the rule.
+    - network: IPv4 or IPv6 range of the rule, None if the peer is a security group or a prefix list.
+    - first_address: First address of `network` as an integer.
+    - last_address: Last address of `network` as an integer.
+    - peer: Security group or prefix list of the rule, if any.
+    - rule: The rule itself.
+
+    Values that are not resolved (intrinsic functions) are None. Ports are None for ICMP rules, and all ports are
+    allowed for protocols other than TCP and UDP.
+    """
+
+    logical_id: str
+    resource_type: str
+    direction: str
+    group: Optional[str]
+    protocol: Optional[str]
+    from_port: Optional[int]
+    to_port: Optional[int]
+    network: Optional[Network]
+    first_address: Optional[int]
+    last_address: Optional[int]
+    peer: Optional[str]
+    rule: RuleProp
+
+
+class IntervalTree:
+    """
+    Static centered interval tree over closed integer intervals, each one with the position it was given in.
+    Queries take logarithmic time plus the number of intervals found.
+    """
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: Iterable[Tuple[int, int, int]]):
+        intervals = list(intervals)
+        self.left: Optional[IntervalTree] = None
+        self.right: Optional[IntervalTree] = None
+        if not intervals:
+            self.center = 0
+            self.by_start: List[Tuple[int, int, int]] = []
+            self.by_end: List[Tuple[int, int, int]] = []
+            return
+        endpoints = sorted(endpoint for start, end, _ in intervals for endpoint in (start, end))
+        self.center = endpoints[len(endpoints) // 2]
+        here, left, right = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here)
+        self.by_end = sorted(here, key=lambda interval: interval[1], reverse=True)
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def overlapping(self, start: int, end: int) -> List[int]:
+        """
+        Returns:
+            Sorted positions of the intervals that overlap `[start, end]`.
+        """
+        positions = []
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            if end < node.center:
+                # Intervals of the node contain the center, they overlap if they start before the end
+                for interval_start, _, position in node.by_start:
+                    if interval_start > end:
+                        break
+                    positions.append(position)
+                if node.left is not None:
+                    nodes.append(node.left)
+            elif start > node.center:
+                for _, interval_end, position in node.by_end:
+                    if interval_end < start:
+                        break
+                    positions.append(position)
+                if node.right is not None:
+                    nodes.append(node.right)
+            else:
+                positions.extend(position for _, _, position in node.by_start)
+                nodes.extend(child for child in (node.left, node.right) if child is not None)
+        return sorted(positions)
+
+    def overlapping_any(self, ranges: Iterable[Tuple[int, int]]) -> List[int]:
+        """
+        Returns:
+            Sorted positions of the intervals that overlap any of the ranges.
+        """
+        positions = set()
+        for start, end in ranges:
+            positions.update(self.overlapping(start, end))
+        return sorted(positions)
+
+    def containing(self, point: int) -> List[int]:
+        """
+        Returns:
+            Sorted positions of the intervals that contain `point`.
+        """
+        return self.overlapping(point, point)
+
+
+class SecurityGroupIndex:
+    """
+    Table with every ingress and egress rule of the security groups in a template, built once so that many network
+    rules can be run over it without walking the model again. Rules with an IPv4 and an IPv6 range have a row for
+    each one.
+
+    Lookups by port use an interval tree over the port ranges of the rules.
+    """
+
+    def __init__(self, rules: Iterable[SecurityGroupRule] = ()):
+        self.rules: List[SecurityGroupRule] = list(rules)
+        self._ports = IntervalTree(
+            (rule.from_port, rule.to_port, position)
+            for position, rule in enumerate(self.rules)
+            if rule.from_port is not None
+        )
+
+    @classmethod
+    def from_model(cls, model: "CFModel") -> "SecurityGroupIndex":
+        """
+        Builds the index with the rules of `AWS::EC2::SecurityGroup`, `AWS::EC2::SecurityGroupIngress`,
+        `AWS::EC2::SecurityGroupEgress`, `AWS::RDS::DBSecurityGroup` and `AWS::RDS::DBSecurityGroupIngress` resources.
+
+        Arguments:
+            model: The template.
+
+        Returns:
+            A new SecurityGroupIndex.
+        """
+        rules = []
+        for logical_id, resource in model.Resources.items():
+            for direction, group, rule in _resource_rules(logical_id, resource):
+                rules.extend(_rule_rows(logical_id, resource.Type, direction, group, rule))
+        return cls(rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self) -> Iterator[SecurityGroupRule]:
+        return iter(self.rules)
+
+    def rows(self, positions: Iterable[int]) -> List[SecurityGroupRule]:
+        return [self.rules[position] for position in positions]
+
+    def with_port(self, port: int) -> List[int]:
+        """
+        Returns:
+            Positions of the rules that allow traffic on the port.
+        """
+        return self._ports.containing(port)
+
+    def with_ports(self, ports: Iterable[int]) -> List[int]:
+        """
+        Arguments:
+            ports: Ports to look for, such as a list of sensitive ports.
+
+        Returns:
+            Positions of the rules that allow traffic on any of the ports.
+        """
+        return self._ports.overlapping_any(port_ranges(ports))
+
+    def exposed_ports(
+        self,
+        ports: Iterable[int],
+        protocol: Optional[Union[int, str]] = None,
+        direction: Optional[str] = None,
+        include_private: bool = True,
+    ) -> List[Tuple[SecurityGroupRule, List[int]]]:
+        """
+        Finds the rules with a CIDR range that allow traffic on any of the ports, with the ports each one allows.
+        Ports are collapsed into ranges that are looked up in the interval tree, instead of checking every port against
+        every rule.
+
+        Arguments:
+            ports: Ports to look for, such as a list of sensitive ports.
+            protocol: See `query`.
+            direction: See `query`.
+            include_private: See `query`.
+
+        Returns:
+            List of matching rows and the sorted ports they allow, in template order.
+        """
+        sorted_ports = sorted(set(ports))
+        result = []
+        for rule in self._filter(self.with_ports(sorted_ports), protocol, direction, include_private):
+            allowed = sorted_ports[bisect_left(sorted_ports, rule.from_port) : bisect_right(sorted_ports, rule.to_port)]
+            result.append((rule, allowed))
+        return result
+
+    def query(
+        self,
+        port: Optional[int] = None,
+        protocol: Optional[Union[int, str]] = None,
+        direction: Optional[str] = None,
+        include_private: bool = True,
+    ) -> List[SecurityGroupRule]:
+        """
+        Finds the rules with a CIDR range that match all the given criteria, such as the rules that expose port 22
+        to addresses outside of the private space: `query(port=22, protocol="tcp", direction="ingress",
+        include_private=False)`.
+
+        Arguments:
+            port: Port the rules allow.
+            protocol: Protocol the rules allow, by name or number. Rules for all the protocols match any of them.
+            direction: `ingress` or `egress`.
+            include_private: Include the rules whose range is inside the private space of RFC 1918 or RFC 4193.
+
+        Returns:
+            List of matching rows, in template order.
+        """
+        positions = self.with_port(port) if port is not None else range(len(self.rules))
+        return list(self._filter(positions, protocol, direction, include_private))
+
+    def _filter(
+        self,
+        positions: Iterable[int],
+        protocol: Optional[Union[int, str]],
+        direction: Optional[str],
+        include_private: bool,
+    ) -> Iterator[SecurityGroupRule]:
+        protocol = normalize_protocol(protocol) if protocol is not None else None
+        for position in positions:
+            rule = self.rules[position]
+            if rule.network is None:
+                continue
+            if direction is not None and rule.direction != direction:
+                continue
+            if protocol is not None and rule.protocol not in (protocol, ALL_PROTOCOLS):
+                continue
+            if (
+                not include_private
+                and classify_range(rule.network.version, rule.first_address, rule.last_address) == PRIVATE
+            ):
+                continue
+            yield rule
+
+
+def _resource_rules(logical_id: str, resource: Any) -> Iterator[Tuple[str, Optional[str], Any]]:
+    properties = resource.Properties
+    if isinstance(resource, SecurityGroup) and isinstance(properties, SecurityGroupProperties):
+        for rule in convert_to_list(properties.SecurityGroupIngress or []):
+            yield INGRESS, logical_id, rule
+        for rule in convert_to_list(properties.SecurityGroupEgress or []):
+            yield EGRESS, logical_id, rule
+    elif isinstance(resource, RDSDBSecurityGroup) and isinstance(properties, RDSDBSecurityGroupProperties):
+        for rule in properties.DBSecurityGroupIngress:
+            yield INGRESS, logical_id, rule
+    elif isinstance(resource, SecurityGroupIngress):
+        yield INGRESS, _only_string(properties.GroupId) or _only_string(properties.GroupName), properties
+    elif isinstance(resource, SecurityGroupEgress):
+        yield EGRESS, _only_string(properties.GroupId), properties
+    elif isinstance(resource, RDSDBSecurityGroupIngress):
+        yield INGRESS, _only_string(properties.DBSecurityGroupName), properties
+
+
+def _only_string(value: Any) -> Optional[str]:
+    return value if isinstance(value, str) else None
+
+
+def _rule_rows(
+    logical_id: str, resource_type: str, direction: str, group: Optional[str], rule: Any
+) -> List[SecurityGroupRule]:
+    if isinstance(rule, DBSecurityGroupIngressProp):
+        protocol = ALL_PROTOCOLS
+        ports = ALL_PORTS
+        networks = [rule.CIDRIP]
+        peer = _only_string(rule.EC2SecurityGroupId) or _only_string(rule.EC2SecurityGroupName)
+    elif isinstance(rule, (SecurityGroupIngressProp, SecurityGroupEgressProp)):
+        protocol = rule.protocol
+        ports = rule.port_range
+        networks = [rule.CidrIp, rule.CidrIpv6]
+        if isinstance(rule, SecurityGroupIngressProp):
+            peer = (
+                _only_string(rule.SourceSecurityGroupId)
+                or _only_string(rule.SourceSecurityGroupName)
+                or _only_string(rule.SourcePrefixListId)
+            )
+        else:
+            peer = _only_string(rule.DestinationSecurityGroupId) or _only_string(rule.DestinationPrefixListId)
+    else:
+        # Rules that are not resolved
+        return []
+
+    from_port, to_port = ports if ports is not None else (None, None)
+    networks = [network for network in networks if isinstance(network, (IPv4Network, IPv6Network))] or [None]
+    rows = []
+    for network in networks:
+        first_address, last_address = address_range(network) if network is not None else (None, None)
+        rows.append(
+            SecurityGroupRule(
+                logical_id=logical_id,
+                resource_type=resource_type,
+                direction=direction,
+                group=group,
+                protocol=protocol,
+                from_port=from_port,
+                to_port=to_port,
+                network=network,
+                first_address=first_address,
+                last_address=last_address,
+                peer=peer,
+                rule=rule,
+            )
+        )
+    return rows
@@ -0,0 +1,271 @@
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from pycfmodel.model.resources.iam_role import IAMRole, IAMRoleProperties
+from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.model.resources.properties.statement import Statement
+
+if TYPE_CHECKING:
+    from pycfmodel.model.cf_model import CFModel
+
+WILDCARD = "*"
+
+
+class StatementRow(NamedTuple):
+    """
+    A single statement of the template and where it comes from.
+
+    Properties:
+
+    - logical_id: Logical id of the resource that contains the statement.
+    - resource_type: Type of the resource that contains the statement.
+    - policy_name: Name of the policy that contains the statement, if any.
+    - assume_role_policy: True if the statement belongs to the assume role policy document of a role.
+    - effect: `Allow`, `Deny` or None if it can't be known without resolving the template.
+    - actions: Actions in `Action`.
+    - not_actions: Actions in `NotAction`.
+    - resources: Resources in `Resource`.
+    - not_resources: Resources in `NotResource`.
+    - principals: Principals in `Principal`.
+    - not_principals: Principals in `NotPrincipal`.
+    - has_condition: True if the statement has a `Condition`.
+    - statement: The [statement][pycfmodel.model.resources.properties.statement.Statement] itself.
+
+    Values that are not resolved (intrinsic functions) are not included in `actions`, `not_actions`, `resources`,
+    `not_resources`, `principals` and `not_principals`.
+    """
+
+    logical_id: str
+    resource_type: str
+    policy_name: Optional[str]
+    assume_role_policy: bool
+    effect: Optional[str]
+    actions: Tuple[str, ...]
+    not_actions: Tuple[str, ...]
+    resources: Tuple[str, ...]
+    not_resources: Tuple[str, ...]
+    principals: Tuple[str, ...]
+    not_principals: Tuple[str, ...]
+    has_condition: bool
+    statement: Statement
+
+
+def _only_strings(values: Iterable) -> Tuple[str, ...]:
+    return tuple(value for value in values if isinstance(value, str))
+
+
+def _effect(effect: Any) -> Optional[str]:
+    # Models built without validation may keep the effect as written in the template
+    if isinstance(effect, str) and effect.capitalize() in ("Allow", "Deny"):
+        return effect.capitalize()
+    return None
+
+
+def _action_prefix(action: str) -> str:
+    if action == WILDCARD:
+        return WILDCARD
+    return action.split(":", 1)[0].lower()
+
+
+class StatementIndex:
+    """
+    Columnar table with every statement of every policy document in a template, built once so that many rules can
+    be run over it without walking the model again.
+
+    Each column is a list where position `i` belongs to the `i`-th statement. Lookups by action prefix, principal,
+    not principal and effect return the sorted positions of the matching statements.
+    """
+
+    COLUMNS = StatementRow._fields
+
+    def __init__(self, rows: Iterable[StatementRow] = ()):
+        self.logical_ids: List[str] = []
+        self.resource_types: List[str] = []
+        self.policy_names: List[Optional[str]] = []
+        self.assume_role_policies: List[bool] = []
+        self.effects: List[Optional[str]] = []
+        self.actions: List[Tuple[str, ...]] = []
+        self.not_actions: List[Tuple[str, ...]] = []
+        self.resources: List[Tuple[str, ...]] = []
+        self.not_resources: List[Tuple[str, ...]] = []
+        self.principals: List[Tuple[str, ...]] = []
+        self.not_principals: List[Tuple[str, ...]] = []
+        self.has_conditions: List[bool] = []
+        self.statements: List[Statement] = []
+
+        self._by_action_prefix: Dict[str, List[int]] = defaultdict(list)
+        self._by_principal: Dict[str, List[int]] = defaultdict(list)
+        self._by_not_principal: Dict[str, List[int]] = defaultdict(list)
+        self._by_effect: Dict[str, List[int]] = defaultdict(list)
+
+        for row in rows:
+            self.append(row)
+
+    @classmethod
+    def from_model(cls, model: "CFModel") -> "StatementIndex":
+        """
+        Builds the index with the statements of all the policy documents in a model, including the assume role policy
+        documents of IAM roles.
+
+        Arguments:
+            model: The template.
+
+        Returns:
+            A new StatementIndex.
+        """
+        index = cls()
+        for logical_id, resource in model.Resources.items():
+            documents = [(policy, False) for policy in resource.policy_documents]
+            if isinstance(resource, IAMRole) and isinstance(resource.Properties, IAMRoleProperties):
+                documents.extend(
+                    (policy, True) for policy in resource.assume_role_as_optionally_named_policy_document_list
+                )
+            for policy, assume_role_policy in documents:
+                if not isinstance(policy.policy_document, PolicyDocument):
+                    continue
+                policy_name = policy.name if isinstance(policy.name, str) else None
+                for statement in policy.policy_document.statement_as_list():
+                    if not isinstance(statement, Statement):
+                        continue
+                    index.append(
+                        StatementRow(
+                            logical_id=logical_id,
+                            resource_type=resource.Type,
+                            policy_name=policy_name,
+                            assume_role_policy=assume_role_policy,
+                            effect=_effect(statement.Effect),
+                            actions=_only_strings(statement.get_action_list(include_not_action=False)),
+                            not_actions=_only_strings(statement.get_action_list(include_action=False)),
+                            resources=_only_strings(statement.get_resource_list(include_not_resource=False)),
+                            not_resources=_only_strings(statement.get_resource_list(include_resource=False)),
+                            principals=_only_strings(statement.get_principal_list(include_not_principal=False)),
+                            not_principals=_only_strings(statement.get_principal_list(include_principal=False)),
+                            has_condition=bool(statement.Condition),
+                            statement=statement,
+                        )
+                    )
+        return index
+
+    def append(self, row: StatementRow):
+        position = len(self.statements)
+        self.logical_ids.append(row.logical_id)
+        self.resource_types.append(row.resource_type)
+        self.policy_names.append(row.policy_name)
+        self.assume_role_policies.append(row.assume_role_policy)
+        self.effects.append(row.effect)
+        self.actions.append(row.actions)
+        self.not_actions.append(row.not_actions)
+        self.resources.append(row.resources)
+        self.not_resources.append(row.not_resources)
+        self.principals.append(row.principals)
+        self.not_principals.append(row.not_principals)
+        self.has_conditions.append(row.has_condition)
+        self.statements.append(row.statement)
+
+        if row.effect is not None:
+            self._by_effect[row.effect].append(position)
+        for prefix in dict.fromkeys(_action_prefix(action) for action in row.actions):
+            self._by_action_prefix[prefix].append(position)
+        for principal in dict.fromkeys(row.principals):
+            self._by_principal[principal].append(position)
+        for principal in dict.fromkeys(row.not_principals):
+            self._by_not_principal[principal].append(position)
+
+    def __len__(self) -> int:
+        return len(self.statements)
+
+    def __iter__(self) -> Iterator[StatementRow]:
+        return (self.row(position) for position in range(len(self)))
+
+    def row(self, position: int) -> StatementRow:
+        return StatementRow(
+            logical_id=self.logical_ids[position],
+            resource_type=self.resource_types[position],
+            policy_name=self.policy_names[position],
+            assume_role_policy=self.assume_role_policies[position],
+            effect=self.effects[position],
+            actions=self.actions[position],
+            not_actions=self.not_actions[position],
+            resources=self.resources[position],
+            not_resources=self.not_resources[position],
+            principals=self.principals[position],
+            not_principals=self.not_principals[position],
+            has_condition=self.has_conditions[position],
+            statement=self.statements[position],
+        )
+
+    def rows(self, positions: Iterable[int]) -> List[StatementRow]:
+        return [self.row(position) for position in positions]
+
+    def with_effect(self, effect: str) -> List[int]:
+        """
+        Arguments:
+            effect: `Allow` or `Deny`, case insensitive.
+
+        Returns:
+            Positions of the statements with the given effect.
+        """
+        return list(self._by_effect.get(effect.capitalize(), []))
+
+    def with_action_prefix(self, prefix: str, include_wildcard: bool = True) -> List[int]:
+        """
+        Arguments:
+            prefix: Service prefix of the action, such as `s3` or `iam`, case insensitive.
+            include_wildcard: Include statements with `*` as action, as they apply to every service.
+
+        Returns:
+            Positions of the statements with at least one action in `Action` for the given service.
+        """
+        positions = set(self._by_action_prefix.get(prefix.lower(), []))
+        if include_wildcard:
+            positions.update(self._by_action_prefix.get(WILDCARD, []))
+        return sorted(positions)
+
+    def with_principal(self, principal: str) -> List[int]:
+        """
+        Arguments:
+            principal: Principal exactly as written in the template, such as `*` or an ARN.
+
+        Returns:
+            Positions of the statements that include the principal in `Principal`.
+        """
+        return list(self._by_principal.get(principal, []))
+
+    def with_not_principal(self, principal: str) -> List[int]:
+        """
+        Arguments:
+            principal: Principal exactly as written in the template, such as `*` or an ARN.
+
+        Returns:
+            Positions of the statements that include the principal in `NotPrincipal`, which apply to every other
+            principal.
+        """
+        return list(self._by_not_principal.get(principal, []))
+
+    def query(
+        self, effect: Optional[str] = None, action_prefix: Optional[str] = None, principal: Optional[str] = None
+    ) -> List[StatementRow]:
+        """
+        Finds the statements that match all the given criteria.
+
+        Arguments:
+            effect: See `with_effect`.
+            action_prefix: See `with_action_prefix`.
+            principal: See `with_principal`.
+
+        Returns:
+            List of matching rows, in template order.
+        """
+        candidates: Optional[set] = None
+        for criteria, lookup in (
+            (effect, self.with_effect),
+            (action_prefix, self.with_action_prefix),
+            (principal, self.with_principal),
+        ):
+            if criteria is None:
+                continue
+            positions = set(lookup(criteria))
+            candidates = positions if candidates is None else candidates & positions
+        if candidates is None:
+            return list(self)
+        return self.rows(sorted(candidates))
@@ -1,10 +1,11 @@
 import binascii
-from base64 import b64decode
+from base64 import b64decode, b64encode
 from datetime import date, datetime
-from ipaddress import IPv4Network, IPv6Network
-from typing import Any, List, Type, TypeVar, Union
+from functools import lru_cache
+from ipaddress import AddressValueError, IPv4Network, IPv6Network
+from typing import Any, Callable, List, Optional, Type, TypeVar, Union
 
-from pydantic import BaseModel, BeforeValidator, Field, GetCoreSchemaHandler
+from pydantic import BaseModel, BeforeValidator, Field, GetCoreSchemaHandler, PlainSerializer, SerializeAsAny
 from pydantic._internal import _schema_generation_shared
 from pydantic.json_schema import JsonSchemaValue
 from pydantic_core import core_schema
@@ -14,11 +15,72 @@ from pycfmodel.model.base import FunctionDict
 from pycfmodel.utils import is_resolvable_dict
 
 
+def _ipv4_syntax_error(value: str) -> Optional[str]:
+    """
+    Same error as `IPv4Network` for strings that are clearly not IPv4 networks, such as ARNs, without parsing them.
+    """
+    address, _, mask = value.partition("/")
+    if "/" in mask:
+        return f"Only one '/' permitted in {value!r}"
+    if not address:
+        return "Address cannot be empty"
+    if address.count(".") != 3:
+        return f"Expected 4 octets in {address!r}"
+    return None
+
+
+def _ipv6_syntax_error(value: str) -> Optional[str]:
+    """
+    Same error as `IPv6Network` for strings that are clearly not IPv6 networks, such as ARNs, without parsing them.
+    """
+    address, _, mask = value.partition("/")
+    if "/" in mask:
+        return f"Only one '/' permitted in {value!r}"
+    if "%" in address:
+        # Scope ids are left to the parser
+        return None
+    if not address:
+        return "Address cannot be empty"
+    if address.count(":") < 2:
+        return f"At least 3 parts expected in {address!r}"
+    return None
+
+
+@lru_cache(maxsize=65536)
+def _parse_network(
+    network_class: Type[Union[IPv4Network, IPv6Network]], value: str
+) -> Union[IPv4Network, IPv6Network, ValueError]:
+    # Errors are cached too, without their traceback
+    try:
+        return network_class(value, strict=False)
+    except ValueError as error:
+        return error.with_traceback(None)
+
+
+def _loose_network(
+    network_class: Type[Union[IPv4Network, IPv6Network]], syntax_error: Callable[[str], Optional[str]], value: Any
+) -> Union[IPv4Network, IPv6Network]:
+    """
+    Network of a value, ignoring its host bits. Strings are checked with `syntax_error` first, and the networks of the
+    strings that pass it are cached, as templates repeat the same CIDRs many times. Networks are not modified once
+    built, so the cached ones are shared.
+    """
+    if type(value) is not str:
+        return network_class(value, strict=False)
+    message = syntax_error(value)
+    if message is not None:
+        raise AddressValueError(message)
+    network = _parse_network(network_class, value)
+    if isinstance(network, ValueError):
+        raise type(network)(*network.args)
+    return network
+
+
 class LooseIPv4Network:
     __slots__ = ()
 
     def __new__(cls, value: Any) -> IPv4Network:
-        return IPv4Network(value, strict=False)
+        return _loose_network(IPv4Network, _ipv4_syntax_error, value)
 
     @classmethod
     def __get_pydantic_json_schema__(
@@ -46,8 +108,8 @@ class LooseIPv4Network:
 class LooseIPv6Network:
     __slots__ = ()
 
-    def __new__(cls, value: Any) -> IPv4Network:
-        return IPv6Network(value, strict=False)
+    def __new__(cls, value: Any) -> IPv6Network:
+        return _loose_network(IPv6Network, _ipv6_syntax_error, value)
 
     @classmethod
     def __get_pydantic_json_schema__(
@@ -102,7 +164,7 @@ class SemiStrictBool:
         _handler: GetCoreSchemaHandler,
     ) -> core_schema.CoreSchema:
         return core_schema.no_info_plain_validator_function(
-            cls._validate, serialization=core_schema.to_string_ser_schema()
+            cls._validate, serialization=core_schema.simple_ser_schema("bool")
         )
 
     @classmethod
@@ -112,19 +174,27 @@ class SemiStrictBool:
 
 def validate_binary(value: Any) -> bytearray:
     try:
-        value = b64decode(value)
-    except binascii.Error:
+        # Also accepts the URL-safe alphabet, which other tools may use to dump bytes as base64
+        value = b64decode(value, altchars=b"-_")
+    except (binascii.Error, TypeError):
         raise ValueError("Binary value not valid")
     return value
 
 
-Binary = Annotated[bytes, BeforeValidator(validate_binary)]
+def serialize_binary(value: bytes) -> str:
+    # Templates use the standard base64 alphabet, JSON dumps must too so they can be read by other tools
+    return b64encode(value).decode()
+
+
+Binary = Annotated[bytes, BeforeValidator(validate_binary), PlainSerializer(serialize_binary, when_used="json")]
 
 
 T = TypeVar("T")
 
-Resolvable = Annotated[Union[T, FunctionDict], Field(union_mode="left_to_right")]
-InstanceOrListOf = Annotated[Union[T, List[T]], Field(union_mode="left_to_right")]
+# Values of unions are serialized by their own type instead of trying each member, which pydantic-core does with the
+# repr of the value for every member that doesn't match.
+Resolvable = Annotated[Union[T, FunctionDict], Field(union_mode="left_to_right"), SerializeAsAny()]
+InstanceOrListOf = Annotated[Union[T, List[T]], Field(union_mode="left_to_right"), SerializeAsAny()]
 
 ResolvableStr = Resolvable[str]
 ResolvableArn = ResolvableStr
@@ -136,7 +206,9 @@ ResolvableBool = Resolvable[SemiStrictBool]
 
 ResolvableIPv4Network = Resolvable[LooseIPv4Network]
 ResolvableIPv6Network = Resolvable[LooseIPv6Network]
-ResolvableIPNetwork = Annotated[Union[ResolvableIPv4Network, ResolvableIPv6Network], Field(union_mode="left_to_right")]
+ResolvableIPNetwork = Annotated[
+    Union[ResolvableIPv4Network, ResolvableIPv6Network], Field(union_mode="left_to_right"), SerializeAsAny()
+]
 
 
 ResolvableIntOrStr = Resolvable[Union[int, str]]
@@ -147,7 +219,8 @@ ResolvableArnOrList = InstanceOrListOf[ResolvableArn]
 ResolvableIntOrList = InstanceOrListOf[ResolvableInt]
 ResolvableIPOrList = InstanceOrListOf[ResolvableIPNetwork]
 ResolvableBoolOrList = InstanceOrListOf[ResolvableBool]
-ResolvableBytesOrList = InstanceOrListOf[Binary]
+# Binary values need their own serializer, which would be skipped by the serialization by type of InstanceOrListOf
+ResolvableBytesOrList = Annotated[Union[Binary, List[Binary]], Field(union_mode="left_to_right")]
 ResolvableDateOrList = InstanceOrListOf[ResolvableDate]
 ResolvableDatetimeOrList = InstanceOrListOf[ResolvableDatetime]
 
@@ -182,10 +255,7 @@ class _ResolvableModelValidator:
             raise ValueError(f"Expected {model_cls.__name__}, FunctionDict, or dict")
 
         return core_schema.no_info_plain_validator_function(
-            validate,
-            serialization=core_schema.plain_serializer_function_ser_schema(
-                lambda x: x.model_dump() if isinstance(x, BaseModel) else x
-            ),
+            validate, serialization=core_schema.simple_ser_schema("any")
         )
 
 
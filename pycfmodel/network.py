@@ -0,0 +1,288 @@
+"""
+Classification of IP networks in private, public and reserved address space, and sets of addresses.
+
+Networks are classified by comparing their first and last addresses, as integers, with sorted tables of the special
+purpose blocks of IPv4 and IPv6, and the result is memoized by network. Unlike `is_global` of `ipaddress`, it is
+correct for networks that contain special purpose blocks, such as `0.0.0.0/0`, see https://bugs.python.org/issue38655.
+
+Large sets of networks, such as WAF IP sets or threat intelligence feeds, are collapsed into
+[AddressRanges][pycfmodel.network.AddressRanges] to query them without comparing every pair of networks.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from ipaddress import (
+    IPv4Address,
+    IPv4Network,
+    IPv6Address,
+    IPv6Network,
+    ip_address,
+    ip_network,
+    summarize_address_range,
+)
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from pycfmodel.constants import IPV4_PRIVATE_VALUES, IPV4_ZERO_VALUE, IPV6_PRIVATE_VALUES, IPV6_ZERO_VALUE
+
+Network = Union[IPv4Network, IPv6Network]
+Address = Union[IPv4Address, IPv6Address]
+
+_ADDRESS_CLASSES = {4: IPv4Address, 6: IPv6Address}
+
+PRIVATE = "private"
+PUBLIC = "public"
+RESERVED = "reserved"
+
+IPV4_ZERO_NETWORK = IPv4Network(IPV4_ZERO_VALUE)
+IPV6_ZERO_NETWORK = IPv6Network(IPV6_ZERO_VALUE)
+
+# Special purpose blocks that are not globally reachable, other than the private ones. Multicast is included, as it is
+# not reachable as a destination from the internet.
+IPV4_RESERVED_VALUES = (
+    "0.0.0.0/8",
+    "100.64.0.0/10",
+    "127.0.0.0/8",
+    "169.254.0.0/16",
+    "192.0.0.0/24",
+    "192.0.2.0/24",
+    "198.18.0.0/15",
+    "198.51.100.0/24",
+    "203.0.113.0/24",
+    "224.0.0.0/4",
+    "240.0.0.0/4",
+)
+IPV6_RESERVED_VALUES = (
+    "::/127",
+    "::ffff:0:0/96",
+    "64:ff9b:1::/48",
+    "100::/64",
+    "2001::/23",
+    "2001:db8::/32",
+    "fe80::/10",
+    "ff00::/8",
+)
+
+
+def _block_table(classes: Dict[str, Sequence[str]], network_class: type) -> List[Tuple[int, int, str]]:
+    blocks = []
+    for block_class, values in classes.items():
+        for value in values:
+            network = network_class(value)
+            blocks.append((int(network.network_address), int(network.broadcast_address), block_class))
+    return sorted(blocks)
+
+
+def _merge_blocks(blocks: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    merged = []
+    for start, end, block_class in blocks:
+        if merged and start <= merged[-1][1] + 1:
+            last_start, last_end, last_class = merged[-1]
+            # A range spanning blocks of different classes is neither private nor public
+            merged[-1] = (last_start, max(last_end, end), last_class if last_class == block_class else RESERVED)
+        else:
+            merged.append((start, end, block_class))
+    return merged
+
+
+def _bisect_table(blocks: List[Tuple[int, int, str]]) -> Tuple[List[int], List[Tuple[int, str]]]:
+    return [start for start, _, _ in blocks], [(end, block_class) for _, end, block_class in blocks]
+
+
+_IPV4_BLOCKS = _block_table({PRIVATE: IPV4_PRIVATE_VALUES, RESERVED: IPV4_RESERVED_VALUES}, IPv4Network)
+_IPV6_BLOCKS = _block_table({PRIVATE: IPV6_PRIVATE_VALUES, RESERVED: IPV6_RESERVED_VALUES}, IPv6Network)
+# Ranges inside a single block take its class, the ones spanning several adjacent or overlapping blocks, such as
+# 224.0.0.0/3 (multicast and 240.0.0.0/4), are looked up in the merged blocks
+_BLOCKS = {
+    4: (_bisect_table(_IPV4_BLOCKS), _bisect_table(_merge_blocks(_IPV4_BLOCKS))),
+    6: (_bisect_table(_IPV6_BLOCKS), _bisect_table(_merge_blocks(_IPV6_BLOCKS))),
+}
+
+
+def _find_block(table: Tuple[List[int], List[Tuple[int, str]]], first_address: int, last_address: int) -> Optional[str]:
+    starts, blocks = table
+    position = bisect_right(starts, first_address) - 1
+    if position >= 0:
+        end, block_class = blocks[position]
+        if last_address <= end:
+            return block_class
+    return None
+
+
+def address_range(network: Network) -> Tuple[int, int]:
+    """
+    Returns:
+        First and last address of the network, as integers.
+    """
+    first = int(network.network_address)
+    # Same as the hostmask, without building an address for it
+    return first, first | ((1 << (network.max_prefixlen - network.prefixlen)) - 1)
+
+
+def classify_range(version: int, first_address: int, last_address: int) -> str:
+    """
+    Classifies a range of addresses given as integers.
+
+    Arguments:
+        version: 4 or 6.
+        first_address: First address of the range.
+        last_address: Last address of the range.
+
+    Returns:
+        `private` or `reserved` if the range only contains private or reserved addresses, otherwise `public`.
+    """
+    blocks, merged_blocks = _BLOCKS[version]
+    return (
+        _find_block(blocks, first_address, last_address)
+        or _find_block(merged_blocks, first_address, last_address)
+        or PUBLIC
+    )
+
+
+@lru_cache(maxsize=65536)
+def classify_network(network: Network) -> str:
+    """
+    Classifies a network as `private` (RFC 1918 and RFC 4193), `reserved` (other special purpose blocks, such as
+    loopback, link local, documentation or multicast) or `public`. Networks that contain public addresses, such as
+    `0.0.0.0/0`, are public.
+    """
+    return classify_range(network.version, *address_range(network))
+
+
+@lru_cache(maxsize=65536)
+def is_global_network(network: Network) -> bool:
+    """
+    Same as `is_global` of `ipaddress`, memoized by network, and true for `0.0.0.0/0` and `::/0` in every Python
+    version, see https://bugs.python.org/issue38655. Unlike the classification of this module, multicast is global.
+    """
+    return network in (IPV4_ZERO_NETWORK, IPV6_ZERO_NETWORK) or network.is_global
+
+
+def is_public_network(network: Network) -> bool:
+    return classify_network(network) == PUBLIC
+
+
+def is_private_network(network: Network) -> bool:
+    return classify_network(network) == PRIVATE
+
+
+class AddressRanges:
+    """
+    Set of IP addresses stored as sorted, disjoint and non adjacent ranges of integers, one list for each IP version,
+    as `ipaddress.collapse_addresses` would leave them. Membership and overlap queries use binary search.
+
+    Example:
+
+        threat_intel = AddressRanges.from_networks(line.strip() for line in open("blocklist.txt"))
+        if ip_set.address_ranges.overlaps(threat_intel):
+            ...
+    """
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, ranges: Iterable[Tuple[int, int, int]] = ()):
+        """
+        Arguments:
+            ranges: Tuples with the IP version, first and last address of each range, in any order.
+        """
+        by_version: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+        for version, first, last in ranges:
+            by_version[version].append((first, last))
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        for version, version_ranges in by_version.items():
+            starts, ends = [], []
+            for first, last in sorted(version_ranges):
+                if ends and first <= ends[-1] + 1:
+                    if last > ends[-1]:
+                        ends[-1] = last
+                else:
+                    starts.append(first)
+                    ends.append(last)
+            self._starts[version] = starts
+            self._ends[version] = ends
+
+    @classmethod
+    def from_networks(cls, networks: Iterable[Union[Network, Address, str]]) -> "AddressRanges":
+        """
+        Arguments:
+            networks: Networks, addresses, or strings with either of them. Host bits of networks are ignored.
+
+        Returns:
+            The addresses of all the networks.
+        """
+        return cls(_network_range(network) for network in networks)
+
+    def __len__(self) -> int:
+        """Number of ranges."""
+        return len(self._starts[4]) + len(self._starts[6])
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AddressRanges):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        """Yields the IP version, first and last address of each range, IPv4 first."""
+        for version in (4, 6):
+            for first, last in zip(self._starts[version], self._ends[version]):
+                yield version, first, last
+
+    def __contains__(self, value: Union[Network, Address, str]) -> bool:
+        return self.contains(value)
+
+    @property
+    def num_addresses(self) -> int:
+        """Total number of addresses, without counting the same address twice."""
+        return sum(last - first + 1 for _, first, last in self)
+
+    def contains(self, value: Union[Network, Address, str]) -> bool:
+        """
+        Arguments:
+            value: Address or network, or a string with either of them.
+
+        Returns:
+            True if all the addresses of the value are in the set.
+        """
+        version, first, last = _network_range(value)
+        starts = self._starts[version]
+        position = bisect_right(starts, first) - 1
+        return position >= 0 and last <= self._ends[version][position]
+
+    def overlaps(self, other: Union["AddressRanges", Iterable[Union[Network, Address, str]]]) -> bool:
+        """
+        Arguments:
+            other: Another set of ranges, or networks as accepted by `from_networks`.
+
+        Returns:
+            True if any address is in both sets.
+        """
+        if not isinstance(other, AddressRanges):
+            other = AddressRanges.from_networks(other)
+        # The ranges of the smaller set are searched in the larger one
+        smaller, larger = (self, other) if len(self) <= len(other) else (other, self)
+        for version, first, last in smaller:
+            starts = larger._starts[version]
+            # Last range of the larger set that starts before the end of this one, it overlaps if it ends after the start
+            position = bisect_right(starts, last) - 1
+            if position >= 0 and larger._ends[version][position] >= first:
+                return True
+        return False
+
+    def networks(self) -> List[Network]:
+        """Returns the minimal list of networks that cover the ranges, like `ipaddress.collapse_addresses`."""
+        result = []
+        for version, first, last in self:
+            address_class = _ADDRESS_CLASSES[version]
+            result.extend(summarize_address_range(address_class(first), address_class(last)))
+        return result
+
+
+def _network_range(value: Union[Network, Address, str]) -> Tuple[int, int, int]:
+    if isinstance(value, str):
+        value = ip_network(value, strict=False) if "/" in value else ip_address(value)
+    if isinstance(value, (IPv4Address, IPv6Address)):
+        return value.version, int(value), int(value)
+    return (value.version, *address_range(value))
@@ -0,0 +1,77 @@
+from threading import Lock
+from typing import Dict, Iterator, List
+
+from pycfmodel.model.cf_model import CFModel
+from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.model.utils import OptionallyNamedPolicyDocument
+
+
+class PolicyDocumentRegistry:
+    """
+    Maps policy documents to a single shared, canonical and frozen instance per
+    [fingerprint][pycfmodel.model.resources.properties.policy_document.PolicyDocument.fingerprint].
+
+    Results cached on policy documents, such as their effective permissions, are computed once per unique policy when
+    the shared instances are analysed instead of the ones of each resource. It is safe to share between threads.
+
+    Example:
+
+        registry = PolicyDocumentRegistry()
+        for model in models:
+            for logical_id, policy_documents in registry.intern_model(model).items():
+                for policy in policy_documents:
+                    permissions = policy.policy_document.get_effective_permissions()
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._documents: Dict[str, PolicyDocument] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, policy_document: PolicyDocument) -> PolicyDocument:
+        """
+        Returns the shared instance of an equivalent policy document, registering the canonical form of this one if
+        there is none.
+        """
+        fingerprint = policy_document.fingerprint
+        with self._lock:
+            shared = self._documents.get(fingerprint)
+            if shared is not None:
+                self.hits += 1
+                return shared
+        canonical = policy_document.canonical().freeze()
+        with self._lock:
+            shared = self._documents.setdefault(fingerprint, canonical)
+            if shared is canonical:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return shared
+
+    def intern_model(self, model: CFModel) -> Dict[str, List[OptionallyNamedPolicyDocument]]:
+        """
+        Policy documents of every resource of a model that has any, replaced by their shared instances.
+
+        Returns:
+            Dictionary with the logical id of each resource and its policy documents.
+        """
+        result = {}
+        for logical_id, resource in model.Resources.items():
+            policy_documents = resource.policy_documents
+            if policy_documents:
+                result[logical_id] = [
+                    OptionallyNamedPolicyDocument(name=policy.name, policy_document=self.intern(policy.policy_document))
+                    for policy in policy_documents
+                ]
+        return result
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __iter__(self) -> Iterator[PolicyDocument]:
+        with self._lock:
+            return iter(list(self._documents.values()))
+
+    def __contains__(self, policy_document: PolicyDocument) -> bool:
+        return policy_document.fingerprint in self._documents
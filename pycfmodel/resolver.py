@@ -7,7 +7,18 @@ from typing import Dict, List, Union
 from pydantic import BaseModel, Field
 from typing_extensions import Annotated
 
+from pycfmodel import diagnostics
 from pycfmodel.constants import AWS_NOVALUE, CONTAINS_CF_PARAM, CONTAINS_SSM_PARAMETER
+from pycfmodel.diagnostics import report_issue
+from pycfmodel.instrumentation import (
+    RESOLVE_FUNCTION,
+    UNRESOLVED_MAPPING,
+    UNRESOLVED_REF,
+    UNRESOLVED_SSM,
+    current_observer,
+    event,
+    phase,
+)
 from pycfmodel.model.base import FunctionDict
 from pycfmodel.utils import is_resolvable_dict
 
@@ -55,14 +66,12 @@ def resolve(function: ValidResolvers, params: Dict, mappings: Dict[str, Dict], c
 
     if isinstance(function, FunctionDict):
         function_name = next(iter(function.model_fields_set))
-        function_resolver = FUNCTION_MAPPINGS[function_name]
-        return function_resolver(getattr(function, function_name), params, mappings, conditions)
+        return _resolve_function(function_name, getattr(function, function_name), params, mappings, conditions)
 
     if isinstance(function, dict):
         if is_resolvable_dict(function):
             function_name = next(iter(function))
-            function_resolver = FUNCTION_MAPPINGS[function_name]
-            return function_resolver(function[function_name], params, mappings, conditions)
+            return _resolve_function(function_name, function[function_name], params, mappings, conditions)
 
         result = {}
         for k, v in function.items():
@@ -74,11 +83,27 @@ def resolve(function: ValidResolvers, params: Dict, mappings: Dict[str, Dict], c
     raise ValueError(f"Not supported type: {type(function)}")
 
 
+def _resolve_function(
+    function_name: str, function_body, params: Dict, mappings: Dict[str, Dict], conditions: Dict[str, bool]
+):
+    function_resolver = FUNCTION_MAPPINGS[function_name]
+    if current_observer() is None:
+        return function_resolver(function_body, params, mappings, conditions)
+    with phase(RESOLVE_FUNCTION, function_name):
+        return function_resolver(function_body, params, mappings, conditions)
+
+
 def resolve_ssm(ssm_parameter_key: str, params: Dict) -> str:
     ssm_value = params.get(ssm_parameter_key)
     if not ssm_value or not isinstance(ssm_value, str):
-        logger.warning(
-            f"Using `UNDEFINED_PARAM_{ssm_parameter_key}` - value not found in AWS SSM or not of string type."
+        event(UNRESOLVED_SSM, ssm_parameter_key)
+        report_issue(
+            logger,
+            logging.WARNING,
+            diagnostics.UNRESOLVED_SSM,
+            "Using `UNDEFINED_PARAM_%s` - value not found in AWS SSM or not of string type.",
+            ssm_parameter_key,
+            key=ssm_parameter_key,
         )
         return f"UNDEFINED_PARAM_{ssm_parameter_key}"
     return ssm_value
@@ -89,7 +114,16 @@ def resolve_ref(function_body, params: Dict, mappings: Dict[str, Dict], conditio
     if resolved_ref in params:
         return params[resolved_ref]
     else:
-        logger.warning(f"Using `UNDEFINED_PARAM_{resolved_ref}` for {resolved_ref}. Original value wasn't available.")
+        event(UNRESOLVED_REF, resolved_ref)
+        report_issue(
+            logger,
+            logging.WARNING,
+            diagnostics.UNRESOLVED_REF,
+            "Using `UNDEFINED_PARAM_%s` for %s. Original value wasn't available.",
+            resolved_ref,
+            resolved_ref,
+            key=resolved_ref,
+        )
         return f"UNDEFINED_PARAM_{resolved_ref}"
 
 
@@ -110,8 +144,17 @@ def resolve_find_in_map(function_body, params: Dict, mappings: Dict[str, Dict],
     if resolved_mapping is not None:
         return resolved_mapping
     else:
-        logger.warning(
-            f"Using `UNDEFINED_MAPPING_{map_name}_{top_level_key}_{second_level_key}` for {[map_name, top_level_key, second_level_key]}. Original value wasn't available."
+        event(UNRESOLVED_MAPPING, map_name)
+        report_issue(
+            logger,
+            logging.WARNING,
+            diagnostics.UNRESOLVED_MAPPING,
+            "Using `UNDEFINED_MAPPING_%s_%s_%s` for %s. Original value wasn't available.",
+            map_name,
+            top_level_key,
+            second_level_key,
+            [map_name, top_level_key, second_level_key],
+            key=(map_name, top_level_key, second_level_key),
         )
         return f"UNDEFINED_MAPPING_{map_name}_{top_level_key}_{second_level_key}"
 
@@ -143,7 +186,12 @@ def resolve_select(function_body, params: Dict, mappings: Dict[str, Dict], condi
         # In some scenarios, pycfmodel can't resolve some references within resources
         # Such as GETATT, making in Selects lists smaller than the desired index.
         # Instead of failing at resolving the model, we will return an empty list instead.
-        logger.warning("Index is bigger than resolved list, returning empty list.")
+        report_issue(
+            logger,
+            logging.WARNING,
+            diagnostics.SELECT_OUT_OF_RANGE,
+            "Index is bigger than resolved list, returning empty list.",
+        )
         return []
 
 
@@ -188,13 +236,23 @@ def resolve_base64(function_body: str, params: Dict, mappings: Dict[str, Dict],
 
 def resolve_get_attr(function_body, params: Dict, mappings: Dict[str, Dict], conditions: Dict[str, bool]) -> str:
     # TODO: Implement.
-    logger.warning("`Fn::GetAtt` resolver not implemented, returning `GETATT`")
+    report_issue(
+        logger,
+        logging.WARNING,
+        diagnostics.UNRESOLVED_GET_ATT,
+        "`Fn::GetAtt` resolver not implemented, returning `GETATT`",
+    )
     return "GETATT"
 
 
 def resolve_get_azs(function_body, params: Dict, mappings: Dict[str, Dict], conditions: Dict[str, bool]) -> str:
     # TODO: Implement.
-    logger.warning("`Fn::GetAZs` resolver not implemented, returning `GETAZS`")
+    report_issue(
+        logger,
+        logging.WARNING,
+        diagnostics.UNRESOLVED_GET_AZS,
+        "`Fn::GetAZs` resolver not implemented, returning `GETAZS`",
+    )
     return "GETAZS"
 
 
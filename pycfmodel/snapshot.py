@@ -0,0 +1,286 @@
+"""
+Binary snapshots of models, that are loaded without validating them again.
+
+Loading a snapshot is several times faster than validating the template or the JSON dump of a model, so that a
+single stage can parse and validate templates, and the workers that analyse them load their snapshots.
+
+Example:
+
+    from pycfmodel import snapshot
+
+    data = snapshot.dumps(parse(template).resolve(), key=SHARED_KEY)
+    ...
+    model = snapshot.loads(data, key=SHARED_KEY)
+
+Snapshot layout:
+
+- Magic bytes and the version of the format.
+- BLAKE2b digest of the payload, keyed if a key is given.
+- zlib compressed payload, in the `marshal` format: a type table with the classes of the models, their fields, and the
+  types of the IP networks and dates in the snapshot, followed by the root model. Models are stored with the index of
+  their class in the type table, the positions and values of their fields that are not None, the positions of the
+  fields that were set and their extra fields.
+
+Snapshots can only contain models of pycfmodel, so loading one never imports other modules. Anyone who can write
+snapshots can make `loads` run out of memory, use a key if snapshots come from untrusted places. Loaded models are not
+frozen.
+"""
+
+import gc
+import hashlib
+import hmac
+import marshal
+import struct
+import zlib
+from contextlib import contextmanager
+from datetime import date, datetime
+from importlib import import_module
+from ipaddress import IPv4Network, IPv6Network
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+from pycfmodel.model.base import SparseModel
+from pycfmodel.model.types import LooseIPv4Network, LooseIPv6Network
+
+FORMAT_VERSION = 1
+
+_MAGIC = b"PYCFSNAP"
+_HEADER = struct.Struct("!8sH")
+_DIGEST_SIZE = 16
+_MARSHAL_VERSION = 4
+
+# Tags of the tuples that encode values which are not lists, dicts or scalars
+_MODEL = 0
+_VALUE = 1
+_TUPLE = 2
+
+_VALUE_TYPES: Dict[str, Tuple[type, Callable[[Any], str], Callable[[str], Any]]] = {
+    # The networks of the same CIDRs are built once and shared
+    "ipaddress:IPv4Network": (IPv4Network, str, LooseIPv4Network),
+    "ipaddress:IPv6Network": (IPv6Network, str, LooseIPv6Network),
+    "datetime:date": (date, date.isoformat, date.fromisoformat),
+    "datetime:datetime": (datetime, datetime.isoformat, datetime.fromisoformat),
+}
+_VALUE_TYPE_NAMES = {value_type: name for name, (value_type, _, _) in _VALUE_TYPES.items()}
+_SCALARS = (str, int, bool, float, bytes, type(None))
+
+
+class SnapshotError(ValueError):
+    """The snapshot is corrupted, was written with another key or by an incompatible version."""
+
+
+@contextmanager
+def _gc_disabled():
+    # Snapshots are made of many small objects, collecting garbage while they are created takes most of the time.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _digest(payload: bytes, key: Optional[bytes]) -> bytes:
+    return hashlib.blake2b(payload, digest_size=_DIGEST_SIZE, key=key or b"").digest()
+
+
+class _Encoder:
+    def __init__(self):
+        self.table: List[Tuple[str, Tuple[str, ...]]] = []
+        self._indexes: Dict[type, int] = {}
+
+    def _type_index(self, value_type: type, name: str, fields: Tuple[str, ...] = ()) -> int:
+        index = self._indexes.get(value_type)
+        if index is None:
+            index = self._indexes[value_type] = len(self.table)
+            self.table.append((name, fields))
+        return index
+
+    def encode(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type in _SCALARS:
+            return value
+        if value_type is list:
+            return [self.encode(item) for item in value]
+        if value_type is dict:
+            return {key: self.encode(item) for key, item in value.items()}
+        if isinstance(value, BaseModel):
+            return self._encode_model(value)
+        name = _VALUE_TYPE_NAMES.get(value_type)
+        if name is not None:
+            return _VALUE, self._type_index(value_type, name), _VALUE_TYPES[name][1](value)
+        if value_type is tuple:
+            return _TUPLE, [self.encode(item) for item in value]
+        raise SnapshotError(f"Values of type {value_type.__name__} can't be stored in snapshots")
+
+    def _encode_model(self, model: BaseModel) -> Tuple:
+        model_class = type(model)
+        if not model_class.__module__.startswith("pycfmodel."):
+            raise SnapshotError(f"Only models of pycfmodel can be stored in snapshots, not {model_class.__name__}")
+        fields = tuple(model_class.__pydantic_fields__)
+        index = self._indexes.get(model_class)
+        if index is None:
+            index = self._type_index(model_class, f"{model_class.__module__}:{model_class.__qualname__}", fields)
+        values = model.__dict__
+        fields_set = model.__pydantic_fields_set__
+        extra = model.__pydantic_extra__
+        # Most fields are None, only the positions and values of the others are stored
+        positions = []
+        encoded = []
+        for position, name in enumerate(fields):
+            value = values.get(name)
+            if value is not None:
+                positions.append(position)
+                encoded.append(self.encode(value))
+        return (
+            _MODEL,
+            index,
+            tuple(positions),
+            tuple(encoded),
+            tuple([position for position, name in enumerate(fields) if name in fields_set]),
+            {key: self.encode(item) for key, item in extra.items()} if extra else None,
+        )
+
+
+def _model_class(name: str, fields: Tuple[str, ...]) -> Type[BaseModel]:
+    module_name, _, qualname = name.partition(":")
+    if not module_name.startswith("pycfmodel."):
+        raise SnapshotError(f"Snapshot contains a model that is not part of pycfmodel: {name}")
+    try:
+        model_class = import_module(module_name)
+        for attribute in qualname.split("."):
+            model_class = getattr(model_class, attribute)
+    except (ImportError, AttributeError):
+        raise SnapshotError(f"Snapshot contains an unknown model: {name}")
+    if not (isinstance(model_class, type) and issubclass(model_class, BaseModel)):
+        raise SnapshotError(f"Snapshot contains an unknown model: {name}")
+    # Snapshots list every field of their models, other fields mean that the model changed since it was written
+    if set(fields) != set(model_class.__pydantic_fields__):
+        raise SnapshotError(
+            f"Fields of {name} in the snapshot don't match the model, it was written by another version"
+        )
+    return model_class
+
+
+class _Decoder:
+    def __init__(self, table: List[Tuple[str, Tuple[str, ...]]]):
+        self.types = []
+        for name, fields in table:
+            value_type = _VALUE_TYPES.get(name)
+            if value_type is not None:
+                self.types.append((value_type[2], fields, None, False))
+            else:
+                model_class = _model_class(name, fields)
+                self.types.append(
+                    (
+                        model_class,
+                        fields,
+                        model_class.model_config.get("extra") == "allow",
+                        issubclass(model_class, SparseModel),
+                    )
+                )
+
+    def decode(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type is list:
+            return [self.decode(item) for item in value]
+        if value_type is dict:
+            return {key: self.decode(item) for key, item in value.items()}
+        if value_type is not tuple:
+            return value
+        tag = value[0]
+        if tag == _MODEL:
+            return self._decode_model(*value[1:])
+        if tag == _VALUE:
+            return self.types[value[1]][0](value[2])
+        return tuple(self.decode(item) for item in value[1])
+
+    def _decode_model(
+        self,
+        index: int,
+        positions: Tuple[int, ...],
+        values: Tuple,
+        fields_set: Tuple[int, ...],
+        extra: Optional[Dict],
+    ) -> BaseModel:
+        model_class, fields, allows_extra, sparse = self.types[index]
+        decode = self.decode
+        # Sparse models only store the fields that are not None
+        data = {} if sparse else dict.fromkeys(fields)
+        for position, item in zip(positions, values):
+            data[fields[position]] = decode(item)
+        # Same as model_construct when all the fields are given, without looking for aliases and defaults
+        model = model_class.__new__(model_class)
+        object.__setattr__(model, "__dict__", data)
+        object.__setattr__(model, "__pydantic_fields_set__", {fields[position] for position in fields_set})
+        if extra is not None:
+            extra = {key: decode(item) for key, item in extra.items()}
+        elif allows_extra:
+            extra = {}
+        object.__setattr__(model, "__pydantic_extra__", extra)
+        object.__setattr__(model, "__pydantic_private__", None)
+        if model_class.__pydantic_post_init__:
+            model.model_post_init(None)
+        return model
+
+
+def dumps(model: BaseModel, key: Optional[bytes] = None) -> bytes:
+    """
+    Snapshot of a model.
+
+    Arguments:
+        model: Model to store, usually a `CFModel`.
+        key: Key of the digest of the snapshot, up to 64 bytes. The same key is needed to load it.
+
+    Returns:
+        The snapshot.
+    """
+    encoder = _Encoder()
+    with _gc_disabled():
+        root = encoder.encode(model)
+        payload = zlib.compress(marshal.dumps((encoder.table, root), _MARSHAL_VERSION), 1)
+    return _HEADER.pack(_MAGIC, FORMAT_VERSION) + _digest(payload, key) + payload
+
+
+def _load_payload(payload: bytes) -> BaseModel:
+    try:
+        table, root = marshal.loads(zlib.decompress(payload))
+    except (zlib.error, EOFError, ValueError, TypeError):
+        raise SnapshotError("Snapshot payload is corrupted")
+    try:
+        return _Decoder(table).decode(root)
+    except SnapshotError:
+        raise
+    except (IndexError, KeyError, TypeError, ValueError) as error:
+        raise SnapshotError(f"Snapshot payload is corrupted: {error}")
+
+
+def loads(data: bytes, key: Optional[bytes] = None) -> BaseModel:
+    """
+    Loads a snapshot written by `dumps`, without validating the models.
+
+    Arguments:
+        data: The snapshot.
+        key: Key the snapshot was written with.
+
+    Returns:
+        The model.
+
+    Raises:
+        SnapshotError: If the snapshot is corrupted, was written with another key or by an incompatible version.
+    """
+    if len(data) < _HEADER.size + _DIGEST_SIZE:
+        raise SnapshotError("Snapshot is truncated")
+    magic, format_version = _HEADER.unpack_from(data)
+    if magic != _MAGIC:
+        raise SnapshotError("Data is not a snapshot")
+    if format_version != FORMAT_VERSION:
+        raise SnapshotError(f"Snapshot format version {format_version} is not supported")
+    digest = data[_HEADER.size : _HEADER.size + _DIGEST_SIZE]
+    payload = data[_HEADER.size + _DIGEST_SIZE :]
+    if not hmac.compare_digest(digest, _digest(payload, key)):
+        raise SnapshotError("Snapshot digest doesn't match, it is corrupted or was written with another key")
+    with _gc_disabled():
+        return _load_payload(payload)
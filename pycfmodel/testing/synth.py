@@ -0,0 +1,359 @@
+"""
+Deterministic generator of synthetic CloudFormation templates, meant for benchmarks, fuzzing and capacity tests.
+
+Property values are generated from the type annotations of the models in
+[ResourceModels][pycfmodel.model.resources.types.ResourceModels], so every generated resource has a valid shape. String
+values are sometimes replaced by (nested) intrinsic functions that reference the parameters, mappings and conditions of
+the same template, all of which resolve to strings.
+
+Example:
+
+    from pycfmodel import parse
+    from pycfmodel.testing.synth import synthesize_template
+
+    model = parse(synthesize_template(resources=10_000, seed=42)).resolve()
+
+The same arguments always produce the same template.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import date, datetime
+from ipaddress import IPv4Network, IPv6Network
+from random import Random
+from types import NoneType, UnionType
+from typing import Annotated, Any, Dict, List, Literal, Optional, Sequence, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+from pycfmodel.action_expander import get_service_actions
+from pycfmodel.model.base import FunctionDict
+from pycfmodel.model.generic import Generic
+from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.model.resources.properties.statement import Statement
+from pycfmodel.model.resources.properties.statement_condition import StatementCondition
+from pycfmodel.model.resources.resource import Resource
+from pycfmodel.model.resources.types import ResourceModels
+from pycfmodel.model.types import LooseIPv4Network, LooseIPv6Network, SemiStrictBool, _ResolvableModelValidator
+
+RESOURCE_CLASSES: Dict[str, Type[Resource]] = {
+    klass.model_fields["Type"].annotation.__args__[0]: klass for klass in get_args(get_args(ResourceModels)[0])
+}
+ENVIRONMENTS = ("production", "staging", "development")
+ACTION_SERVICES = ("s3", "sqs", "sns", "iam", "ec2", "kms", "lambda", "dynamodb")
+CONDITION_OPERATORS = ("StringEquals", "StringLike", "ArnLike", "IpAddress", "Bool")
+CONDITION_KEYS = {
+    "StringEquals": "aws:PrincipalAccount",
+    "StringLike": "s3:prefix",
+    "ArnLike": "aws:SourceArn",
+    "IpAddress": "aws:SourceIp",
+    "Bool": "aws:SecureTransport",
+}
+# Nested models are not generated below this depth, to keep recursive models finite.
+MAX_DEPTH = 8
+
+
+@dataclass(frozen=True)
+class SynthConfig:
+    """
+    Shape of the generated templates.
+
+    Properties:
+
+    - resources: Number of resources.
+    - seed: Seed of the random generator.
+    - resource_types: Resource types to generate, all the types in `ResourceModels` by default.
+    - generic_ratio: Fraction of resources with a custom type, parsed as GenericResource.
+    - optional_ratio: Probability of including each optional property.
+    - intrinsic_ratio: Probability of replacing a string value by an intrinsic function.
+    - intrinsic_depth: Maximum nesting of intrinsic functions.
+    - deep_intrinsics: Whether intrinsic functions are always nested `intrinsic_depth` levels, instead of up to them.
+    - conditional_ratio: Fraction of resources with a `Condition`.
+    - statements_per_policy: Number of statements in each policy document.
+    - actions_per_statement: Number of actions in each statement.
+    - parameters: Number of string parameters, besides `Environment`.
+    - mappings: Number of mappings.
+    - conditions: Number of conditions.
+    """
+
+    resources: int = 100
+    seed: int = 0
+    resource_types: Optional[Sequence[str]] = None
+    generic_ratio: float = 0.0
+    optional_ratio: float = 0.5
+    intrinsic_ratio: float = 0.2
+    intrinsic_depth: int = 2
+    deep_intrinsics: bool = False
+    conditional_ratio: float = 0.1
+    statements_per_policy: int = 3
+    actions_per_statement: int = 3
+    parameters: int = 5
+    mappings: int = 2
+    conditions: int = 2
+
+
+class TemplateSynthesizer:
+    """Generates templates for a [SynthConfig][pycfmodel.testing.synth.SynthConfig]."""
+
+    def __init__(self, config: Optional[SynthConfig] = None):
+        self.config = config or SynthConfig()
+        self.random = Random(self.config.seed)
+        self.resource_types = sorted(self.config.resource_types or RESOURCE_CLASSES)
+        unknown_types = set(self.resource_types) - set(RESOURCE_CLASSES)
+        if unknown_types:
+            raise ValueError(f"Unknown resource types: {sorted(unknown_types)}")
+        self.parameter_names = [f"Param{index}" for index in range(self.config.parameters)]
+        self.mapping_names = [f"Map{index}" for index in range(self.config.mappings)]
+        self.condition_names = [f"Condition{index}" for index in range(self.config.conditions)]
+        self.actions = [action for service in ACTION_SERVICES for action in get_service_actions(service)]
+        self._counter = 0
+
+    def template(self) -> Dict[str, Any]:
+        resources = {}
+        for index in range(self.config.resources):
+            if self.random.random() < self.config.generic_ratio:
+                resource = self.generic_resource()
+            else:
+                resource = self.resource(self.random.choice(self.resource_types))
+            resources[f"Resource{index}"] = resource
+        return {
+            "AWSTemplateFormatVersion": "2010-09-09",
+            "Description": f"Synthetic template, seed {self.config.seed}",
+            "Parameters": self.parameters(),
+            "Mappings": self.mappings(),
+            "Conditions": self.conditions(),
+            "Resources": resources,
+        }
+
+    def parameters(self) -> Dict[str, Any]:
+        parameters = {
+            "Environment": {"Type": "String", "Default": ENVIRONMENTS[0], "AllowedValues": list(ENVIRONMENTS)}
+        }
+        for name in self.parameter_names:
+            parameters[name] = {"Type": "String", "Default": f"{name.lower()}-value"}
+        return parameters
+
+    def mappings(self) -> Dict[str, Any]:
+        return {
+            name: {environment: {"Name": f"{name.lower()}-{environment}"} for environment in ENVIRONMENTS}
+            for name in self.mapping_names
+        }
+
+    def conditions(self) -> Dict[str, Any]:
+        conditions = {}
+        for index, name in enumerate(self.condition_names):
+            condition = {"Fn::Equals": [{"Ref": "Environment"}, ENVIRONMENTS[index % len(ENVIRONMENTS)]]}
+            conditions[name] = {"Fn::Not": [condition]} if index % 2 else condition
+        return conditions
+
+    def resource(self, resource_type: str) -> Dict[str, Any]:
+        """Generates a resource of one of the types in `ResourceModels`."""
+        resource = {"Type": resource_type}
+        properties_annotation = RESOURCE_CLASSES[resource_type].model_fields["Properties"].annotation
+        properties = self.value(_without_function_dict(properties_annotation), "Properties", depth=0)
+        if properties is not None:
+            resource["Properties"] = properties
+        self._maybe_add_condition(resource)
+        return resource
+
+    def generic_resource(self) -> Dict[str, Any]:
+        """Generates a resource with a custom type and free-form properties, including a policy document."""
+        resource = {
+            "Type": f"Custom::Synth{self.random.randrange(10)}",
+            "Properties": {
+                "Name": self.string("Name"),
+                "Enabled": self.random.choice(("true", "false")),
+                "Count": self.random.randrange(1000),
+                "Cidr": self.ipv4_network(),
+                "Nested": {"Items": [{"Key": self.string("Key"), "Value": self.string("Value")}]},
+                "PolicyDocument": self.policy_document(),
+            },
+        }
+        self._maybe_add_condition(resource)
+        return resource
+
+    def _maybe_add_condition(self, resource: Dict[str, Any]):
+        if self.condition_names and self.random.random() < self.config.conditional_ratio:
+            resource["Condition"] = self.random.choice(self.condition_names)
+
+    def value(self, annotation: Any, name: str, depth: int) -> Any:
+        """Generates a value that validates against the type annotation."""
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            inner, *metadata = get_args(annotation)
+            for item in metadata:
+                if isinstance(item, _ResolvableModelValidator):
+                    return self.value(Union[item.model_cls, FunctionDict], name, depth)
+            return self.value(inner, name, depth)
+        if origin in (Union, UnionType):
+            return self._union_value(get_args(annotation), name, depth)
+        if origin is Literal:
+            return self.random.choice(get_args(annotation))
+        if origin in (list, List) or annotation is list:
+            item_annotation = (get_args(annotation) or (str,))[0]
+            return [self.value(item_annotation, name, depth + 1) for _ in range(self.random.randint(1, 3))]
+        if origin in (dict, Dict) or annotation is dict:
+            value_annotation = get_args(annotation)[1] if get_args(annotation) else str
+            return {f"{name}Key": self.value(value_annotation, name, depth + 1)}
+        if annotation is Any:
+            return self.string(name)
+        if isinstance(annotation, type):
+            return self._typed_value(annotation, name, depth)
+        raise TypeError(f"Can't generate a value for {annotation}")
+
+    def _union_value(self, options: Sequence[Any], name: str, depth: int) -> Any:
+        accepts_function = FunctionDict in options
+        options = [option for option in options if option not in (NoneType, FunctionDict)]
+        if accepts_function and str in options and self.random.random() < self.config.intrinsic_ratio:
+            return self.intrinsic(name, self.config.intrinsic_depth)
+        return self.value(self.random.choice(options), name, depth)
+
+    def _typed_value(self, annotation: type, name: str, depth: int) -> Any:
+        if annotation in (bool, SemiStrictBool):
+            return self.random.random() < 0.5
+        if annotation is int:
+            return self.random.randint(1, 1000)
+        if annotation is float:
+            return round(self.random.uniform(0, 100), 2)
+        if annotation is str:
+            return self.string(name)
+        if annotation is datetime:
+            return datetime(2020, 1, 1, self.random.randrange(24)).isoformat()
+        if annotation is date:
+            return "2012-10-17"
+        if annotation is bytes:
+            return base64.b64encode(self.random.randbytes(8)).decode()
+        if annotation in (IPv4Network, LooseIPv4Network):
+            return self.ipv4_network()
+        if annotation in (IPv6Network, LooseIPv6Network):
+            return self.ipv6_network()
+        if issubclass(annotation, PolicyDocument):
+            return self.policy_document()
+        if issubclass(annotation, Statement):
+            return self.statement()
+        if issubclass(annotation, StatementCondition):
+            return self.statement_condition()
+        if issubclass(annotation, Generic):
+            return {"Name": self.string(name)}
+        if issubclass(annotation, BaseModel):
+            return self.model(annotation, depth)
+        raise TypeError(f"Can't generate a value for {annotation}")
+
+    def model(self, model_class: Type[BaseModel], depth: int) -> Dict[str, Any]:
+        """Generates the required fields of a model and, randomly, its optional fields."""
+        values = {}
+        for name, field_info in model_class.model_fields.items():
+            if not field_info.is_required():
+                if depth >= MAX_DEPTH or self.random.random() >= self.config.optional_ratio:
+                    continue
+            values[field_info.alias or name] = self.value(field_info.annotation, name, depth + 1)
+        return values
+
+    def string(self, name: str) -> str:
+        self._counter += 1
+        return f"{name.lower()}-{self._counter}"
+
+    def ipv4_network(self) -> str:
+        if self.random.random() < 0.1:
+            return "0.0.0.0/0"
+        return f"10.{self.random.randrange(256)}.{self.random.randrange(256)}.0/24"
+
+    def ipv6_network(self) -> str:
+        if self.random.random() < 0.1:
+            return "::/0"
+        return f"2001:db8:{self.random.randrange(0x10000):x}::/64"
+
+    def intrinsic(self, name: str, depth: int) -> Dict[str, Any]:
+        """Generates an intrinsic function, nested up to `depth` levels, that resolves to a string."""
+        kinds = []
+        if depth == 0 or not self.config.deep_intrinsics:
+            kinds.extend(("Ref", "Fn::Sub"))
+            if self.mapping_names:
+                kinds.append("Fn::FindInMap")
+        if depth > 0:
+            kinds.extend(("Fn::Join", "Fn::Select"))
+            if self.condition_names:
+                kinds.append("Fn::If")
+        kind = self.random.choice(kinds)
+        if kind == "Ref":
+            return {"Ref": self.random.choice(self.parameter_names or ["Environment"])}
+        if kind == "Fn::Sub":
+            return {"Fn::Sub": f"{name.lower()}-${{AWS::Region}}-${{Environment}}"}
+        if kind == "Fn::FindInMap":
+            return {"Fn::FindInMap": [self.random.choice(self.mapping_names), {"Ref": "Environment"}, "Name"]}
+        if kind == "Fn::Join":
+            return {"Fn::Join": ["-", [self.intrinsic(name, depth - 1), self.string(name)]]}
+        if kind == "Fn::Select":
+            return {"Fn::Select": [0, {"Fn::Split": [",", self.intrinsic(name, depth - 1)]}]}
+        return {
+            "Fn::If": [
+                self.random.choice(self.condition_names),
+                self.intrinsic(name, depth - 1),
+                self.string(name),
+            ]
+        }
+
+    def policy_document(self) -> Dict[str, Any]:
+        return {
+            "Version": "2012-10-17",
+            "Statement": [self.statement() for _ in range(self.config.statements_per_policy)],
+        }
+
+    def statement(self) -> Dict[str, Any]:
+        actions = self.random.sample(self.actions, min(self.config.actions_per_statement, len(self.actions)))
+        if self.random.random() < 0.1:
+            actions[0] = actions[0].split(":")[0] + ":*"
+        statement = {
+            "Effect": "Deny" if self.random.random() < 0.2 else "Allow",
+            "Action": actions,
+            "Resource": self.random.choice(
+                [
+                    "*",
+                    f"arn:aws:s3:::bucket-{self.random.randrange(1000)}/*",
+                    {"Fn::Sub": "arn:aws:sqs:${AWS::Region}:*:*"},
+                ]
+            ),
+        }
+        if self.random.random() < 0.3:
+            statement["Principal"] = self.random.choice(
+                ["*", {"AWS": "arn:aws:iam::123456789012:root"}, {"Service": "ec2.amazonaws.com"}]
+            )
+        if self.random.random() < 0.3:
+            statement["Condition"] = self.statement_condition()
+        return statement
+
+    def statement_condition(self) -> Dict[str, Any]:
+        operator = self.random.choice(CONDITION_OPERATORS)
+        values = {
+            "StringEquals": "123456789012",
+            "StringLike": ["home/*", "public/*"],
+            "ArnLike": "arn:aws:sns:*:123456789012:*",
+            "IpAddress": self.ipv4_network(),
+            "Bool": "true",
+        }
+        return {operator: {CONDITION_KEYS[operator]: values[operator]}}
+
+
+def _without_function_dict(annotation: Any) -> Any:
+    """Properties of resources are generated as values, never as intrinsic functions."""
+    if get_origin(annotation) is Annotated:
+        annotation = get_args(annotation)[0]
+    if get_origin(annotation) in (Union, UnionType):
+        options = [option for option in get_args(annotation) if option is not FunctionDict]
+        return Union[tuple(options)]
+    return annotation
+
+
+def synthesize_template(config: Optional[SynthConfig] = None, **kwargs) -> Dict[str, Any]:
+    """
+    Generates a synthetic template.
+
+    Arguments:
+        config: Shape of the template. Keyword arguments override its values, see
+            [SynthConfig][pycfmodel.testing.synth.SynthConfig].
+
+    Returns:
+        The template as a dict, ready to be passed to `parse`.
+    """
+    config = SynthConfig(**{**(config.__dict__ if config else {}), **kwargs})
+    return TemplateSynthesizer(config).template()
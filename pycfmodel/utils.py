@@ -1,8 +1,11 @@
+import hashlib
+import json
 import re
+from functools import lru_cache
 from ipaddress import IPv4Network, IPv6Network
-from typing import Any, List, Pattern, Union
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple, Union
 
-from pycfmodel.constants import IMPLEMENTED_FUNCTIONS
+from pycfmodel.constants import ALL_PORTS, ALL_PROTOCOLS, IMPLEMENTED_FUNCTIONS
 
 
 def is_resolvable_dict(value: Any) -> bool:
@@ -15,6 +18,7 @@ def convert_to_list(item: Union[Any, List[Any]]) -> List[Any]:
     return [item]
 
 
+@lru_cache(maxsize=4096)
 def regex_from_cf_string(action: str) -> Pattern:
     # Replace *
     action = action.replace("*", ".*")
@@ -25,5 +29,169 @@ def regex_from_cf_string(action: str) -> Pattern:
     return re.compile(f"^{action}$", re.IGNORECASE)
 
 
+def _json_default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(exclude_none=True)
+    return str(value)
+
+
+def canonical_json(value: Any) -> str:
+    """JSON with sorted keys and no whitespace. Models are dumped without unset values, anything else is a string."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=_json_default)
+
+
+def canonical_values(values: Any, lowercase: bool = False) -> List[Any]:
+    """
+    Sorted and deduplicated values of a field whose values can be given as a single value or a list in any order.
+    Strings are kept as they are, or lowercased if `lowercase` is set, and other values are replaced by their
+    canonical JSON.
+    """
+    canonical = set()
+    for value in convert_to_list(values):
+        if isinstance(value, str):
+            canonical.add(("s", value.lower() if lowercase else value))
+        else:
+            canonical.add(("j", canonical_json(value)))
+    return sorted(canonical)
+
+
+def canonical_list(values: Any, lowercase: bool = False) -> List[Any]:
+    """
+    Like [canonical_values][pycfmodel.utils.canonical_values], but keeping the original values. When `lowercase` is
+    set, values differing only in case are deduplicated keeping the first one in alphabetical order.
+    """
+    unique = {}
+    for value in convert_to_list(values):
+        if isinstance(value, str):
+            key = ("s", value.lower() if lowercase else value)
+            if key not in unique or value < unique[key]:
+                unique[key] = value
+        else:
+            unique.setdefault(("j", canonical_json(value)), value)
+    return [unique[key] for key in sorted(unique)]
+
+
+def content_digest(content: Any) -> str:
+    """Stable digest of the canonical JSON of some content."""
+    return hashlib.blake2b(canonical_json(content).encode("utf-8"), digest_size=16).hexdigest()
+
+
 def not_ip(arg: Any) -> bool:
     return not isinstance(arg, IPv4Network) and not isinstance(arg, IPv6Network)
+
+
+# Protocols that can be given by number or by name, normalized to their name
+_PROTOCOL_NAMES = {"1": "icmp", "6": "tcp", "17": "udp", "58": "icmpv6", "all": ALL_PROTOCOLS}
+# Rules of these protocols have ICMP types and codes instead of ports
+_PROTOCOLS_WITHOUT_PORTS = ("icmp", "icmpv6")
+
+
+def normalize_protocol(protocol: Any) -> Optional[str]:
+    """
+    Normalizes the protocol of a security group rule, given as a number or a name, to its name. All protocols are `-1`.
+
+    Returns:
+        The normalized protocol, or None if it is not resolved.
+    """
+    if isinstance(protocol, bool) or not isinstance(protocol, (int, str)):
+        return None
+    protocol = str(protocol).lower()
+    return _PROTOCOL_NAMES.get(protocol, protocol)
+
+
+def normalize_port_range(protocol: Optional[str], from_port: Any, to_port: Any) -> Optional[Tuple[int, int]]:
+    """
+    Range of ports allowed by a security group rule.
+
+    Arguments:
+        protocol: Protocol normalized with `normalize_protocol`.
+        from_port: `FromPort` of the rule.
+        to_port: `ToPort` of the rule.
+
+    Returns:
+        First and last port, or None if the protocol has no ports or they are not resolved.
+    """
+    if protocol is None or protocol in _PROTOCOLS_WITHOUT_PORTS:
+        return None
+    if protocol not in ("tcp", "udp"):
+        return ALL_PORTS
+    if from_port is None and to_port is None:
+        return ALL_PORTS
+    if not isinstance(from_port, int) or not isinstance(to_port, int):
+        return None
+    if from_port == -1 or to_port == -1:
+        return ALL_PORTS
+    return from_port, to_port
+
+
+def port_ranges(ports: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Collapses ports into sorted ranges of consecutive ports, e.g. `[(22, 23), (80, 80)]` for `[80, 23, 22]`.
+    """
+    ranges = []
+    for port in sorted(set(ports)):
+        if ranges and ranges[-1][1] == port - 1:
+            ranges[-1] = (ranges[-1][0], port)
+        else:
+            ranges.append((port, port))
+    return ranges
+
+
+class PatternSet:
+    """
+    Group of named patterns that can be matched against many values in a single pass.
+
+    Patterns sharing the same flags are combined into a single regular expression, which is used to discard values
+    that don't match any of them before checking each pattern individually. Patterns with groups are not combined, as
+    the numbers of their groups would change and their backreferences would point at other groups.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, Pattern]]):
+        self.patterns: Tuple[Tuple[str, Pattern], ...] = tuple(patterns)
+        self._prefilters: Tuple[Optional[Pattern], ...] = self._build_prefilters(self.patterns)
+
+    @staticmethod
+    def _build_prefilters(patterns: Tuple[Tuple[str, Pattern], ...]) -> Tuple[Optional[Pattern], ...]:
+        patterns_by_flags: Dict[int, List[str]] = {}
+        prefilters = []
+        for _, pattern in patterns:
+            if pattern.groups:
+                prefilters.append(pattern)
+            else:
+                patterns_by_flags.setdefault(pattern.flags, []).append(pattern.pattern)
+        for flags, sources in patterns_by_flags.items():
+            try:
+                prefilters.append(re.compile("|".join(f"(?:{source})" for source in sources), flags))
+            except (re.error, TypeError):
+                # Patterns that can't be combined (e.g. with inline flags), every value is checked individually
+                return (None,)
+        return tuple(prefilters)
+
+    def _may_match(self, value: str) -> bool:
+        return any(prefilter is None or prefilter.match(value) for prefilter in self._prefilters)
+
+    def match(self, values: Iterable[Any]) -> Dict[str, List[str]]:
+        """
+        Arguments:
+            values: Values to match, only strings are considered.
+
+        Returns:
+            Dictionary with the name of every pattern and the values it matches.
+        """
+        result = {name: [] for name, _ in self.patterns}
+        for value in values:
+            if not isinstance(value, str) or not self._may_match(value):
+                continue
+            for name, pattern in self.patterns:
+                if pattern.match(value):
+                    result[name].append(value)
+        return result
+
+
+@lru_cache(maxsize=256)
+def compile_pattern_set(patterns: Tuple[Tuple[str, Pattern], ...]) -> PatternSet:
+    """
+    Cached constructor of [PatternSet][pycfmodel.utils.PatternSet], so that the same group of patterns is only
+    combined once.
+    """
+    return PatternSet(patterns)
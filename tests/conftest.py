@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.fixture()
+def template():
+    """IAM role with a conditional trust policy, referencing a parameter, and a resource without model."""
+    return {
+        "AWSTemplateFormatVersion": "2010-09-09",
+        "Parameters": {"Env": {"Type": "String", "Default": "dev"}},
+        "Resources": {
+            "Role": {
+                "Type": "AWS::IAM::Role",
+                "Properties": {
+                    "AssumeRolePolicyDocument": {
+                        "Statement": [
+                            {
+                                "Effect": "Allow",
+                                "Principal": {"AWS": "*"},
+                                "Action": "sts:AssumeRole",
+                                "Condition": {
+                                    "StringEquals": {"aws:PrincipalAccount": {"Ref": "Env"}},
+                                    "IpAddress": {"aws:SourceIp": ["10.0.0.0/8", "::/0"]},
+                                },
+                            }
+                        ]
+                    }
+                },
+            },
+            "Topic": {"Type": "AWS::Unknown::Topic", "Properties": {"Extra": {"Value": 1}}},
+        },
+    }
@@ -7,6 +7,7 @@ from pytest import fixture
 from pycfmodel.cloudformation_actions import CLOUDFORMATION_ACTIONS
 from pycfmodel.constants import CONTAINS_STAR
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.model.resources.properties.statement import Statement
 
 
 @fixture
@@ -363,3 +364,46 @@ def test_policy_document_kms_key(policy_document_kms_key: PolicyDocument):
     assert policy_document_kms_key.Id == "key-consolepolicy-2"
     assert len(policy_document_kms_key.Statement) == 4
     assert policy_document_kms_key.Statement[3].Condition.Bool == {"kms:GrantIsForAWSResource": True}
+
+
+def test_match_many(policy_document_multi_statement, policy_document_star_resource):
+    patterns = {"star": CONTAINS_STAR, "sts": re.compile(r"^sts:")}
+    result = policy_document_multi_statement.match_many(patterns)
+    assert result == {"star": [], "sts": policy_document_multi_statement.Statement}
+    assert policy_document_star_resource.match_many(patterns, field="resources") == {
+        "star": policy_document_star_resource.Statement,
+        "sts": [],
+    }
+
+
+def test_fingerprint_and_canonical_form():
+    policy_document = PolicyDocument.model_validate(
+        {
+            "Statement": {
+                "Effect": "allow",
+                "Action": ["s3:GetObject", "iam:PassRole", "S3:getobject"],
+                "Resource": "*",
+            }
+        }
+    )
+    equivalent = PolicyDocument.model_validate(
+        {
+            "Statement": [
+                {"Effect": "Allow", "Action": ["iam:PassRole", "s3:GetObject"], "Resource": ["*"]},
+                {"Effect": "Allow", "Action": ["s3:GetObject", "iam:PassRole"], "Resource": "*"},
+            ]
+        }
+    )
+    assert policy_document.fingerprint == equivalent.fingerprint
+    denied = PolicyDocument.model_validate(
+        {"Statement": {"Effect": "Deny", "Action": ["s3:GetObject", "iam:PassRole"], "Resource": "*"}}
+    )
+    assert policy_document.fingerprint != denied.fingerprint
+
+    canonical = equivalent.canonical()
+    assert canonical.Statement == [
+        Statement(Effect="Allow", Action=["iam:PassRole", "s3:GetObject"], Resource=["*"]),
+    ]
+    assert canonical.Statement[0].Action == ["iam:PassRole", "s3:GetObject"]
+    assert canonical.fingerprint == policy_document.fingerprint
+    assert len(equivalent.Statement) == 2
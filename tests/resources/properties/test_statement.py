@@ -222,3 +222,111 @@ def test_resources_with(statement, pattern, expected_output):
 )
 def test_non_whitelisted_principals(statement, whitelist, expected_output):
     assert statement.non_whitelisted_principals(whitelist) == expected_output
+
+
+def test_match_many():
+    statement = Statement(
+        Effect="Allow",
+        Action=["s3:GetObject", "iam:PassRole", {"Ref": "Action"}],
+        Principal={"AWS": "arn:aws:iam::123456789012:root", "Service": "ec2.amazonaws.com"},
+        Resource="arn:aws:s3:::bucket/*",
+    )
+    patterns = {
+        "star": re.compile(r".*\*"),
+        "iam": re.compile(r"^iam:", re.IGNORECASE),
+        "get": re.compile(r"^[a-z0-9]+:Get"),
+    }
+    assert statement.match_many(patterns) == {"star": [], "iam": ["iam:PassRole"], "get": ["s3:GetObject"]}
+    assert statement.match_many(patterns, field="resources") == {
+        "star": ["arn:aws:s3:::bucket/*"],
+        "iam": [],
+        "get": [],
+    }
+    assert statement.match_many({"root": re.compile(r".*:root$")}, field="principals") == {
+        "root": ["arn:aws:iam::123456789012:root"]
+    }
+    with pytest.raises(ValueError):
+        statement.match_many(patterns, field="conditions")
+
+
+def test_match_many_with_patterns_that_cannot_be_combined():
+    statement = Statement(Effect="Allow", Action=["s3:GetObject", "iam:PassRole"])
+    patterns = {"s3": re.compile(r"^(?P<service>s3):"), "iam": re.compile(r"^(?P<service>iam):")}
+    assert statement.match_many(patterns) == {"s3": ["s3:GetObject"], "iam": ["iam:PassRole"]}
+
+
+def test_match_many_with_backreferences():
+    statement = Statement(Effect="Allow", Action=["s3:GetObject", "ec2:ec2Describe", "iam:PassRole"])
+    # Combined with the first pattern, \1 would point at its group instead
+    patterns = {"get": re.compile(r"^(s3):Get"), "repeated": re.compile(r"^([a-z0-9]+):\1")}
+    assert statement.match_many(patterns) == {"get": ["s3:GetObject"], "repeated": ["ec2:ec2Describe"]}
+
+
+def test_fingerprint_normalizes_content():
+    statement = Statement(
+        Effect="allow",
+        Action="S3:GetObject",
+        Resource=["arn:aws:s3:::b/*", "arn:aws:s3:::a/*"],
+        Principal={"AWS": ["arn:aws:iam::2:root", "arn:aws:iam::1:root"]},
+        Condition={"StringEquals": {"aws:PrincipalAccount": ["2", "1"]}},
+    )
+    equivalent = Statement(
+        Effect="Allow",
+        Action=["s3:getobject", "s3:GetObject"],
+        Resource=["arn:aws:s3:::a/*", "arn:aws:s3:::b/*"],
+        Principal={"AWS": ["arn:aws:iam::1:root", "arn:aws:iam::2:root"]},
+        Condition={"StringEquals": {"aws:PrincipalAccount": ["1", "2"]}},
+    )
+    assert statement.fingerprint == equivalent.fingerprint
+    assert statement == equivalent
+    assert hash(statement.freeze()) == hash(equivalent.freeze())
+    assert len({statement, equivalent}) == 1
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "*"},
+        {"Effect": "Allow", "NotAction": "s3:GetObject", "Resource": "*"},
+        {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "ARN:*"},
+        {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*", "Sid": "Other"},
+        {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*", "Principal": "*"},
+        {"Effect": "Allow", "Action": {"Ref": "Action"}, "Resource": "*"},
+        {
+            "Effect": "Allow",
+            "Action": "s3:GetObject",
+            "Resource": "*",
+            "Condition": {"Bool": {"aws:MultiFactor": True}},
+        },
+    ],
+)
+def test_fingerprint_distinguishes_different_statements(other):
+    statement = Statement(Effect="Allow", Action="s3:GetObject", Resource="*")
+    assert statement != Statement(**other)
+    assert statement.fingerprint != Statement(**other).fingerprint
+
+
+def test_fingerprint_is_computed_again_after_assignment():
+    statement = Statement(Effect="Allow", Action="s3:GetObject", Resource="*")
+    fingerprint = statement.fingerprint
+    statement.Resource = "arn:aws:s3:::bucket/*"
+    assert statement.fingerprint != fingerprint
+
+
+def test_mutable_statements_reflect_in_place_changes():
+    statement = Statement(Effect="Allow", Action=["s3:GetObject"], Resource="*")
+    other = Statement(Effect="Allow", Action=["s3:GetObject", "s3:PutObject"], Resource="*")
+    fingerprint = statement.fingerprint
+    assert statement.get_expanded_action_list() == ["s3:GetObject"]
+    with pytest.raises(TypeError, match="not frozen"):
+        hash(statement)
+
+    statement.Action.append("s3:PutObject")
+    assert statement.fingerprint != fingerprint
+    assert statement == other
+    assert statement.get_expanded_action_list() == ["s3:GetObject", "s3:PutObject"]
+    assert statement.actions_with(re.compile(r"s3:Put")) == ["s3:PutObject"]
+
+    statement.freeze()
+    assert statement.fingerprint is statement.fingerprint
+    assert hash(statement) == hash(other.freeze())
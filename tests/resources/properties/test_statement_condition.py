@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from ipaddress import IPv4Network
 from typing import Any, Dict, Tuple, Union
@@ -5,10 +6,14 @@ from typing import Any, Dict, Tuple, Union
 import pytest
 
 from pycfmodel.model.resources.properties.statement_condition import (
+    ConditionClause,
     StatementCondition,
     StatementConditionBuildEvaluatorError,
+    build_clause_evaluator,
     build_evaluator,
     build_root_evaluator,
+    condition_stats,
+    split_operator,
 )
 from pycfmodel.resolver import resolve
 
@@ -679,3 +684,195 @@ def test_statement_condition_with_resolver_works_fine():
     resolved_statement_condition_raw = resolve(statement_condition_raw, {"ClusterId": "test_cluster"}, {}, {})
     resolved_statement_condition = StatementCondition.model_validate(resolved_statement_condition_raw)
     assert resolved_statement_condition.eval({"patata": "test_cluster"}) is True
+
+
+def test_explain_reports_every_operator():
+    statement_condition = StatementCondition(NumericEquals={"patata_1": 1}, StringEquals={"patata_2": "A"})
+    trace = statement_condition.explain({"patata_1": 2, "patata_2": "A"})
+    assert trace.result is False
+    assert [(op.operator, op.key, op.result) for op in trace.operators] == [
+        ("NumericEquals", "patata_1", False),
+        ("StringEquals", "patata_2", True),
+    ]
+    assert [op.key for op in trace.failing_operators] == ["patata_1"]
+    assert all(op.duration >= 0 for op in trace.operators)
+
+
+def test_explain_reports_errors_per_key():
+    statement_condition = StatementCondition(StringEquals={"patata_1": "A", "patata_2": "B"})
+    trace = statement_condition.explain({"patata_1": "A"})
+    assert trace.result is None
+    assert trace.operators[0].result is True
+    assert trace.operators[1].result is None
+    assert trace.operators[1].error == "KeyError('patata_2')"
+    assert statement_condition({"patata_1": "A"}) is None
+
+
+def test_condition_stats():
+    condition_stats.reset()
+    condition_stats.enable()
+    try:
+        statement_condition = StatementCondition(NumericEquals={"patata_1": 1}, StringEquals={"patata_2": "A"})
+        assert statement_condition({"patata_1": 1, "patata_2": "A"}) is True
+        assert statement_condition({"patata_1": 1}) is None
+        assert statement_condition({"patata_1": 2}) is False
+    finally:
+        condition_stats.disable()
+
+    stats = condition_stats.snapshot()
+    assert stats["evaluations"] == 3
+    assert stats["cache_hits"] == 2
+    assert stats["cache_misses"] == 1
+    assert stats["operator_evaluations"] == {"NumericEquals": 3, "StringEquals": 2}
+    assert set(stats["operator_time"]) == {"NumericEquals", "StringEquals"}
+    assert stats["exceptions"] == {"StringEquals": 1}
+
+    condition_stats.reset()
+    assert condition_stats.snapshot()["evaluations"] == 0
+
+
+def test_condition_stats_disabled_by_default():
+    condition_stats.reset()
+    StatementCondition(NumericEquals={"patata": 1})({"patata": 1})
+    assert condition_stats.snapshot()["evaluations"] == 0
+
+
+def test_fingerprint():
+    condition = StatementCondition.model_validate(
+        {"StringEquals": {"aws:PrincipalAccount": ["2", "1"]}, "IpAddress": {"aws:SourceIp": "10.0.0.0/8"}}
+    )
+    equivalent = StatementCondition.model_validate(
+        {"IpAddress": {"aws:SourceIp": ["10.0.0.0/8"]}, "StringEquals": {"aws:PrincipalAccount": ["1", "2", "1"]}}
+    )
+    different = StatementCondition.model_validate({"StringEquals": {"aws:PrincipalAccount": ["1", "2"]}})
+
+    assert condition == equivalent
+    assert hash(condition.freeze()) == hash(equivalent.freeze())
+    assert condition != different
+    assert condition.fingerprint != different.fingerprint
+
+
+@pytest.mark.parametrize(
+    "operator, expected",
+    [
+        ("StringEquals", (None, "StringEquals", False)),
+        ("StringEqualsIfExists", (None, "StringEquals", True)),
+        ("ForAllValuesNull", ("ForAllValues", "Null", False)),
+        ("ForAnyValueStringNotLikeIfExists", ("ForAnyValue", "StringNotLike", True)),
+    ],
+)
+def test_split_operator(operator, expected):
+    assert split_operator(operator) == expected
+
+
+def test_conditions_only_store_used_operators():
+    condition = StatementCondition.model_validate(
+        {"ForAnyValue:StringLike": {"s3:prefix": ["home/*", "shared/*"]}, "BoolIfExists": {"aws:SecureTransport": True}}
+    )
+
+    assert set(condition.__dict__) == {"ForAnyValueStringLike", "BoolIfExists"}
+    assert condition.StringEquals is None
+    assert condition.model_dump(exclude_none=True) == {
+        "BoolIfExists": {"aws:SecureTransport": True},
+        "ForAnyValueStringLike": {"s3:prefix": ["home/*", "shared/*"]},
+    }
+    assert condition.clauses == (
+        ConditionClause(None, "Bool", True, "aws:SecureTransport", True),
+        ConditionClause("ForAnyValue", "StringLike", False, "s3:prefix", ["home/*", "shared/*"]),
+    )
+    assert [clause.name for clause in condition.clauses] == ["BoolIfExists", "ForAnyValueStringLike"]
+    assert condition({"s3:prefix": "home/user"}) is True
+    assert condition({"s3:prefix": "other", "aws:SecureTransport": True}) is False
+
+
+def test_clauses_are_updated_on_assignment():
+    condition = StatementCondition(StringEquals={"patata": "A"})
+    assert [clause.key for clause in condition.clauses] == ["patata"]
+
+    condition.StringLike = {"tomato": "B*"}
+    assert [(clause.operator, clause.key) for clause in condition.clauses] == [
+        ("StringEquals", "patata"),
+        ("StringLike", "tomato"),
+    ]
+
+
+def test_sparse_conditions_dump_every_operator():
+    values = {"StringLike": {"s3:prefix": ["home/*"]}, "Bool": {"aws:SecureTransport": True}}
+    condition = StatementCondition.model_validate(values)
+    full_dump = {operator: values.get(operator) for operator in StatementCondition.model_fields}
+
+    assert condition.model_dump() == full_dump
+    assert list(condition.model_dump()) == list(StatementCondition.model_fields)
+    assert condition == full_dump
+    assert json.loads(condition.model_dump_json()) == full_dump
+    assert condition.model_dump(exclude_none=True) == values
+    assert condition.model_dump(exclude_unset=True) == values
+    assert condition.model_dump(include={"Bool", "StringEquals"}) == {
+        "StringEquals": None,
+        "Bool": {"aws:SecureTransport": True},
+    }
+    assert condition.model_dump(exclude=set(StatementCondition.model_fields) - {"StringLike"}) == {
+        "StringLike": {"s3:prefix": ["home/*"]}
+    }
+    assert StatementCondition.model_validate_json(condition.model_dump_json()) == condition
+
+
+def test_clauses_are_built_on_validation():
+    condition = StatementCondition(StringEquals={"patata": "A"})
+    assert condition.__pydantic_private__["_clauses"] == (ConditionClause(None, "StringEquals", False, "patata", "A"),)
+    assert condition.clauses is condition.clauses
+    assert "clauses" not in condition.__dict__
+    assert "clauses" not in condition.model_dump()
+
+
+def test_clauses_of_copies_follow_updates():
+    condition = StatementCondition(StringEquals={"patata": "A"})
+    assert condition({"patata": "A"}) is True
+
+    copied = condition.model_copy(update={"StringEquals": {"patata": "B"}})
+    assert copied.clauses == (ConditionClause(None, "StringEquals", False, "patata", "B"),)
+    assert copied({"patata": "A"}) is False
+    assert condition({"patata": "A"}) is True
+
+
+def test_evaluators_are_built_again_on_assignment():
+    condition = StatementCondition(StringEquals={"patata": "A"})
+    assert condition({"patata": "A"}) is True
+
+    condition.StringEquals = {"patata": "B"}
+    assert condition({"patata": "A"}) is False
+
+
+def test_repr_lists_every_operator():
+    condition = StatementCondition(StringEquals={"patata": "A"})
+    assert "StringEquals={'patata': 'A'}" in repr(condition)
+    assert "StringLike=None" in repr(condition)
+    assert repr(condition).count("=") == len(StatementCondition.model_fields)
+
+
+def test_condition_serialization_schema_lists_operators():
+    schema = StatementCondition.model_json_schema(mode="serialization")
+    assert schema["additionalProperties"] is False
+    assert set(schema["properties"]) == set(StatementCondition.model_fields)
+
+
+@pytest.mark.parametrize(
+    "operator, values, context, expected",
+    [
+        ("StringEquals", "a", {"key": "a"}, True),
+        ("StringEquals", ["a", "b"], {"key": "b"}, True),
+        ("StringEqualsIfExists", ["a", "b"], {}, True),
+        ("StringEqualsIfExists", "a", {"key": "c"}, False),
+        ("ForAllValuesStringLike", ["a*", "b*"], {"key": ["ab", "ba"]}, True),
+        ("ForAllValuesStringLike", ["a*", "b*"], {"key": ["ab", "ca"]}, False),
+        ("ForAnyValueStringLike", "a*", {"key": ["ca", "ab"]}, True),
+        ("ForAnyValueStringNotEqualsIfExists", ["a"], {"key": ["a"]}, False),
+        ("ForAnyValueStringNotEqualsIfExists", ["a"], {"other": ["a"]}, True),
+        ("Null", True, {"key": "a"}, True),
+    ],
+)
+def test_clause_evaluators_match_root_evaluators(operator, values, context, expected):
+    clause = ConditionClause(*split_operator(operator), "key", values)
+
+    assert build_clause_evaluator(clause)(context) is expected
+    assert build_root_evaluator(operator, ("key", values))(context) is expected
@@ -15,6 +15,9 @@ from pycfmodel.model.resources.security_group_ingress import RDSDBSecurityGroupI
         ("172.128.16.2/8", True),
         ("1.2.3.4/32", True),
         ("1.2.3.4", True),
+        # Same as is_global of ipaddress, where multicast is global
+        ("224.0.0.0/4", True),
+        ("240.0.0.0/4", False),
     ],
 )
 def test_rds_cidrip_is_public(iprange, public):
@@ -66,3 +66,11 @@ def test_not_slash_zero4(security_group_ingress_ipv4_2):
 
 def test_not_slash_zero6(security_group_ingress_ipv6):
     assert security_group_ingress_ipv6.ipv6_slash_zero() is False
+
+
+def test_network_classes(security_group_ingress_ipv4_1, security_group_ingress_ipv4_2, security_group_ingress_ipv6):
+    assert security_group_ingress_ipv4_1.Properties.network_classes() == ["public"]
+    assert security_group_ingress_ipv4_1.Properties.is_public() is True
+    assert security_group_ingress_ipv4_2.Properties.network_classes() == ["reserved"]
+    assert security_group_ingress_ipv4_2.Properties.is_public() is False
+    assert security_group_ingress_ipv6.Properties.network_classes() == ["reserved"]
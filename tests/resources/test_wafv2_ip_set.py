@@ -1,6 +1,8 @@
-from ipaddress import IPv4Network
+import random
+from ipaddress import IPv4Address, IPv4Network, IPv6Network, collapse_addresses
 
 from pycfmodel.model.resources.wafv2_ip_set import WAFv2IPSet, WAFv2IPSetProperties
+from pycfmodel.network import AddressRanges
 
 
 def test_wafv2_ipset_with_large_cidr():
@@ -94,3 +96,68 @@ def test_wafv2_ipset_with_invalid_ip():
 
     with pytest.raises(ValidationError):
         WAFv2IPSet(**resource_dict)
+
+
+def test_wafv2_ipset_networks_by_class():
+    properties = WAFv2IPSetProperties(
+        Addresses=["17.0.0.0/8", "192.168.1.0/24", "127.0.0.1/32", {"Ref": "Address"}, "10.0.0.0/16"],
+        IPAddressVersion="IPV4",
+        Scope="REGIONAL",
+    )
+
+    assert len(properties.networks()) == 4
+    assert properties.networks_by_class() == {
+        "public": [IPv4Network("17.0.0.0/8")],
+        "private": [IPv4Network("192.168.1.0/24"), IPv4Network("10.0.0.0/16")],
+        "reserved": [IPv4Network("127.0.0.1/32")],
+    }
+    assert properties.is_public() is True
+    assert properties.model_copy(update={"Addresses": [IPv4Network("10.0.0.0/8")]}).is_public() is False
+
+
+def test_wafv2_ipset_address_ranges():
+    properties = WAFv2IPSetProperties(
+        Addresses=["10.0.1.0/24", "10.0.0.0/24", "10.0.0.128/25", "192.0.2.7/32", "2001:db8::/64", {"Ref": "Address"}],
+        IPAddressVersion="IPV4",
+        Scope="REGIONAL",
+    )
+
+    ranges = properties.address_ranges
+    assert len(ranges) == 3
+    assert ranges.networks() == [IPv4Network("10.0.0.0/23"), IPv4Network("192.0.2.7/32"), IPv6Network("2001:db8::/64")]
+    assert properties.num_addresses() == 512 + 1 + 2**64
+    assert properties.contains("10.0.1.255")
+    assert properties.contains(IPv4Network("10.0.0.0/23"))
+    assert not properties.contains("10.0.0.0/22")
+    assert not properties.contains("192.0.2.8")
+    assert "2001:db8::1" in ranges
+
+    assert properties.overlaps(["8.8.8.8", "10.0.0.0/8"])
+    assert not properties.overlaps(AddressRanges.from_networks(["10.0.2.0/24", "192.0.2.6", "2001:db8:0:1::/64"]))
+    other = WAFv2IPSetProperties(Addresses=["192.0.2.0/24"], IPAddressVersion="IPV4", Scope="REGIONAL")
+    assert properties.overlaps(other) and other.overlaps(properties)
+
+    properties.Addresses.append(IPv4Network("203.0.113.0/24"))
+    assert properties.num_addresses() == 512 + 1 + 2**64 + 256
+    properties.Addresses = [IPv4Network("198.51.100.0/24")]
+    assert properties.address_ranges is not ranges
+    assert properties.num_addresses() == 256
+
+    frozen = properties.model_copy().freeze()
+    assert frozen.address_ranges is frozen.address_ranges
+
+
+def test_address_ranges_match_ipaddress():
+    generator = random.Random(0)
+    networks = [
+        IPv4Network((generator.randrange(2**16) << 16, generator.randint(16, 32)), strict=False) for _ in range(300)
+    ]
+    ranges = AddressRanges.from_networks(networks)
+    collapsed = list(collapse_addresses(networks))
+
+    assert ranges.networks() == collapsed
+    assert ranges.num_addresses == sum(network.num_addresses for network in collapsed)
+    assert ranges == AddressRanges.from_networks(collapsed)
+    for _ in range(300):
+        address = IPv4Address(generator.randrange(2**32))
+        assert ranges.contains(address) == any(address in network for network in collapsed)
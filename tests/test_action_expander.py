@@ -1,7 +1,7 @@
 import pytest
 
 from pycfmodel import parse
-from pycfmodel.action_expander import _expand_action, _expand_actions
+from pycfmodel.action_expander import _expand_action, _expand_actions, get_service_actions
 from pycfmodel.cloudformation_actions import CLOUDFORMATION_ACTIONS
 
 
@@ -319,3 +319,9 @@ def test_resolve_scenario_2():
         "logs:CreateLogStream",
         "logs:PutLogEvents",
     ]
+
+
+def test_get_service_actions():
+    iam_actions = [action for action in CLOUDFORMATION_ACTIONS if action.lower().startswith("iam:")]
+    assert list(get_service_actions("IAM")) == iam_actions
+    assert get_service_actions("non-existent") == ()
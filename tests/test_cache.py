@@ -0,0 +1,186 @@
+import json
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from ipaddress import IPv4Network
+
+from pycfmodel import parse
+from pycfmodel.cache import CachedParser, DiskCache, _models_digest, approximate_size, template_digest
+from pycfmodel.model.resources.s3_bucket import S3BucketProperties
+
+
+def test_template_digest(template):
+    raw = json.dumps(template).encode("utf-8")
+    assert template_digest(raw) == template_digest(raw.decode("utf-8"))
+    assert template_digest(raw) != template_digest(raw, resolve=True)
+    assert template_digest(raw, {"Env": "prod"}, resolve=True) != template_digest(raw, {"Env": "dev"}, resolve=True)
+    # Parameters only matter for resolved models
+    assert template_digest(raw, {"Env": "prod"}) == template_digest(raw)
+
+
+def test_models_digest_changes_with_the_fields_of_the_models(monkeypatch):
+    digest = _models_digest()
+    assert _models_digest() == digest
+
+    monkeypatch.setattr(
+        S3BucketProperties, "__pydantic_fields__", {**S3BucketProperties.__pydantic_fields__, "New": None}
+    )
+    assert _models_digest() != digest
+
+
+def test_disk_cache_parse(tmp_path, template):
+    raw = json.dumps(template).encode("utf-8")
+    cache = DiskCache(tmp_path)
+
+    parsed = cache.parse(raw)
+    assert parsed == parse(template)
+    assert cache.stats.misses == 1
+
+    assert cache.parse(raw) == parsed
+    assert DiskCache(tmp_path).parse(raw) == parsed
+    assert cache.stats.hits == 1
+
+
+def test_disk_cache_resolve(tmp_path, template):
+    cache = DiskCache(tmp_path)
+    params = {"Env": "prod"}
+
+    resolved = cache.parse(template, extra_params=params, resolve=True)
+    assert params == {"Env": "prod"}
+    assert resolved == parse(template).resolve(extra_params={"Env": "prod"})
+
+    cached = cache.parse(template, extra_params={"Env": "prod"}, resolve=True)
+    assert cached == resolved
+    statement = cached.Resources["Role"].Properties.AssumeRolePolicyDocument.Statement[0]
+    assert statement.Condition({"aws:PrincipalAccount": "prod", "aws:SourceIp": IPv4Network("10.0.0.1")}) is True
+    assert cache.parse(template, extra_params={"Env": "dev"}, resolve=True) != resolved
+
+
+def test_evaluated_models_can_be_pickled(template):
+    model = parse(template).resolve().freeze()
+    statement = model.Resources["Role"].Properties.AssumeRolePolicyDocument.Statement[0]
+    assert statement.Condition({"aws:PrincipalAccount": "dev", "aws:SourceIp": IPv4Network("10.0.0.1")}) is True
+    assert model.Resources["Role"].policy_documents == []
+    assert "policy_documents" in vars(model.Resources["Role"])
+
+    loaded = pickle.loads(pickle.dumps(model))
+    assert loaded == model
+    assert "policy_documents" not in vars(loaded.Resources["Role"])
+    loaded_statement = loaded.Resources["Role"].Properties.AssumeRolePolicyDocument.Statement[0]
+    assert loaded_statement.Condition({"aws:PrincipalAccount": "dev", "aws:SourceIp": IPv4Network("10.0.0.1")}) is True
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path, template):
+    cache = DiskCache(tmp_path)
+    cache.parse(template)
+    entry_size = cache.size()
+
+    cache = DiskCache(tmp_path, max_bytes=int(entry_size * 2.5))
+    templates = [{**template, "Description": f"Template {i}"} for i in range(3)]
+    for other in templates:
+        cache.parse(other)
+
+    assert cache.size() <= cache.max_bytes
+    assert cache.stats.evictions >= 1
+    assert cache.get(template_digest(templates[-1])) is not None
+
+
+def test_disk_cache_ignores_corrupted_entries(tmp_path, template):
+    cache = DiskCache(tmp_path)
+    cache.parse(template)
+    [entry] = tmp_path.iterdir()
+    entry.write_bytes(b"corrupted")
+
+    assert cache.parse(template) == parse(template)
+    assert cache.stats.misses == 2
+
+
+def test_disk_cache_discards_entries_written_with_another_key(tmp_path, template):
+    DiskCache(tmp_path, key=b"writer").parse(template)
+    [entry] = tmp_path.iterdir()
+    entry_data = entry.read_bytes()
+
+    cache = DiskCache(tmp_path, key=b"reader")
+    assert cache.get(template_digest(template)) is None
+    assert not entry.exists()
+
+    # Pickles are never loaded, whatever they contain
+    entry.write_bytes(pickle.dumps(parse(template)))
+    assert cache.get(template_digest(template)) is None
+    entry.write_bytes(entry_data)
+    assert DiskCache(tmp_path, key=b"writer").get(template_digest(template)) == parse(template)
+
+
+def test_disk_cache_keeps_an_index_of_sizes(tmp_path, template, monkeypatch):
+    cache = DiskCache(tmp_path / "sizes")
+    cache.parse(template)
+    entry_size = cache.size()
+
+    scans = []
+    load_index = DiskCache._load_index
+    monkeypatch.setattr(DiskCache, "_load_index", lambda self: scans.append(1) or load_index(self))
+    cache = DiskCache(tmp_path, max_bytes=int(entry_size * 3.5))
+    for i in range(3):
+        cache.parse({**template, "Description": f"Template {i}"})
+    # Built once, when the first entry is stored
+    assert len(scans) == 1
+    assert cache._total == cache.size()
+
+    cache.parse({**template, "Description": "Template 3"})
+    assert len(scans) == 2
+    assert cache.stats.evictions == 1
+    assert cache._total == cache.size() <= cache.max_bytes
+
+
+def test_cached_parser_returns_shared_models(template):
+    parser = CachedParser()
+    raw = json.dumps(template)
+
+    parsed = parser.parse(raw)
+    assert parsed == parse(template)
+    assert parsed.is_frozen
+    assert parser.parse(raw) is parsed
+
+    resolved = parser.resolve(raw, extra_params={"Env": "prod"})
+    assert resolved == parse(template).resolve(extra_params={"Env": "prod"})
+    assert parser.resolve(raw, extra_params={"Env": "prod"}) is resolved
+    assert parser.resolve(raw, extra_params={"Env": "dev"}) is not resolved
+
+    stats = parser.stats
+    assert (stats.hits, stats.misses, stats.entries, stats.evictions) == (4, 3, 3, 0)
+    assert stats.bytes > 0
+
+
+def test_cached_parser_evicts_least_recently_used(template):
+    parser = CachedParser(maxsize=2)
+    templates = [{**template, "Description": f"Template {i}"} for i in range(3)]
+    first = parser.parse(templates[0])
+    parser.parse(templates[1])
+    assert parser.parse(templates[0]) is first
+    parser.parse(templates[2])
+
+    assert parser.parse(templates[0]) is first
+    assert parser.stats.evictions == 1
+    assert parser.stats.entries == 2
+
+
+def test_cached_parser_max_bytes(template):
+    size = approximate_size(parse(template))
+    parser = CachedParser(max_bytes=int(size * 1.5))
+    parser.parse(template)
+    parser.parse({**template, "Description": "Other"})
+
+    assert parser.stats.entries == 1
+    assert parser.stats.bytes <= parser.max_bytes
+    assert parser.stats.evictions == 1
+
+
+def test_cached_parser_is_thread_safe(template):
+    parser = CachedParser(maxsize=4)
+    templates = [{**template, "Description": f"Template {i}"} for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        models = list(executor.map(lambda i: parser.resolve(templates[i % 8]), range(64)))
+
+    assert all(model.Description == f"Template {i % 8}" for i, model in enumerate(models))
+    stats = parser.stats
+    assert stats.entries <= 4
+    assert stats.bytes == sum(size for _, size in parser._entries.values())
@@ -1,9 +1,12 @@
+import json
+
 import pytest
 
 from pycfmodel.model.cf_model import CFModel
 from pycfmodel.model.generic import Generic
 from pycfmodel.model.resources.generic_resource import GenericResource
 from pycfmodel.model.resources.iam_user import IAMUser
+from pycfmodel.testing.synth import synthesize_template
 
 
 @pytest.fixture()
@@ -97,3 +100,54 @@ def test_transform_handles_string():
 
 def test_resolve_model(model):
     assert model.resolve() == model
+
+
+def test_json_bytes_round_trip(model):
+    data = model.to_json_bytes()
+    assert CFModel.from_json_bytes(data) == model
+
+    resources = json.loads(model.to_json_bytes(exclude_none=True))["Resources"]
+    assert resources == {"Logical ID": {"Type": "Resource type", "Properties": {"foo": "bar"}}}
+
+
+def test_json_bytes_dumps_booleans_and_binary_values():
+    model = CFModel.model_validate(
+        {
+            "Resources": {
+                "Key": {
+                    "Type": "AWS::KMS::Key",
+                    "Properties": {
+                        "Enabled": "True",
+                        "EnableKeyRotation": "false",
+                        "KeyPolicy": {
+                            "Statement": {
+                                "Effect": "Allow",
+                                "Action": "kms:*",
+                                "Resource": "*",
+                                "Condition": {"BinaryEquals": {"kms:Tag": "+/8="}},
+                            }
+                        },
+                    },
+                }
+            }
+        }
+    )
+
+    data = model.to_json_bytes(exclude_none=True)
+    properties = json.loads(data)["Resources"]["Key"]["Properties"]
+    assert properties["Enabled"] is True
+    assert properties["EnableKeyRotation"] is False
+    assert properties["KeyPolicy"]["Statement"]["Condition"] == {"BinaryEquals": {"kms:Tag": "+/8="}}
+
+    loaded = CFModel.from_json_bytes(data)
+    assert loaded == model
+    assert loaded.Resources["Key"].Properties.KeyPolicy.Statement.Condition.BinaryEquals == {"kms:Tag": b"\xfb\xff"}
+
+
+def test_json_bytes_round_trip_of_resolved_model():
+    template = synthesize_template(resources=200, seed=7, generic_ratio=0.1, intrinsic_ratio=0.3)
+    model = CFModel.model_validate(template).resolve()
+
+    data = model.to_json_bytes()
+    assert json.loads(data) == json.loads(model.model_dump_json())
+    assert CFModel.from_json_bytes(data) == model
@@ -0,0 +1,98 @@
+import logging
+
+import pytest
+
+from pycfmodel import parse
+from pycfmodel.diagnostics import (
+    CONDITION_EVALUATION_ERROR,
+    GENERIC_RESOURCE,
+    UNRESOLVED_GET_ATT,
+    UNRESOLVED_MAPPING,
+    UNRESOLVED_REF,
+    DiagnosticsCollector,
+    collect_diagnostics,
+    report_issue,
+)
+from pycfmodel.model.resources.properties.statement_condition import StatementCondition
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture()
+def unresolved_template():
+    return {
+        "Mappings": {"Map": {"a": {"b": "c"}}},
+        "Resources": {
+            f"Queue{i}": {
+                "Type": "AWS::Unknown::Queue",
+                "Properties": {
+                    "Name": {"Ref": "Missing"},
+                    "Region": {"Fn::FindInMap": ["Map", "a", "missing"]},
+                    "Arn": {"Fn::GetAtt": ["Role", "Arn"]},
+                },
+            }
+            for i in range(3)
+        },
+    }
+
+
+def test_collector_counts_each_issue_once(unresolved_template, caplog):
+    diagnostics = DiagnosticsCollector()
+    parse(unresolved_template, diagnostics=diagnostics).resolve(diagnostics=diagnostics)
+
+    assert caplog.records == []
+    # Resources are validated again when building the resolved model
+    assert diagnostics.counts() == {
+        GENERIC_RESOURCE: 6,
+        UNRESOLVED_REF: 3,
+        UNRESOLVED_MAPPING: 3,
+        UNRESOLVED_GET_ATT: 3,
+    }
+    assert len(diagnostics) == 4
+    [unresolved_ref] = diagnostics.by_code(UNRESOLVED_REF)
+    assert unresolved_ref.key == "Missing"
+    assert unresolved_ref.message == "Using `UNDEFINED_PARAM_Missing` for Missing. Original value wasn't available."
+    [unresolved_mapping] = diagnostics.by_code(UNRESOLVED_MAPPING)
+    assert unresolved_mapping.key == ("Map", "a", "missing")
+
+
+def test_collector_logs_first_occurrence(unresolved_template, caplog):
+    parse(unresolved_template, diagnostics=DiagnosticsCollector(log=True))
+
+    [record] = caplog.records
+    assert record.message.startswith("Instantiation of GenericResource from AWS::Unknown::Queue in ")
+
+
+def test_without_collector_every_occurrence_is_logged(unresolved_template, caplog):
+    parse(unresolved_template).resolve()
+
+    assert sum("UNDEFINED_PARAM_Missing" in record.message for record in caplog.records) == 3
+
+
+def test_report_issue_formats_lazily(caplog):
+    class Unformattable:
+        def __str__(self):
+            raise AssertionError("Formatted")
+
+    with collect_diagnostics() as diagnostics:
+        report_issue(logger, logging.WARNING, "test", "Value %s", Unformattable())
+
+    logger.setLevel(logging.ERROR)
+    try:
+        report_issue(logger, logging.WARNING, "test", "Value %s", Unformattable())
+    finally:
+        logger.setLevel(logging.NOTSET)
+
+    assert diagnostics.counts() == {"test": 1}
+    assert caplog.records == []
+
+
+def test_condition_evaluation_error_is_collected():
+    condition = StatementCondition.model_validate({"IpAddress": {"aws:SourceIp": "10.0.0.0/8"}})
+    with collect_diagnostics() as diagnostics:
+        assert condition({"aws:SourceIp": "not an ip"}) is None
+        assert condition({"aws:SourceIp": "still not an ip"}) is None
+
+    [diagnostic] = diagnostics.by_code(CONDITION_EVALUATION_ERROR)
+    assert diagnostic.count == 2
+    assert diagnostic.exc_info is not None
@@ -0,0 +1,196 @@
+import pytest
+
+from pycfmodel.action_expander import get_service_actions
+from pycfmodel.effective_permissions import EffectivePermissions, resource_pattern_covers, resource_patterns_overlap
+from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.model.resources.properties.statement import Statement
+
+
+@pytest.mark.parametrize(
+    "pattern, other, expected_output",
+    [
+        ("*", "arn:aws:s3:::bucket/*", True),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::bucket/*", True),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::bucket/key", True),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::bucket/dir/*", True),
+        ("arn:aws:s3:::bucket/key", "arn:aws:s3:::bucket/*", False),
+        ("arn:aws:s3:::bucket/?", "arn:aws:s3:::bucket/*", False),
+        ("arn:aws:s3:::other/*", "arn:aws:s3:::bucket/key", False),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::BUCKET/key", False),
+        ("arn:aws:s3:::bucket/a.b", "arn:aws:s3:::bucket/axb", False),
+    ],
+)
+def test_resource_pattern_covers(pattern, other, expected_output):
+    assert resource_pattern_covers(pattern, other) is expected_output
+
+
+@pytest.mark.parametrize(
+    "pattern, other, expected_output",
+    [
+        ("*", "arn:aws:s3:::bucket/key", True),
+        ("arn:aws:s3:::bucket/*", "*", True),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::bucket/dir/*", True),
+        ("arn:aws:s3:::bucket/*", "arn:aws:s3:::other/*", False),
+        ("arn:aws:s3:::bucket/key", "arn:aws:s3:::bucket/*", True),
+        ("arn:aws:s3:::bucket/key", "arn:aws:s3:::bucket/other", False),
+        ("arn:aws:s3:::bucket/?ey", "arn:aws:s3:::bucket/k*", True),
+    ],
+)
+def test_resource_patterns_overlap(pattern, other, expected_output):
+    assert resource_patterns_overlap(pattern, other) is expected_output
+
+
+def test_effective_permissions_subtracts_denied_actions():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Action": ["s3:Get*", "sqs:SendMessage"], "Resource": "*"},
+            {"Effect": "Deny", "Action": "s3:GetObject*", "Resource": "*"},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.services() == ["s3", "sqs"]
+    assert "s3:GetBucketPolicy" in permissions
+    assert "s3:GetObject" not in permissions
+    assert "s3:GetObjectAcl" not in permissions
+    assert permissions.actions("sqs") == ["sqs:SendMessage"]
+    assert permissions.is_allowed("SQS:sendmessage", "arn:aws:sqs:eu-west-1:123456789012:queue")
+    assert policy_document.freeze().get_effective_permissions() is policy_document.get_effective_permissions()
+
+
+def test_effective_permissions_subtracts_denied_resources():
+    policy_document = PolicyDocument(
+        Statement=[
+            {
+                "Effect": "Allow",
+                "Action": "s3:GetObject",
+                "Resource": ["arn:aws:s3:::public/*", "arn:aws:s3:::private/secret"],
+            },
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::private/*"},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.to_dict() == {"s3:GetObject": ["arn:aws:s3:::public/*"]}
+    assert permissions.is_allowed("s3:GetObject", "arn:aws:s3:::public/key")
+    assert not permissions.is_allowed("s3:GetObject", "arn:aws:s3:::private/secret")
+
+
+def test_effective_permissions_keep_narrower_denies():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Action": ["s3:GetObject", "s3:PutObject"], "Resource": "*"},
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::secret/*"},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.to_dict() == {"s3:GetObject": ["*"], "s3:PutObject": ["*"]}
+    assert permissions.denied_to_dict() == {"s3:GetObject": ["arn:aws:s3:::secret/*"]}
+    assert permissions.denied_resources("S3:GETOBJECT") == {"arn:aws:s3:::secret/*"}
+    assert permissions.denied_resources("s3:PutObject") == frozenset()
+    assert not permissions.is_allowed("s3:GetObject", "arn:aws:s3:::secret/key")
+    assert permissions.is_allowed("s3:GetObject", "arn:aws:s3:::public/key")
+    assert permissions.is_allowed("s3:PutObject", "arn:aws:s3:::secret/key")
+    assert permissions.is_allowed("s3:GetObject")
+
+
+def test_effective_permissions_only_keep_denies_of_allowed_resources():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Action": "s3:GetObject", "Resource": ["arn:aws:s3:::public/*", "arn:aws:s3:::a/b"]},
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": ["arn:aws:s3:::private/*", "arn:aws:s3:::a/*"]},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.to_dict() == {"s3:GetObject": ["arn:aws:s3:::public/*"]}
+    assert permissions.denied_to_dict() == {}
+
+
+def test_effective_permissions_ignores_conditional_denies():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "NotAction": "iam:*", "Resource": "*"},
+            {"Effect": "Deny", "Action": "*", "Resource": "*", "Condition": {"Bool": {"aws:SecureTransport": False}}},
+            {"Effect": "Deny", "Action": "s3:*", "NotResource": "arn:aws:s3:::bucket"},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert "iam" not in permissions.services()
+    assert "s3:GetObject" in permissions
+    assert len(permissions) == len(policy_document.get_allowed_actions())
+
+
+def test_effective_permissions_share_resource_sets():
+    policy_document = PolicyDocument(Statement=[{"Effect": "Allow", "Action": "iam:*", "Resource": "*"}])
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.actions("iam") == list(get_service_actions("iam"))
+    assert len({id(permissions.resources(action)) for action in permissions.actions()}) == 1
+
+
+def test_effective_permissions_of_empty_statements():
+    assert EffectivePermissions.from_statements([]) == EffectivePermissions({})
+    assert len(EffectivePermissions.from_statements([])) == 0
+
+
+def test_effective_permissions_with_unresolved_resources():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/*"},
+            {"Effect": "Allow", "Action": "s3:PutObject", "Resource": {"Fn::Sub": "arn:aws:s3:::${Bucket}/*"}},
+            {"Effect": "Deny", "Action": "s3:*", "Resource": {"Fn::Sub": "arn:aws:s3:::${Other}/*"}},
+        ]
+    )
+    assert policy_document.get_effective_permissions().to_dict() == {
+        "s3:GetObject": ["arn:aws:s3:::bucket/*"],
+        "s3:PutObject": ["*"],
+    }
+
+
+def test_effective_permissions_of_statements_built_without_validation():
+    statements = [
+        Statement.model_construct(
+            Effect="allow", Action="s3:GetObject", Resource=["arn:aws:s3:::public/*", "arn:aws:s3:::private/key"]
+        ),
+        Statement.model_construct(Effect="DENY", Action="s3:GetObject", Resource="arn:aws:s3:::private/*"),
+    ]
+    permissions = EffectivePermissions.from_statements(statements)
+    assert permissions.to_dict() == {"s3:GetObject": ["arn:aws:s3:::public/*"]}
+
+
+def test_resources_are_case_sensitive():
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/public"},
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "arn:aws:s3:::bucket/PUBLIC"},
+        ]
+    )
+    permissions = policy_document.get_effective_permissions()
+    assert permissions.to_dict() == {"s3:GetObject": ["arn:aws:s3:::bucket/public"]}
+    assert permissions.is_allowed("S3:GETOBJECT", "arn:aws:s3:::bucket/public")
+    assert not permissions.is_allowed("s3:GetObject", "arn:aws:s3:::bucket/Public")
+
+
+@pytest.mark.parametrize(
+    "principal, subtracted",
+    [
+        ({"Principal": "*"}, True),
+        ({"Principal": {"AWS": "*"}}, True),
+        ({"Principal": {"AWS": "arn:aws:iam::123456789012:role/Reader"}}, False),
+        ({"Principal": {"AWS": "*", "Service": "ec2.amazonaws.com"}}, False),
+        ({"NotPrincipal": {"AWS": "arn:aws:iam::123456789012:role/Reader"}}, False),
+    ],
+)
+def test_denies_to_some_principals_are_not_subtracted(principal, subtracted):
+    policy_document = PolicyDocument(
+        Statement=[
+            {"Effect": "Allow", "Principal": "*", "Action": "s3:GetObject", "Resource": "*"},
+            {"Effect": "Deny", "Action": "s3:GetObject", "Resource": "*", **principal},
+        ]
+    )
+    assert ("s3:GetObject" in policy_document.get_effective_permissions()) is not subtracted
+
+
+def test_effective_permissions_of_mutable_documents_follow_changes():
+    policy_document = PolicyDocument(Statement=[{"Effect": "Allow", "Action": "s3:GetObject", "Resource": "*"}])
+    assert "s3:GetObject" in policy_document.get_effective_permissions()
+
+    policy_document.Statement.append(Statement(Effect="Deny", Action="s3:GetObject", Resource="*"))
+    assert "s3:GetObject" not in policy_document.get_effective_permissions()
@@ -0,0 +1,94 @@
+import copy
+import pickle
+
+import pytest
+from pydantic import ValidationError
+
+from pycfmodel import parse
+from pycfmodel.model.resources.properties.statement import Statement
+from pycfmodel.model.resources.properties.statement_condition import StatementCondition
+
+
+def test_models_are_not_frozen_by_default(template):
+    model = parse(template)
+    assert not model.is_frozen
+    with pytest.raises(TypeError):
+        hash(model)
+    model.Description = "Mutable"
+
+
+def test_freeze_is_recursive(template):
+    model = parse(template).freeze()
+    role = model.Resources["Role"]
+    statement = role.Properties.AssumeRolePolicyDocument.Statement[0]
+
+    assert model.is_frozen
+    assert role.is_frozen
+    assert role.Properties.AssumeRolePolicyDocument.is_frozen
+    assert statement.is_frozen
+    assert statement.Condition.is_frozen
+
+
+def test_frozen_models_reject_assignments(template):
+    model = parse(template).freeze()
+    with pytest.raises(ValidationError, match="frozen"):
+        model.Description = "Mutable"
+    with pytest.raises(ValidationError, match="frozen"):
+        model.Resources["Role"].Type = "AWS::IAM::User"
+    with pytest.raises(ValidationError, match="frozen"):
+        del model.Resources["Role"].Properties
+
+
+def test_frozen_models_hash_structurally(template):
+    model = parse(template).freeze()
+    other = parse(template).freeze()
+
+    assert model == other
+    assert hash(model) == hash(other)
+    assert {model.Resources["Role"]: "role"}[other.Resources["Role"]] == "role"
+    assert hash(model.Resources["Topic"]) == hash(other.Resources["Topic"])
+
+    template["Resources"]["Role"]["Properties"]["AssumeRolePolicyDocument"]["Statement"][0]["Effect"] = "Deny"
+    assert hash(parse(template).freeze().Resources["Role"]) != hash(model.Resources["Role"])
+
+
+def test_frozen_statements_can_be_deduplicated():
+    statements = [
+        Statement(Effect="Allow", Action=["s3:GetObject"], Resource="*").freeze(),
+        Statement(Effect="Allow", Action=["s3:GetObject"], Resource="*").freeze(),
+        Statement(Effect="Deny", Action=["s3:GetObject"], Resource="*").freeze(),
+    ]
+    assert len(set(statements)) == 2
+
+
+def test_frozen_condition_can_be_evaluated():
+    condition = StatementCondition.model_validate({"Bool": {"aws:SecureTransport": True}}).freeze()
+    condition_hash = hash(condition)
+
+    assert condition({"aws:SecureTransport": True}) is True
+    assert condition({"aws:SecureTransport": False}) is False
+    assert hash(condition) == condition_hash
+    assert condition == StatementCondition.model_validate({"Bool": {"aws:SecureTransport": True}})
+
+
+def test_copies_of_frozen_models_are_not_frozen(template):
+    model = parse(template).freeze()
+
+    updated = model.model_copy(update={"Description": "Copy"})
+    assert not updated.is_frozen
+    assert updated.Description == "Copy"
+
+    deep_copy = copy.deepcopy(model)
+    assert not deep_copy.is_frozen
+    assert not deep_copy.Resources["Role"].is_frozen
+    deep_copy.Resources["Role"].Type = "AWS::IAM::Role"
+
+
+def test_frozen_models_can_be_pickled(template):
+    model = parse(template).freeze()
+    hash(model)
+
+    loaded = pickle.loads(pickle.dumps(model))
+    assert loaded.is_frozen
+    assert loaded == model
+    assert hash(loaded) == hash(model)
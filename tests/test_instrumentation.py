@@ -0,0 +1,280 @@
+import asyncio
+from contextlib import contextmanager
+
+import pytest
+from pydantic import ValidationError
+
+from pycfmodel import parse
+from pycfmodel.instrumentation import (
+    DUMP,
+    EXPAND_ACTIONS,
+    RESOLVE,
+    RESOLVE_FUNCTION,
+    RESOLVE_RESOURCE,
+    UNRESOLVED_MAPPING,
+    UNRESOLVED_REF,
+    UNRESOLVED_SSM,
+    VALIDATE,
+    VALIDATE_RESOURCE,
+    OpenTelemetryObserver,
+    PrometheusObserver,
+    ResolutionStats,
+    TimingObserver,
+    current_observer,
+    observe,
+)
+
+
+@pytest.fixture()
+def unresolved_template():
+    return {
+        "Parameters": {"Env": {"Type": "String", "Default": "prod"}},
+        "Resources": {
+            "Role": {
+                "Type": "AWS::IAM::Role",
+                "Properties": {
+                    "RoleName": {"Ref": "Missing"},
+                    "AssumeRolePolicyDocument": {
+                        "Statement": [
+                            {
+                                "Effect": "Allow",
+                                "Action": "s3:Get*",
+                                "Resource": {"Fn::Sub": "arn:aws:s3:::${Env}/*"},
+                            }
+                        ]
+                    },
+                },
+            },
+            "Bucket": {"Type": "AWS::S3::Bucket"},
+        },
+    }
+
+
+def test_no_observer_by_default():
+    assert current_observer() is None
+
+
+def test_observe_restores_previous_observer():
+    observer = TimingObserver()
+    with observe(observer):
+        assert current_observer() is observer
+    assert current_observer() is None
+
+
+def test_timing_observer_collects_phases(unresolved_template):
+    with observe(TimingObserver()) as observer:
+        parse(unresolved_template).resolve().expand_actions()
+
+    phases = set(observer.timings)
+    assert (VALIDATE, None) in phases
+    assert (VALIDATE_RESOURCE, "AWS::IAM::Role") in phases
+    assert (VALIDATE_RESOURCE, "AWS::S3::Bucket") in phases
+    assert (DUMP, None) in phases
+    assert (RESOLVE, None) in phases
+    assert (RESOLVE_FUNCTION, "Ref") in phases
+    assert (RESOLVE_FUNCTION, "Fn::Sub") in phases
+    assert (EXPAND_ACTIONS, None) in phases
+    assert (EXPAND_ACTIONS, "AWS::IAM::Role") in phases
+    assert observer.timings[(RESOLVE, None)].count == 1
+    assert observer.timings[(RESOLVE, None)].total > 0
+    assert observer.events == {(UNRESOLVED_REF, "Missing"): 1}
+
+
+def test_timing_observer_does_not_change_results(unresolved_template):
+    with observe(TimingObserver()):
+        observed = parse(unresolved_template).resolve()
+    assert observed == parse(unresolved_template).resolve()
+
+
+def test_timing_observer_counts_errors():
+    with observe(TimingObserver()) as observer:
+        with pytest.raises(ValueError):
+            parse({"Resources": {"Role": {"Type": "AWS::IAM::Role", "Properties": {"Policies": 1}}}})
+
+    assert observer.timings[(VALIDATE, None)].errors == 1
+    assert observer.timings[(VALIDATE_RESOURCE, "AWS::IAM::Role")].errors == 1
+
+
+def test_observed_validation_reports_every_invalid_resource():
+    invalid_template = {
+        "Resources": {
+            "First": {"Type": "AWS::IAM::Role", "Properties": {"Policies": 1}},
+            "Bucket": {"Type": "AWS::S3::Bucket"},
+            "Second": {"Type": "AWS::IAM::Role", "Properties": {"Policies": 2}},
+        }
+    }
+    with pytest.raises(ValidationError) as unobserved:
+        parse(invalid_template)
+    with observe(TimingObserver()):
+        with pytest.raises(ValidationError) as observed:
+            parse(invalid_template)
+
+    assert observed.value.errors(include_context=False) == unobserved.value.errors(include_context=False)
+    assert {error["loc"][1] for error in observed.value.errors()} == {"First", "Second"}
+
+
+def test_timing_observer_report(unresolved_template):
+    with observe(TimingObserver()) as observer:
+        parse(unresolved_template).resolve()
+    report = observer.report().splitlines()
+    assert report[0].split() == ["phase", "label", "count", "total", "ms", "mean", "ms", "max", "ms"]
+    assert any(line.startswith(RESOLVE_FUNCTION) and "Fn::Sub" in line for line in report[1:])
+
+
+def test_prometheus_exposition(unresolved_template):
+    with observe(PrometheusObserver(const_labels={"template": 'my "template"'})) as observer:
+        parse(unresolved_template).resolve()
+    exposition = observer.exposition()
+
+    assert "# TYPE pycfmodel_phase_total counter" in exposition
+    assert 'pycfmodel_phase_total{template="my \\"template\\"",phase="resolve"} 1' in exposition
+    assert 'pycfmodel_events_total{template="my \\"template\\"",event="unresolved_ref"} 1' in exposition
+    assert 'label="Missing"' not in exposition
+    # Logical ids are not exported as labels
+    assert 'pycfmodel_phase_total{template="my \\"template\\"",phase="resolve_resource"} 2' in exposition
+    assert 'label="Role"' not in exposition
+    assert (RESOLVE_RESOURCE, None) in observer.timings
+
+
+def test_prometheus_events_are_not_labelled_with_template_names():
+    template = {
+        "Resources": {
+            f"Topic{index}": {
+                "Type": "AWS::SNS::Topic",
+                "Properties": {
+                    "TopicName": {"Ref": f"Missing{index}"},
+                    "DisplayName": {"Fn::FindInMap": [f"Map{index}", "Key", "Value"]},
+                },
+            }
+            for index in range(100)
+        }
+    }
+    with observe(PrometheusObserver()) as observer:
+        parse(template).resolve()
+    events = [line for line in observer.exposition().splitlines() if line.startswith("pycfmodel_events_total")]
+
+    assert sorted(events) == [
+        'pycfmodel_events_total{event="unresolved_mapping"} 100',
+        'pycfmodel_events_total{event="unresolved_ref"} 100',
+    ]
+    for name in (UNRESOLVED_REF, UNRESOLVED_MAPPING, UNRESOLVED_SSM):
+        for index in range(100):
+            observer.event(name, f"Name{index}")
+    assert len(observer.events) == 3
+
+
+class FakeSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.events = []
+        self.error = None
+
+    def add_event(self, name, attributes):
+        self.events.append((name, attributes))
+
+
+class FakeTracer:
+    def __init__(self):
+        self.spans = []
+        self.current = None
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes):
+        span = FakeSpan(name, attributes, self.current)
+        self.spans.append(span)
+        self.current = span
+        try:
+            yield span
+        except BaseException as error:
+            span.error = error
+            raise
+        finally:
+            self.current = span.parent
+
+
+def test_open_telemetry_observer_nests_spans(unresolved_template):
+    tracer = FakeTracer()
+    with observe(OpenTelemetryObserver(tracer)):
+        parse(unresolved_template).resolve()
+
+    resolve_span = next(span for span in tracer.spans if span.name == "pycfmodel.resolve")
+    ref_span = next(span for span in tracer.spans if span.attributes.get("pycfmodel.label") == "Ref")
+    parent = ref_span.parent
+    while parent is not None and parent is not resolve_span:
+        parent = parent.parent
+    assert parent is resolve_span
+    assert ref_span.events == [("pycfmodel.unresolved_ref", {"pycfmodel.label": "Missing"})]
+    assert tracer.current is None
+
+
+def test_open_telemetry_observer_records_errors():
+    tracer = FakeTracer()
+    with observe(OpenTelemetryObserver(tracer)):
+        with pytest.raises(ValueError):
+            parse({"Resources": {"Role": {"Type": "AWS::IAM::Role", "Properties": {"Policies": 1}}}})
+
+    validate_span = next(span for span in tracer.spans if span.name == "pycfmodel.validate")
+    assert validate_span.error is not None
+    assert tracer.current is None
+
+
+def test_open_telemetry_observer_keeps_spans_of_concurrent_tasks_apart():
+    tracer = FakeTracer()
+    observer = OpenTelemetryObserver(tracer)
+
+    async def run_phase(label):
+        observer.phase_started(VALIDATE, label)
+        await asyncio.sleep(0)
+        observer.event(UNRESOLVED_REF, label)
+        await asyncio.sleep(0)
+        observer.phase_finished(VALIDATE, label, 0.0, None)
+
+    async def run_phases():
+        await asyncio.gather(run_phase("First"), run_phase("Second"))
+
+    asyncio.run(run_phases())
+    assert len(tracer.spans) == 2
+    for span in tracer.spans:
+        assert span.events == [("pycfmodel.unresolved_ref", {"pycfmodel.label": span.attributes["pycfmodel.label"]})]
+
+
+def test_nested_observers_are_all_notified(unresolved_template):
+    with observe(TimingObserver()) as outer:
+        with observe(TimingObserver()) as inner:
+            parse(unresolved_template).resolve()
+        parse(unresolved_template)
+
+    assert inner.timings[(RESOLVE, None)].count == 1
+    assert outer.timings[(RESOLVE, None)].count == 1
+    assert outer.timings[(VALIDATE, None)].count == inner.timings[(VALIDATE, None)].count + 1
+
+
+def test_resolution_stats(unresolved_template):
+    unresolved_template["Mappings"] = {"Map": {"a": {"b": "c"}}}
+    unresolved_template["Resources"]["Bucket"]["Properties"] = {
+        "BucketName": {"Fn::Join": ["-", [{"Ref": "Env"}, {"Fn::FindInMap": ["Map", "a", "missing"]}]]}
+    }
+    stats = ResolutionStats()
+    model = parse(unresolved_template).resolve(stats=stats)
+
+    assert model == parse(unresolved_template).resolve()
+    assert current_observer() is None
+    assert {name: function.count for name, function in stats.functions.items()} == {
+        "Ref": 2,
+        "Fn::Sub": 1,
+        "Fn::Join": 1,
+        "Fn::FindInMap": 1,
+    }
+    join = stats.functions["Fn::Join"]
+    assert join.own <= join.total
+    assert stats.unresolved_refs == {"Missing": 1}
+    assert stats.unresolved_mappings == {"Map": 1}
+    assert stats.unresolved_count == 2
+    assert set(stats.resources) == {"Role", "Bucket"}
+    assert [logical_id for logical_id, _ in stats.slowest_resources(1)] == [
+        max(stats.resources, key=stats.resources.get)
+    ]
+    assert stats.duration > 0
+    assert "Unresolved: 1 refs, 1 mappings, 0 SSM parameters" in stats.report()
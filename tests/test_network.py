@@ -0,0 +1,111 @@
+from ipaddress import IPv4Network, IPv6Network, ip_network
+
+import pytest
+
+from pycfmodel.network import (
+    IPV4_ZERO_NETWORK,
+    IPV6_ZERO_NETWORK,
+    PRIVATE,
+    PUBLIC,
+    RESERVED,
+    address_range,
+    classify_network,
+    classify_range,
+    is_global_network,
+    is_public_network,
+)
+
+
+@pytest.mark.parametrize(
+    "network, expected",
+    [
+        (IPV4_ZERO_NETWORK, PUBLIC),
+        (IPv4Network("8.8.8.8/32"), PUBLIC),
+        (IPv4Network("10.0.0.0/8"), PRIVATE),
+        (IPv4Network("10.1.2.0/24"), PRIVATE),
+        (IPv4Network("172.16.0.0/12"), PRIVATE),
+        (IPv4Network("172.32.0.0/16"), PUBLIC),
+        (IPv4Network("192.168.1.1/32"), PRIVATE),
+        (IPv4Network("10.0.0.0/7"), PUBLIC),
+        (IPv4Network("127.0.0.1/32"), RESERVED),
+        (IPv4Network("169.254.169.254/32"), RESERVED),
+        (IPv4Network("100.64.0.0/10"), RESERVED),
+        (IPv4Network("192.0.2.0/24"), RESERVED),
+        (IPv4Network("224.0.0.0/4"), RESERVED),
+        (IPv4Network("224.0.0.0/3"), RESERVED),
+        (IPv4Network("192.0.0.0/2"), PUBLIC),
+        (IPv4Network("255.255.255.255/32"), RESERVED),
+        (IPV6_ZERO_NETWORK, PUBLIC),
+        (IPv6Network("2600::/16"), PUBLIC),
+        (IPv6Network("fd00::/8"), PRIVATE),
+        (IPv6Network("::1/128"), RESERVED),
+        (IPv6Network("fe80::/64"), RESERVED),
+        (IPv6Network("2001:db8::/48"), RESERVED),
+        (IPv6Network("::ffff:10.0.0.0/104"), RESERVED),
+    ],
+)
+def test_classify_network(network, expected):
+    assert classify_network(network) == expected
+
+
+def test_classification_matches_is_global_for_hosts():
+    for value in ("1.1.1.1", "10.0.0.1", "127.0.0.1", "172.20.1.1", "198.51.100.7", "2606:4700::1111", "fc00::1"):
+        network = IPv4Network(value) if "." in value else IPv6Network(value)
+        assert (classify_network(network) == PUBLIC) is network.is_global
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "0.0.0.0/0",
+        "0.0.0.0/8",
+        "8.8.8.0/24",
+        "10.0.0.0/8",
+        "10.0.0.0/7",
+        "11.0.0.0/8",
+        "100.0.0.0/9",
+        "100.64.0.0/10",
+        "127.0.0.0/8",
+        "169.254.0.0/16",
+        "172.16.0.0/12",
+        "192.168.0.0/15",
+        "192.168.0.0/16",
+        "198.18.0.0/15",
+        "240.0.0.0/4",
+        "255.255.255.255/32",
+        "::/0",
+        "::1/128",
+        "::ffff:0:0/96",
+        "2001:db8::/31",
+        "2001:db8::/32",
+        "2600::/16",
+        "fc00::/6",
+        "fc00::/7",
+        "fe80::/10",
+    ],
+)
+def test_classification_matches_is_global_for_boundary_and_supernet_networks(value):
+    network = ip_network(value)
+    assert is_public_network(network) is network.is_global
+    assert is_global_network(network) is network.is_global
+
+
+@pytest.mark.parametrize("value", ["224.0.0.0/4", "224.0.0.0/3", "ff00::/8"])
+def test_multicast_is_global_but_not_public(value):
+    network = ip_network(value)
+    assert is_public_network(network) is False
+    assert is_global_network(network) is network.is_global is True
+
+
+def test_address_range():
+    assert address_range(IPv4Network("10.0.0.0/8")) == (0x0A000000, 0x0AFFFFFF)
+    assert address_range(IPV6_ZERO_NETWORK) == (0, 2**128 - 1)
+    assert classify_range(4, 0x0A000000, 0x0A0000FF) == PRIVATE
+    assert classify_range(4, 0x09FFFFFF, 0x0A0000FF) == PUBLIC
+
+
+def test_classification_is_memoized():
+    classify_network.cache_clear()
+    for _ in range(3):
+        classify_network(IPv4Network("10.0.0.0/8"))
+    assert classify_network.cache_info().hits == 2
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pycfmodel import parse
+from pycfmodel.model.resources.properties.policy_document import PolicyDocument
+from pycfmodel.policy_registry import PolicyDocumentRegistry
+
+
+def policy(actions, effect="Allow"):
+    return {"Statement": [{"Effect": effect, "Action": actions, "Resource": "*"}]}
+
+
+def test_intern_shares_equivalent_policy_documents():
+    registry = PolicyDocumentRegistry()
+    shared = registry.intern(PolicyDocument.model_validate(policy(["s3:GetObject", "iam:PassRole"])))
+
+    assert registry.intern(PolicyDocument.model_validate(policy(["iam:PassRole", "s3:GetObject"]))) is shared
+    assert registry.intern(PolicyDocument.model_validate(policy("s3:GetObject"))) is not shared
+    assert shared.is_frozen
+    assert shared.Statement[0].Action == ["iam:PassRole", "s3:GetObject"]
+    assert len(registry) == 2
+    assert (registry.hits, registry.misses) == (1, 2)
+    assert PolicyDocument.model_validate(policy(["s3:GetObject", "iam:PassRole"])) in registry
+
+
+def test_intern_model():
+    model = parse(
+        {
+            "Resources": {
+                "Policy": {
+                    "Type": "AWS::IAM::Policy",
+                    "Properties": {"PolicyName": "root", "PolicyDocument": policy("s3:GetObject"), "Roles": ["role"]},
+                },
+                "Role": {
+                    "Type": "AWS::IAM::Role",
+                    "Properties": {
+                        "AssumeRolePolicyDocument": policy("sts:AssumeRole"),
+                        "Policies": [{"PolicyName": "inline", "PolicyDocument": policy(["s3:GetObject"])}],
+                    },
+                },
+                "Bucket": {"Type": "AWS::S3::Bucket"},
+            }
+        }
+    )
+    registry = PolicyDocumentRegistry()
+    policies = registry.intern_model(model)
+
+    assert set(policies) == {"Policy", "Role"}
+    [policy_document] = policies["Policy"]
+    [inline_document] = policies["Role"]
+    assert policy_document.name == "root"
+    assert inline_document.name == "inline"
+    assert policy_document.policy_document is inline_document.policy_document
+    assert len(registry) == 1
+
+
+def test_intern_is_thread_safe():
+    registry = PolicyDocumentRegistry()
+    documents = [PolicyDocument.model_validate(policy([f"s3:Get{i % 4}", "s3:List"])) for i in range(64)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        shared = list(executor.map(registry.intern, documents))
+
+    assert len(registry) == 4
+    assert len({id(document) for document in shared}) == 4
+    assert registry.hits + registry.misses == 64
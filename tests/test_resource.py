@@ -1,8 +1,11 @@
 import pytest
 
 from pycfmodel import parse
+from pycfmodel.model.resources.kms_key import KMSKeyProperties
 from pycfmodel.model.resources.properties.policy_document import PolicyDocument
 from pycfmodel.model.resources.properties.statement import Statement
+from pycfmodel.model.resources.resource import _policy_document_fields
+from pycfmodel.model.resources.s3_bucket import S3BucketProperties
 from pycfmodel.model.utils import OptionallyNamedPolicyDocument
 
 
@@ -248,3 +251,55 @@ from pycfmodel.model.utils import OptionallyNamedPolicyDocument
 def test_given_a_template_with_a_resource_it_should_return_its_policy_documents(template, expected_policy_documents):
     resource = parse(template).Resources["NonexistentResource"]
     assert resource.policy_documents == expected_policy_documents
+
+
+def test_policy_documents_only_inspects_fields_that_can_hold_policies():
+    assert _policy_document_fields(KMSKeyProperties) == (("KeyPolicy",), False)
+    assert _policy_document_fields(S3BucketProperties) == ((), False)
+
+
+def test_policy_documents_are_cached():
+    template = {
+        "Resources": {
+            "NonexistentResource": {
+                "Type": "AWS::Non::Existent",
+                "Properties": {
+                    "PolicyDocument": {
+                        "Statement": [{"Effect": "Allow", "Action": ["service:GetService"], "Resource": "*"}]
+                    },
+                },
+            }
+        },
+    }
+    resource = parse(template).Resources["NonexistentResource"]
+    assert resource.policy_documents is not resource.policy_documents
+    assert len(resource.policy_documents) == 1
+
+    resource.Properties = None
+    assert resource.policy_documents == []
+
+    frozen = parse(template).Resources["NonexistentResource"].freeze()
+    assert frozen.policy_documents is frozen.policy_documents
+    assert len(frozen.policy_documents) == 1
+
+
+def test_policy_documents_follow_nested_assignments():
+    resource = parse(
+        {
+            "Resources": {
+                "Policy": {
+                    "Type": "AWS::IAM::Policy",
+                    "Properties": {
+                        "PolicyName": "Policy",
+                        "PolicyDocument": {"Statement": [{"Effect": "Allow", "Action": "s3:*", "Resource": "*"}]},
+                    },
+                }
+            }
+        }
+    ).Resources["Policy"]
+    assert resource.policy_documents[0].policy_document.Statement[0].Action == "s3:*"
+
+    resource.Properties.PolicyDocument = PolicyDocument(
+        Statement=[{"Effect": "Allow", "Action": "sqs:*", "Resource": "*"}]
+    )
+    assert resource.policy_documents[0].policy_document.Statement[0].Action == "sqs:*"
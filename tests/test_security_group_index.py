@@ -0,0 +1,239 @@
+import random
+from ipaddress import IPv4Network, IPv6Network
+
+import pytest
+
+from pycfmodel import parse
+from pycfmodel.constants import ALL_PORTS
+from pycfmodel.model.cf_model import CFModel
+from pycfmodel.model.resources.properties.security_group_egress_prop import SecurityGroupEgressProp
+from pycfmodel.model.resources.properties.security_group_ingress_prop import SecurityGroupIngressProp
+from pycfmodel.model.security_group_index import IntervalTree
+from pycfmodel.utils import normalize_port_range, normalize_protocol, port_ranges
+
+
+@pytest.fixture()
+def model() -> CFModel:
+    return parse(
+        {
+            "Resources": {
+                "WebGroup": {
+                    "Type": "AWS::EC2::SecurityGroup",
+                    "Properties": {
+                        "GroupDescription": "Web",
+                        "SecurityGroupIngress": [
+                            {"IpProtocol": "tcp", "FromPort": 443, "ToPort": 443, "CidrIp": "0.0.0.0/0"},
+                            {"IpProtocol": 6, "FromPort": 22, "ToPort": 22, "CidrIp": "10.0.0.0/16"},
+                            {"IpProtocol": "-1", "CidrIpv6": "::/0"},
+                            {"IpProtocol": "icmp", "FromPort": -1, "ToPort": -1, "CidrIp": "0.0.0.0/0"},
+                            {"IpProtocol": "tcp", "FromPort": 80, "ToPort": 80, "SourceSecurityGroupId": "sg-123"},
+                        ],
+                        "SecurityGroupEgress": {
+                            "IpProtocol": "udp",
+                            "FromPort": 0,
+                            "ToPort": 1024,
+                            "CidrIp": "1.1.1.1/32",
+                        },
+                    },
+                },
+                "SshIngress": {
+                    "Type": "AWS::EC2::SecurityGroupIngress",
+                    "Properties": {
+                        "GroupId": "sg-456",
+                        "IpProtocol": "tcp",
+                        "FromPort": 20,
+                        "ToPort": 30,
+                        "CidrIp": "192.0.2.0/24",
+                    },
+                },
+                "Database": {
+                    "Type": "AWS::RDS::DBSecurityGroup",
+                    "Properties": {
+                        "GroupDescription": "Database",
+                        "DBSecurityGroupIngress": [{"CIDRIP": "172.16.0.0/12"}, {"EC2SecurityGroupName": "web"}],
+                    },
+                },
+                "Topic": {"Type": "AWS::SNS::Topic"},
+            }
+        }
+    )
+
+
+def test_security_group_index_rows(model: CFModel):
+    index = model.security_group_index()
+    assert len(index) == 9
+    assert [(rule.logical_id, rule.direction, rule.group) for rule in index] == [
+        ("WebGroup", "ingress", "WebGroup"),
+        ("WebGroup", "ingress", "WebGroup"),
+        ("WebGroup", "ingress", "WebGroup"),
+        ("WebGroup", "ingress", "WebGroup"),
+        ("WebGroup", "ingress", "WebGroup"),
+        ("WebGroup", "egress", "WebGroup"),
+        ("SshIngress", "ingress", "sg-456"),
+        ("Database", "ingress", "Database"),
+        ("Database", "ingress", "Database"),
+    ]
+    assert [(rule.protocol, rule.from_port, rule.to_port) for rule in index] == [
+        ("tcp", 443, 443),
+        ("tcp", 22, 22),
+        ("-1", 0, 65535),
+        ("icmp", None, None),
+        ("tcp", 80, 80),
+        ("udp", 0, 1024),
+        ("tcp", 20, 30),
+        ("-1", 0, 65535),
+        ("-1", 0, 65535),
+    ]
+    ipv6_rule = index.rules[2]
+    assert ipv6_rule.network == IPv6Network("::/0")
+    assert (ipv6_rule.first_address, ipv6_rule.last_address) == (0, 2**128 - 1)
+    assert index.rules[4].network is None
+    assert index.rules[4].peer == "sg-123"
+    assert index.rules[8].peer == "web"
+
+
+def test_security_group_index_queries(model: CFModel):
+    index = model.security_group_index()
+    assert index.with_port(22) == [1, 2, 5, 6, 7, 8]
+
+    exposed = index.query(port=22, protocol="tcp", direction="ingress", include_private=False)
+    assert [(rule.logical_id, rule.network) for rule in exposed] == [
+        ("WebGroup", IPv6Network("::/0")),
+        ("SshIngress", IPv4Network("192.0.2.0/24")),
+    ]
+    assert [rule.logical_id for rule in index.query(port=22, protocol="tcp", direction="ingress")] == [
+        "WebGroup",
+        "WebGroup",
+        "SshIngress",
+        "Database",
+    ]
+    assert [rule.direction for rule in index.query(protocol=17)] == ["ingress", "egress", "ingress"]
+
+
+def test_unresolved_rules_are_skipped():
+    model = parse(
+        {
+            "Parameters": {"Port": {"Type": "Number"}},
+            "Resources": {
+                "Group": {
+                    "Type": "AWS::EC2::SecurityGroup",
+                    "Properties": {
+                        "GroupDescription": "Unresolved",
+                        "SecurityGroupIngress": [
+                            {"Ref": "Rule"},
+                            {"IpProtocol": "tcp", "FromPort": {"Ref": "Port"}, "ToPort": 22, "CidrIp": "0.0.0.0/0"},
+                        ],
+                    },
+                }
+            },
+        }
+    )
+    index = model.security_group_index()
+    assert len(index) == 1
+    assert index.rules[0].from_port is None
+    assert index.with_port(22) == []
+
+
+@pytest.mark.parametrize(
+    "protocol, expected", [("TCP", "tcp"), (6, "tcp"), ("17", "udp"), (-1, "-1"), ("50", "50"), ({"Ref": "P"}, None)]
+)
+def test_normalize_protocol(protocol, expected):
+    assert normalize_protocol(protocol) == expected
+
+
+@pytest.mark.parametrize(
+    "protocol, from_port, to_port, expected",
+    [
+        ("tcp", 80, 81, (80, 81)),
+        ("tcp", -1, -1, ALL_PORTS),
+        ("udp", None, None, ALL_PORTS),
+        ("-1", 80, 80, ALL_PORTS),
+        ("50", None, None, ALL_PORTS),
+        ("icmp", 8, -1, None),
+        ("tcp", {"Ref": "Port"}, 80, None),
+    ],
+)
+def test_normalize_port_range(protocol, from_port, to_port, expected):
+    assert normalize_port_range(protocol, from_port, to_port) == expected
+
+
+def test_port_ranges():
+    assert port_ranges([80, 23, 22, 8080, 22, 81]) == [(22, 23), (80, 81), (8080, 8080)]
+    assert port_ranges([]) == []
+
+
+def test_rule_port_range_follows_assignments():
+    rule = SecurityGroupIngressProp(IpProtocol="6", FromPort=22, ToPort=22, CidrIp="0.0.0.0/0")
+    assert rule.protocol == "tcp"
+    assert rule.port_range == (22, 22)
+
+    rule.ToPort = 25
+    assert rule.port_range == (22, 25)
+    rule.IpProtocol = "icmp"
+    assert rule.protocol == "icmp"
+    assert rule.port_range is None
+    assert "port_range" not in rule.__dict__
+
+
+def test_rule_port_range_is_cached_on_frozen_rules():
+    rule = SecurityGroupEgressProp(IpProtocol="tcp", FromPort=80, ToPort=443, CidrIp="0.0.0.0/0").freeze()
+    assert rule.port_range == (80, 443)
+    assert rule.__dict__["port_range"] == (80, 443)
+    assert rule.__dict__["protocol"] == "tcp"
+
+
+def test_security_group_index_sensitive_ports(model: CFModel):
+    index = model.security_group_index()
+    sensitive_ports = [22, 3389, 23, 1000, 21]
+    assert index.with_ports(sensitive_ports) == [1, 2, 5, 6, 7, 8]
+
+    exposed = index.exposed_ports(sensitive_ports, protocol="tcp", direction="ingress", include_private=False)
+    assert [(rule.logical_id, ports) for rule, ports in exposed] == [
+        ("WebGroup", [21, 22, 23, 1000, 3389]),
+        ("SshIngress", [21, 22, 23]),
+    ]
+    assert [ports for _, ports in index.exposed_ports([443, 80])] == [[443], [80, 443], [80, 443], [80, 443]]
+
+
+def test_security_group_index_is_cached_on_frozen_models(model: CFModel):
+    frozen = model.freeze()
+    assert frozen.security_group_index() is frozen.security_group_index()
+
+
+def test_security_group_index_follows_changes_to_mutable_models(model: CFModel):
+    assert model.security_group_index().with_port(3306) == [2, 7, 8]
+
+    model.Resources["WebGroup"].Properties.SecurityGroupIngress.append(
+        SecurityGroupIngressProp(IpProtocol="tcp", FromPort=3306, ToPort=3306, CidrIp="0.0.0.0/0")
+    )
+    index = model.security_group_index()
+    assert len(index) == 10
+    exposed = index.exposed_ports([3306], protocol="tcp", direction="ingress", include_private=False)
+    assert [(rule.logical_id, rule.network, ports) for rule, ports in exposed] == [
+        ("WebGroup", IPv6Network("::/0"), [3306]),
+        ("WebGroup", IPv4Network("0.0.0.0/0"), [3306]),
+    ]
+
+    assert index.with_port(3306) == [2, 5, 8, 9]
+
+    del model.Resources["WebGroup"]
+    assert [rule.logical_id for rule in model.security_group_index()] == ["SshIngress", "Database", "Database"]
+
+
+def test_interval_tree_matches_linear_scan():
+    generator = random.Random(0)
+    intervals = []
+    for position in range(500):
+        start = generator.randint(0, 1000)
+        intervals.append((start, start + generator.randint(0, 100), position))
+    tree = IntervalTree(intervals)
+
+    for _ in range(200):
+        start = generator.randint(-10, 1110)
+        end = start + generator.randint(0, 50)
+        assert tree.overlapping(start, end) == [
+            position
+            for interval_start, interval_end, position in intervals
+            if interval_start <= end and start <= interval_end
+        ]
+    assert IntervalTree([]).containing(1) == []
@@ -0,0 +1,87 @@
+import marshal
+import zlib
+from ipaddress import IPv4Network
+
+import pytest
+
+from pycfmodel import parse, snapshot
+from pycfmodel.model.resources.properties.statement_condition import StatementCondition
+from pycfmodel.snapshot import SnapshotError
+from pycfmodel.testing.synth import synthesize_template
+
+
+def test_round_trip(template):
+    model = parse(template).resolve()
+    loaded = snapshot.loads(snapshot.dumps(model))
+
+    assert loaded == model
+    assert loaded.model_fields_set == model.model_fields_set
+    assert loaded.Resources["Topic"].model_extra == model.Resources["Topic"].model_extra
+    statement = loaded.Resources["Role"].Properties.AssumeRolePolicyDocument.Statement[0]
+    assert isinstance(statement.Condition, StatementCondition)
+    assert statement.Condition({"aws:SourceIp": IPv4Network("10.1.2.3"), "aws:PrincipalAccount": "dev"}) is True
+    assert loaded.to_json_bytes() == model.to_json_bytes()
+
+
+def test_round_trip_of_synthetic_template():
+    model = parse(synthesize_template(resources=200, seed=11, generic_ratio=0.1, intrinsic_ratio=0.3))
+    assert snapshot.loads(snapshot.dumps(model)) == model
+
+
+def test_keyed_snapshots(template):
+    data = snapshot.dumps(parse(template), key=b"secret")
+
+    assert snapshot.loads(data, key=b"secret") == parse(template)
+    with pytest.raises(SnapshotError, match="digest"):
+        snapshot.loads(data)
+    with pytest.raises(SnapshotError, match="digest"):
+        snapshot.loads(data, key=b"other")
+
+
+@pytest.mark.parametrize(
+    "corrupt, message",
+    [
+        (lambda data: data[:10], "truncated"),
+        (lambda data: b"NOTASNAP" + data[8:], "not a snapshot"),
+        (lambda data: data[:8] + b"\xff\xff" + data[10:], "version"),
+        (lambda data: data[:-1] + bytes([data[-1] ^ 1]), "digest"),
+    ],
+)
+def test_corrupted_snapshots(template, corrupt, message):
+    with pytest.raises(SnapshotError, match=message):
+        snapshot.loads(corrupt(snapshot.dumps(parse(template))))
+
+
+def _rewrite_table(data, rewrite):
+    payload = data[snapshot._HEADER.size + snapshot._DIGEST_SIZE :]
+    table, root = marshal.loads(zlib.decompress(payload))
+    payload = zlib.compress(marshal.dumps(([rewrite(name, fields) for name, fields in table], root)))
+    return data[: snapshot._HEADER.size] + snapshot._digest(payload, None) + payload
+
+
+@pytest.mark.parametrize(
+    "rewrite_fields",
+    [
+        lambda fields: tuple(field for field in fields if field != "WebsiteConfiguration"),
+        lambda fields: fields + ("RemovedField",),
+    ],
+)
+def test_snapshots_of_other_model_versions_are_rejected(rewrite_fields):
+    model = parse({"Resources": {"Bucket": {"Type": "AWS::S3::Bucket", "Properties": {"BucketName": "bucket"}}}})
+    data = _rewrite_table(
+        snapshot.dumps(model),
+        lambda name, fields: (name, rewrite_fields(fields) if name.endswith(":S3BucketProperties") else fields),
+    )
+
+    with pytest.raises(SnapshotError, match="S3BucketProperties.*another version"):
+        snapshot.loads(data)
+
+
+def test_only_models_of_pycfmodel_can_be_stored():
+    from pydantic import BaseModel
+
+    class Other(BaseModel):
+        value: int = 1
+
+    with pytest.raises(SnapshotError, match="Other"):
+        snapshot.dumps(Other())
@@ -0,0 +1,151 @@
+import pytest
+
+from pycfmodel import parse
+from pycfmodel.model.cf_model import CFModel
+
+
+@pytest.fixture()
+def model() -> CFModel:
+    return parse(
+        {
+            "Resources": {
+                "Role": {
+                    "Type": "AWS::IAM::Role",
+                    "Properties": {
+                        "AssumeRolePolicyDocument": {
+                            "Statement": {"Effect": "Allow", "Principal": {"AWS": "*"}, "Action": "sts:AssumeRole"}
+                        },
+                        "Policies": [
+                            {
+                                "PolicyName": "root",
+                                "PolicyDocument": {
+                                    "Statement": [
+                                        {
+                                            "Effect": "Allow",
+                                            "Action": ["s3:GetObject", "IAM:PassRole"],
+                                            "Resource": "*",
+                                        },
+                                        {"Effect": "Deny", "NotAction": "s3:*", "Resource": "*"},
+                                    ]
+                                },
+                            }
+                        ],
+                    },
+                },
+                "BucketPolicy": {
+                    "Type": "AWS::S3::BucketPolicy",
+                    "Properties": {
+                        "Bucket": "my-bucket",
+                        "PolicyDocument": {
+                            "Statement": [
+                                {
+                                    "Effect": "Allow",
+                                    "Principal": "*",
+                                    "Action": "*",
+                                    "Resource": "arn:aws:s3:::my-bucket/*",
+                                    "Condition": {"Bool": {"aws:SecureTransport": True}},
+                                }
+                            ]
+                        },
+                    },
+                },
+                "Topic": {"Type": "AWS::SNS::Topic"},
+            }
+        }
+    )
+
+
+def test_statement_index_columns(model: CFModel):
+    index = model.statement_index()
+    assert len(index) == 4
+    assert index.logical_ids == ["Role", "Role", "Role", "BucketPolicy"]
+    assert index.resource_types == ["AWS::IAM::Role"] * 3 + ["AWS::S3::BucketPolicy"]
+    assert index.policy_names == ["root", "root", None, None]
+    assert index.assume_role_policies == [False, False, True, False]
+    assert index.effects == ["Allow", "Deny", "Allow", "Allow"]
+    assert index.actions == [("s3:GetObject", "IAM:PassRole"), (), ("sts:AssumeRole",), ("*",)]
+    assert index.not_actions == [(), ("s3:*",), (), ()]
+    assert index.resources == [("*",), ("*",), (), ("arn:aws:s3:::my-bucket/*",)]
+    assert index.not_resources == [(), (), (), ()]
+    assert index.principals == [(), (), ("*",), ("*",)]
+    assert index.not_principals == [(), (), (), ()]
+    assert index.has_conditions == [False, False, False, True]
+
+
+def test_statement_index_lookups(model: CFModel):
+    index = model.statement_index()
+    assert index.with_effect("deny") == [1]
+    assert index.with_action_prefix("iam") == [0, 3]
+    assert index.with_action_prefix("iam", include_wildcard=False) == [0]
+    assert index.with_principal("*") == [2, 3]
+    assert [row.logical_id for row in index.query(effect="Allow", principal="*")] == ["Role", "BucketPolicy"]
+    assert [row.logical_id for row in index.query(effect="Allow", principal="*", action_prefix="sts")] == [
+        "Role",
+        "BucketPolicy",
+    ]
+    assert index.query(effect="Deny", principal="*") == []
+    assert len(index.query()) == 4
+
+
+def test_statement_index_is_cached_on_frozen_models(model: CFModel):
+    frozen = model.freeze()
+    index = frozen.statement_index()
+    assert frozen.statement_index() is index
+    assert len(index) == 4
+
+
+def test_statement_index_follows_changes_to_mutable_models(model: CFModel):
+    assert len(model.statement_index()) == 4
+    model.Resources["OtherRole"] = model.Resources["Role"]
+    assert model.statement_index().logical_ids == [
+        "Role",
+        "Role",
+        "Role",
+        "BucketPolicy",
+        "OtherRole",
+        "OtherRole",
+        "OtherRole",
+    ]
+    del model.Resources["Role"]
+    assert model.statement_index().logical_ids == ["BucketPolicy", "OtherRole", "OtherRole", "OtherRole"]
+    model.Resources = {}
+    assert len(model.statement_index()) == 0
+
+
+def test_statement_index_keeps_not_principal_and_not_resource_apart():
+    model = parse(
+        {
+            "Resources": {
+                "BucketPolicy": {
+                    "Type": "AWS::S3::BucketPolicy",
+                    "Properties": {
+                        "Bucket": "my-bucket",
+                        "PolicyDocument": {
+                            "Statement": [
+                                {
+                                    "Effect": "Deny",
+                                    "NotPrincipal": "*",
+                                    "Action": "s3:*",
+                                    "NotResource": "arn:aws:s3:::my-bucket/public/*",
+                                }
+                            ]
+                        },
+                    },
+                }
+            }
+        }
+    )
+    index = model.statement_index()
+    assert index.principals == [()]
+    assert index.not_principals == [("*",)]
+    assert index.resources == [()]
+    assert index.not_resources == [("arn:aws:s3:::my-bucket/public/*",)]
+    assert index.with_principal("*") == []
+    assert index.with_not_principal("*") == [0]
+
+
+def test_statement_index_normalises_effects(model: CFModel):
+    model.Resources["Role"].Properties.Policies[0].PolicyDocument.Statement[1].Effect = "deny"
+    index = model.statement_index()
+    assert index.effects == ["Allow", "Deny", "Allow", "Allow"]
+    assert index.with_effect("Deny") == [1]
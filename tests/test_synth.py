@@ -0,0 +1,95 @@
+import pytest
+
+from pycfmodel import parse
+from pycfmodel.model.resources.generic_resource import GenericResource
+from pycfmodel.model.resources.iam_role import IAMRole
+from pycfmodel.testing.synth import RESOURCE_CLASSES, SynthConfig, TemplateSynthesizer, synthesize_template
+
+
+def test_synthesize_template_is_deterministic():
+    assert synthesize_template(resources=50, seed=7) == synthesize_template(resources=50, seed=7)
+    assert synthesize_template(resources=50, seed=7) != synthesize_template(resources=50, seed=8)
+
+
+def test_synthesize_template_keyword_arguments_override_config():
+    config = SynthConfig(resources=10, seed=1)
+    assert synthesize_template(config) == TemplateSynthesizer(config).template()
+    assert len(synthesize_template(config, resources=3)["Resources"]) == 3
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_synthesized_templates_parse_and_resolve(seed):
+    template = synthesize_template(
+        resources=150, seed=seed, generic_ratio=0.1, optional_ratio=0.8, intrinsic_ratio=0.5, intrinsic_depth=3
+    )
+    model = parse(template)
+    assert len(model.Resources) == 150
+    resolved = model.resolve()
+    assert resolved.Resources
+
+
+@pytest.mark.parametrize("resource_type", sorted(RESOURCE_CLASSES))
+def test_every_resource_type_is_parsed_with_its_model(resource_type):
+    template = synthesize_template(resources=3, resource_types=[resource_type], optional_ratio=1.0, intrinsic_ratio=0.5)
+    model = parse(template)
+    for resource in model.Resources.values():
+        assert isinstance(resource, RESOURCE_CLASSES[resource_type])
+    model.resolve()
+
+
+def test_generic_ratio():
+    model = parse(synthesize_template(resources=20, generic_ratio=1.0))
+    assert all(isinstance(resource, GenericResource) for resource in model.Resources.values())
+    assert all(resource.policy_documents for resource in model.Resources.values())
+
+
+def test_policy_documents_have_the_configured_size():
+    template = synthesize_template(
+        resources=5, resource_types=["AWS::IAM::Role"], statements_per_policy=7, actions_per_statement=4
+    )
+    model = parse(template)
+    for resource in model.Resources.values():
+        assert isinstance(resource, IAMRole)
+        for policy in resource.Properties.Policies or []:
+            statements = policy.PolicyDocument.statement_as_list()
+            assert len(statements) == 7
+            assert all(len(statement.Action) == 4 for statement in statements)
+
+
+def test_deep_intrinsics_are_nested_to_the_configured_depth():
+    def depth(value):
+        if isinstance(value, dict):
+            return max((depth(item) + (1 if key.startswith("Fn::") else 0) for key, item in value.items()), default=0)
+        if isinstance(value, list):
+            return max((depth(item) for item in value), default=0)
+        return 0
+
+    synthesizer = TemplateSynthesizer(SynthConfig(intrinsic_depth=6, deep_intrinsics=True))
+    # Fn::Select nests an Fn::Split, the innermost function may be a Ref
+    assert all(depth(synthesizer.intrinsic("Name", 6)) >= 6 for _ in range(20))
+
+    template = synthesize_template(
+        resources=5, resource_types=["AWS::S3::Bucket"], intrinsic_ratio=1.0, intrinsic_depth=6, deep_intrinsics=True
+    )
+    assert parse(template).resolve()
+
+
+def test_template_sections_reference_each_other():
+    template = synthesize_template(resources=5, parameters=3, mappings=2, conditions=4)
+    assert set(template["Parameters"]) == {"Environment", "Param0", "Param1", "Param2"}
+    assert set(template["Mappings"]) == {"Map0", "Map1"}
+    assert set(template["Conditions"]) == {"Condition0", "Condition1", "Condition2", "Condition3"}
+
+
+def test_conditional_resources_are_removed_when_resolving():
+    template = synthesize_template(resources=50, conditional_ratio=1.0, conditions=3)
+    model = parse(template)
+    # With the default Environment, Condition0 (production) and Condition1 (not staging) are true, Condition2 is false
+    expected = [name for name, resource in template["Resources"].items() if resource["Condition"] != "Condition2"]
+    assert 0 < len(expected) < 50
+    assert sorted(model.resolve().Resources) == sorted(expected)
+
+
+def test_unknown_resource_type():
+    with pytest.raises(ValueError, match="Unknown resource types"):
+        TemplateSynthesizer(SynthConfig(resource_types=["AWS::Unknown::Thing"]))
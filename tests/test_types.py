@@ -6,7 +6,16 @@ import pytest
 from pydantic import BaseModel, ValidationError
 
 from pycfmodel.model.base import CustomModel, FunctionDict
-from pycfmodel.model.types import LooseIPv4Network, LooseIPv6Network, ResolvableModel, ResolvableStr
+from pycfmodel.model.types import (
+    LooseIPv4Network,
+    LooseIPv6Network,
+    ResolvableBool,
+    ResolvableBytesOrList,
+    ResolvableIPNetwork,
+    ResolvableIPOrList,
+    ResolvableModel,
+    ResolvableStr,
+)
 
 
 def test_loose_ip_v4_network_type():
@@ -386,3 +395,99 @@ def test_resolvable_model_serialization_with_intrinsic():
     dumped = result.model_dump()
     assert dumped["nested"] == {"Ref": "NestedParam"}
     assert dumped["nested_required"] == {"Ref": "RequiredParam"}
+
+
+def test_resolvable_model_json_serialization():
+    result = ParentModel(nested={"Ref": "NestedParam"}, nested_required={"field1": "value1"})
+
+    assert json.loads(result.model_dump_json(exclude_none=True)) == {
+        "nested": {"Ref": "NestedParam"},
+        "nested_required": {"field1": "value1"},
+    }
+    assert ParentModel.model_validate_json(result.model_dump_json()) == result
+
+
+def test_resolvable_types_json_round_trip():
+    class Model(CustomModel):
+        networks: ResolvableIPOrList
+        network: ResolvableIPNetwork
+        flag: ResolvableBool
+        binary: ResolvableBytesOrList
+
+    model = Model(networks=["10.0.0.0/8", "::/0"], network={"Ref": "Cidr"}, flag="true", binary=["//8=", "AA=="])
+
+    assert json.loads(model.model_dump_json()) == {
+        "networks": ["10.0.0.0/8", "::/0"],
+        "network": {"Ref": "Cidr"},
+        "flag": True,
+        "binary": ["//8=", "AA=="],
+    }
+    loaded = Model.model_validate_json(model.model_dump_json())
+    assert loaded == model
+    assert loaded.networks == [IPv4Network("10.0.0.0/8"), IPv6Network("::/0")]
+    assert loaded.binary == [b"\xff\xff", b"\x00"]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "/8",
+        "10.0.0.0/8/8",
+        "arn:aws:s3:::bucket/a/b",
+        "arn:aws:iam::123456789012:role/role",
+        "10.0.0",
+        "10.0.0.256/8",
+        "10.0.0.1/0.0.0.255",
+        "a:b",
+        "fe80::1%eth0/64",
+        "fe80::1%/64",
+        "::ffff:1.2.3.4/128",
+        "::1/129",
+    ],
+)
+def test_loose_ip_networks_match_ipaddress(value):
+    for network_class, loose_class in ((IPv4Network, LooseIPv4Network), (IPv6Network, LooseIPv6Network)):
+        try:
+            expected = network_class(value, strict=False)
+        except ValueError as error:
+            # Failures are cached, the error must be the same every time
+            for _ in range(2):
+                with pytest.raises(type(error)) as exc_info:
+                    loose_class(value)
+                assert str(exc_info.value) == str(error)
+        else:
+            assert loose_class(value) == expected
+
+
+def test_loose_ip_networks_are_cached():
+    network = LooseIPv4Network("10.1.2.3/8")
+    assert network == IPv4Network("10.0.0.0/8")
+    assert LooseIPv4Network("10.1.2.3/8") is network
+    assert LooseIPv6Network("2001:db8::1/32") is LooseIPv6Network("2001:db8::1/32")
+
+    class Model(BaseModel):
+        ips: ResolvableIPOrList
+
+    assert Model(ips=["10.1.2.3/8", "10.1.2.3/8"]).ips[1] is network
+
+
+@pytest.mark.parametrize("value, expected", [("True", True), ("false", False), (True, True)])
+def test_semi_strict_bool_dumps_booleans(value, expected):
+    class Model(CustomModel):
+        flag: ResolvableBool
+
+    model = Model(flag=value)
+    assert model.model_dump() == {"flag": expected}
+    assert json.loads(model.model_dump_json()) == {"flag": expected}
+
+
+@pytest.mark.parametrize("value", ["+/8=", "-_8="])
+def test_binary_accepts_both_base64_alphabets(value):
+    class Model(CustomModel):
+        binary: ResolvableBytesOrList
+
+    model = Model(binary=value)
+    assert model.binary == b"\xfb\xff"
+    assert json.loads(model.model_dump_json()) == {"binary": "+/8="}
+    assert model.model_dump() == {"binary": b"\xfb\xff"}